@@ -21,10 +21,12 @@ from heat.api.aws.exception import HeatAPIException
 
 gettextutils.install('heat')
 
+from heat.common import cache
 from heat.common import wsgi
 from heat.openstack.common import jsonutils as json
 from oslo.config import cfg
 from heat.openstack.common import importutils
+from heat.openstack.common import timeutils
 
 import webob
 from heat.api.aws import exception
@@ -46,7 +48,17 @@ opts = [
                 default=[],
                 help=_('Allowed keystone endpoints for auth_uri when '
                        'multi_cloud is enabled. At least one endpoint needs '
-                       'to be specified.'))
+                       'to be specified.')),
+    cfg.IntOpt('cache_size',
+               default=1000,
+               help=_('Maximum number of successfully authenticated requests '
+                      'to remember, so that a repeated request is not sent '
+                      'to keystone again.')),
+    cfg.IntOpt('cache_ttl',
+               default=300,
+               help=_('Seconds for which an authenticated request is '
+                      'remembered. It is never remembered after its token '
+                      'expires.'))
 ]
 cfg.CONF.register_opts(opts, group='ec2authtoken')
 
@@ -57,6 +69,9 @@ class EC2Token(wsgi.Middleware):
     def __init__(self, app, conf):
         self.conf = conf
         self.application = app
+        # Reuse connections to keystone between requests
+        self._session = requests.Session()
+        self._auth_cache = cache.LRUCache(int(self._conf_get('cache_size')))
 
     def _conf_get(self, name):
         # try config from paste-deploy first
@@ -188,10 +203,20 @@ class EC2Token(wsgi.Middleware):
         headers = {'Content-Type': 'application/json'}
 
         keystone_ec2_uri = self._conf_get_keystone_ec2_uri(auth_uri)
-        logger.info(_('Authenticating with %s') % keystone_ec2_uri)
-        response = requests.post(keystone_ec2_uri, data=creds_json,
-                                 headers=headers)
-        result = response.json()
+        # The signature covers the whole request, so only an identical
+        # request may be authenticated from the cache
+        cache_key = hashlib.sha256(json.dumps([keystone_ec2_uri, creds],
+                                              sort_keys=True)).hexdigest()
+        result = self._auth_cache.get(cache_key)
+        cached = result is not None
+        if not cached:
+            logger.info(_('Authenticating with %s') % keystone_ec2_uri)
+            response = self._session.post(keystone_ec2_uri, data=creds_json,
+                                          headers=headers)
+            result = response.json()
+        else:
+            logger.info(_('Request previously authenticated with %s') %
+                        keystone_ec2_uri)
         try:
             token_id = result['access']['token']['id']
             tenant = result['access']['token']['tenant']['name']
@@ -214,6 +239,10 @@ class EC2Token(wsgi.Middleware):
                 raise exception.HeatAccessDeniedError()
 
         # Authenticated!
+        if not cached:
+            # Cache only results fresh from keystone, so that a result is
+            # never reused for longer than cache_ttl
+            self._cache_result(cache_key, result)
         ec2_creds = {'ec2Credentials': {'access': access,
                                         'signature': signature}}
         req.headers['X-Auth-EC2-Creds'] = json.dumps(ec2_creds)
@@ -228,6 +257,15 @@ class EC2Token(wsgi.Middleware):
 
         return self.application
 
+    def _cache_result(self, cache_key, result):
+        ttl = int(self._conf_get('cache_ttl'))
+        expires = result['access']['token'].get('expires')
+        if expires:
+            expiry = timeutils.normalize_time(timeutils.parse_isotime(expires))
+            ttl = min(ttl, timeutils.delta_seconds(timeutils.utcnow(), expiry))
+        if ttl > 0:
+            self._auth_cache.set(cache_key, result, ttl=ttl)
+
 
 def EC2Token_filter_factory(global_conf, **local_conf):
     """
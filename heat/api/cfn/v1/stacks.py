@@ -17,9 +17,12 @@
 Stack endpoint for Heat CloudFormation v1 API.
 """
 
+import hashlib
 import json
 import socket
 
+import webob
+
 from heat.api.aws import exception
 from heat.api.aws import utils as api_utils
 from heat.common import wsgi
@@ -37,6 +40,15 @@ from heat.openstack.common.gettextutils import _
 logger = logging.getLogger(__name__)
 
 
+def resource_etag(resource_detail):
+    """
+    Return an entity tag identifying the given resource details, including
+    the metadata, which is the same for equal details whichever engine they
+    are read from.
+    """
+    return hashlib.md5(json.dumps(resource_detail, sort_keys=True)).hexdigest()
+
+
 class StackController(object):
 
     """
@@ -553,13 +565,21 @@ class StackController(object):
             resource_details = self.engine_rpcapi.describe_stack_resource(
                 con,
                 stack_identity=identity,
-                resource_name=req.params.get('LogicalResourceId'))
+                resource_name=req.params.get('LogicalResourceId'),
+                with_dependencies=False)
 
         except Exception as ex:
             return exception.map_remote_error(ex)
 
         result = format_resource_detail(resource_details)
 
+        # In-instance tools poll for changes to the metadata, so allow them
+        # to skip the response when it has not changed
+        etag = resource_etag(result)
+        if etag in req.if_none_match:
+            raise webob.exc.HTTPNotModified(headers={'ETag': '"%s"' % etag})
+        req.environ['api.etag'] = etag
+
         return api_utils.format_response('DescribeStackResource',
                                          {'StackResourceDetail': result})
 
@@ -17,6 +17,7 @@ import itertools
 from webob import exc
 
 from heat.api.openstack.v1 import util
+from heat.api.openstack.v1.views import views_common
 from heat.common import wsgi
 from heat.rpc import api as engine_api
 from heat.common import identifier
@@ -78,49 +79,62 @@ class EventController(object):
         self.options = options
         self.engine = rpc_client.EngineClient()
 
-    def _event_list(self, req, identity,
-                    filter_func=lambda e: True, detail=False):
+    def _event_list(self, req, identity, **kwargs):
         events = self.engine.list_events(req.context,
-                                         identity)
+                                         identity,
+                                         **kwargs)
 
-        keys = None if detail else summary_keys
-
-        return [format_event(req, e, keys) for e in events if filter_func(e)]
+        return [format_event(req, e, summary_keys) for e in events]
 
     @util.identified_stack
     def index(self, req, identity, resource_name=None):
         """
         Lists summary information for all resources
         """
-
-        if resource_name is None:
-            events = self._event_list(req, identity)
-        else:
-            res_match = lambda e: e[engine_api.EVENT_RES_NAME] == resource_name
-
-            events = self._event_list(req, identity, res_match)
-            if not events:
-                msg = _('No events found for resource %s') % resource_name
-                raise exc.HTTPNotFound(msg)
-
-        return {'events': events}
+        filter_whitelist = {
+            engine_api.EVENT_RES_ACTION: 'mixed',
+            engine_api.EVENT_RES_STATUS: 'mixed',
+            engine_api.EVENT_RES_TYPE: 'mixed',
+            engine_api.EVENT_RES_PHYSICAL_ID: 'mixed',
+            engine_api.EVENT_FILTER_SINCE: 'single',
+            engine_api.EVENT_FILTER_UNTIL: 'single',
+        }
+        whitelist = {
+            'limit': 'single',
+            'marker': 'single',
+            'sort_dir': 'single',
+            'sort_keys': 'multi',
+        }
+        params = util.get_allowed_params(req.params, whitelist)
+        filter_params = util.get_allowed_params(req.params, filter_whitelist)
+        # Only a resource with no events at all is not found. A page past
+        # the last event, or a filter that matches none, is just empty.
+        whole_list = not filter_params and 'marker' not in params
+
+        if resource_name is not None:
+            filter_params[engine_api.EVENT_RES_NAME] = resource_name
+
+        events = self._event_list(req, identity,
+                                  filters=filter_params, **params)
+        if resource_name is not None and whole_list and not events:
+            msg = _('No events found for resource %s') % resource_name
+            raise exc.HTTPNotFound(msg)
+
+        result = {'events': events}
+        links = views_common.get_collection_links(req, events)
+        if links:
+            result['links'] = links
+        return result
 
     @util.identified_stack
     def show(self, req, identity, resource_name, event_id):
         """
-        Gets detailed information for a stack
+        Gets detailed information for an event
         """
+        event = self.engine.show_event(req.context, identity,
+                                       resource_name, event_id)
 
-        def event_match(ev):
-            identity = identifier.EventIdentifier(**ev[engine_api.EVENT_ID])
-            return (ev[engine_api.EVENT_RES_NAME] == resource_name and
-                    identity.event_id == event_id)
-
-        events = self._event_list(req, identity, event_match, True)
-        if not events:
-            raise exc.HTTPNotFound(_('No event %s found') % event_id)
-
-        return {'event': events[0]}
+        return {'event': format_event(req, event)}
 
 
 def create_resource(options):
@@ -189,7 +189,7 @@ class StackController(object):
         """
         Lists detailed information for all stacks
         """
-        stacks = self.engine.list_stacks(req.context)
+        stacks = self.engine.list_stacks(req.context, show_details=True)
 
         return {'stacks': [stacks_view.format_stack(req, s) for s in stacks]}
 
@@ -48,7 +48,24 @@ def purge_deleted():
     """
     Remove database records that have been previously soft deleted
     """
-    utils.purge_deleted(CONF.command.age, CONF.command.granularity)
+    def progress(purged):
+        print(_('Purged %d deleted stacks so far') % purged)
+
+    purged = utils.purge_deleted(CONF.command.age,
+                                 CONF.command.granularity,
+                                 CONF.command.batch_size,
+                                 progress)
+    print(_('Purged %d deleted stacks') % purged)
+
+
+def purge_watch_data():
+    """
+    Remove watch data samples and rollups older than the given age
+    """
+    deleted = utils.purge_watch_data(CONF.command.age,
+                                     CONF.command.granularity,
+                                     CONF.command.batch_size)
+    print(_('Deleted %d watch data records') % deleted)
 
 
 def add_command_parsers(subparsers):
@@ -68,6 +85,24 @@ def add_command_parsers(subparsers):
         '-g', '--granularity', default='days',
         choices=['days', 'hours', 'minutes', 'seconds'],
         help=_('Granularity to use for age argument, defaults to days.'))
+    parser.add_argument(
+        '-b', '--batch-size', default='1000',
+        help=_('Maximum number of stacks to purge at a time, defaults to '
+               '1000.'))
+
+    parser = subparsers.add_parser('purge_watch_data')
+    parser.set_defaults(func=purge_watch_data)
+    parser.add_argument('age', nargs='?', default='7',
+                        help=_('How long to preserve watch data. This should '
+                               'be longer than the period of any alarm.'))
+    parser.add_argument(
+        '-g', '--granularity', default='days',
+        choices=['days', 'hours', 'minutes', 'seconds'],
+        help=_('Granularity to use for age argument, defaults to days.'))
+    parser.add_argument(
+        '-b', '--batch-size', default='1000',
+        help=_('Maximum number of records to delete at a time, defaults to '
+               '1000.'))
 
 command_opt = cfg.SubCommandOpt('command',
                                 title='Commands',
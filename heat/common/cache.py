@@ -0,0 +1,138 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+'''
+In-process caches for data that is expensive to (re)load.
+'''
+
+from time import time as wallclock
+
+# Indices into the entries of the LRUCache linked list
+_PREV, _NEXT, _KEY, _VALUE, _SIZE, _EXPIRES = range(6)
+
+
+class LRUCache(object):
+    '''
+    A bounded cache that discards the least-recently-used entries first.
+
+    The cache may be bounded by the number of entries, and optionally also by
+    the total size of the entries (as calculated by the supplied sizeof
+    function). Entries may optionally expire after a fixed time-to-live (in
+    seconds). Counts of cache hits and misses are kept for reporting.
+    '''
+
+    def __init__(self, max_entries, max_size=None, sizeof=None, ttl=None):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.ttl = ttl
+        self._sizeof = sizeof or (lambda v: 0)
+        self._entries = {}
+        self._size = 0
+
+        # Sentinel of a circular doubly-linked list ordered from least to
+        # most recently used
+        self._root = []
+        self._root[:] = [self._root, self._root, None, None, 0, None]
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        '''Return the number of entries in the cache.'''
+        return len(self._entries)
+
+    def __contains__(self, key):
+        '''Return True if the cache holds a live entry for the key.'''
+        entry = self._entries.get(key)
+        return entry is not None and not self._expired(entry)
+
+    def _expired(self, entry):
+        return entry[_EXPIRES] is not None and wallclock() > entry[_EXPIRES]
+
+    def _unlink(self, entry):
+        entry[_PREV][_NEXT] = entry[_NEXT]
+        entry[_NEXT][_PREV] = entry[_PREV]
+
+    def _link_last(self, entry):
+        last = self._root[_PREV]
+        entry[_PREV] = last
+        entry[_NEXT] = self._root
+        last[_NEXT] = self._root[_PREV] = entry
+
+    def _remove(self, entry):
+        self._unlink(entry)
+        del self._entries[entry[_KEY]]
+        self._size -= entry[_SIZE]
+
+    def get(self, key, default=None):
+        '''
+        Return the value cached for the key, or the default if there is no
+        live entry for it.
+        '''
+        entry = self._entries.get(key)
+        if entry is None or self._expired(entry):
+            if entry is not None:
+                self._remove(entry)
+            self.misses += 1
+            return default
+
+        self._unlink(entry)
+        self._link_last(entry)
+        self.hits += 1
+        return entry[_VALUE]
+
+    def set(self, key, value, ttl=None):
+        '''
+        Store a value in the cache, evicting older entries if required. A
+        time-to-live for this entry may be given to override the default.
+        '''
+        if key in self._entries:
+            self._remove(self._entries[key])
+
+        size = self._sizeof(value)
+        if self.max_size is not None and size > self.max_size:
+            # Never going to fit, so don't flush the cache trying
+            return
+
+        if ttl is None:
+            ttl = self.ttl
+        expires = wallclock() + ttl if ttl is not None else None
+        entry = [None, None, key, value, size, expires]
+        self._link_last(entry)
+        self._entries[key] = entry
+        self._size += size
+
+        while (len(self._entries) > self.max_entries or
+               (self.max_size is not None and self._size > self.max_size)):
+            self._remove(self._root[_NEXT])
+
+    def delete(self, key):
+        '''Remove any entry for the key from the cache.'''
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._remove(entry)
+
+    def clear(self):
+        '''Remove all entries from the cache.'''
+        self._entries.clear()
+        self._root[:] = [self._root, self._root, None, None, 0, None]
+        self._size = 0
+
+    def stats(self):
+        '''Return a dict of statistics about the cache.'''
+        return {'entries': len(self._entries),
+                'size': self._size,
+                'hits': self.hits,
+                'misses': self.misses}
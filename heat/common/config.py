@@ -107,10 +107,80 @@ engine_opts = [
                help=_('Maximum events that will be available per stack. Older'
                       ' events will be deleted when this is reached. Set to 0'
                       ' for unlimited events per stack.')),
+    cfg.FloatOpt('event_batch_interval',
+                 default=0,
+                 help=_('Seconds for which resource events are buffered so'
+                        ' that they can be written to the database in'
+                        ' batches. Buffered events are always written when'
+                        ' the state of their stack changes. Set to 0 to'
+                        ' write each event immediately.')),
+    cfg.BoolOpt('coalesce_resource_state_writes',
+                default=False,
+                help=_('Store only the final state of a resource action'
+                       ' that completes without waiting, instead of also'
+                       ' storing its IN_PROGRESS state.')),
+    cfg.IntOpt('max_concurrent_nested_deletes',
+               default=10,
+               help=_('Maximum number of nested stacks of a stack that are'
+                      ' deleted at the same time. Set to 0 for no limit.')),
     cfg.IntOpt('engine_life_check_timeout',
                default=2,
                help=_('RPC timeout for the engine liveness check that is used'
-                      ' for stack locking.'))]
+                      ' for stack locking.')),
+    cfg.IntOpt('template_cache_size',
+               default=1000,
+               help=_('Maximum number of stored templates to cache in each'
+                      ' engine.')),
+    cfg.IntOpt('template_cache_max_bytes',
+               default=52428800,
+               help=_('Maximum total size in bytes of the stored templates'
+                      ' cached in each engine.')),
+    cfg.IntOpt('nova_lookup_cache_size',
+               default=1000,
+               help=_('Maximum number of image and flavor lookups to cache'
+                      ' in each engine.')),
+    cfg.IntOpt('nova_lookup_cache_ttl',
+               default=60,
+               help=_('Seconds for which the results of image and flavor'
+                      ' lookups, including failed lookups, are cached.')),
+    cfg.IntOpt('client_pool_size',
+               default=100,
+               help=_('Maximum number of Nova, Neutron and Cinder clients'
+                      ' to keep for reuse in each engine.')),
+    cfg.IntOpt('client_pool_ttl',
+               default=600,
+               help=_('Seconds for which a pooled client may be reused. A'
+                      ' client is never reused after its token expires, if'
+                      ' the expiry time is known.')),
+    cfg.IntOpt('wait_condition_poll_interval',
+               default=60,
+               help=_('Seconds between checks of the handle of a waiting'
+                      ' WaitCondition for signals that this engine was not'
+                      ' told about. A WaitCondition is checked at once when'
+                      ' its handle is signalled.')),
+    cfg.IntOpt('stack_user_access_cache_size',
+               default=1000,
+               help=_('Maximum number of decisions on whether in-instance'
+                      ' users may read a resource to cache in each engine.'
+                      ' A decision is discarded when its stack changes.')),
+    cfg.IntOpt('server_status_poll_max_skip',
+               default=8,
+               help=_('Maximum number of task steps to wait between batched'
+                      ' polls of server status while no server in the'
+                      ' batch is changing state.')),
+    cfg.IntOpt('watch_evaluation_batch_size',
+               default=100,
+               help=_('Number of watch rules evaluated by the periodic'
+                      ' watcher task before yielding to other tasks.')),
+    cfg.IntOpt('watch_shard_count',
+               default=1,
+               help=_('Number of shards the watch rules are divided into'
+                      ' for evaluation. Set this to the number of engines'
+                      ' so that each engine evaluates only its own shard.')),
+    cfg.IntOpt('watch_shard_index',
+               default=0,
+               help=_('Index of the watch rule shard evaluated by this'
+                      ' engine, from 0 to watch_shard_count - 1.'))]
 
 rpc_opts = [
     cfg.StrOpt('host',
@@ -270,6 +270,11 @@ class PhysicalResourceNotFound(HeatException):
     msg_fmt = _("The Resource (%(resource_id)s) could not be found.")
 
 
+class EventNotFound(HeatException):
+    msg_fmt = _("The Event (%(event_id)s) could not be found "
+                "for Resource %(resource_name)s.")
+
+
 class WatchRuleNotFound(HeatException):
     msg_fmt = _("The Watch Rule (%(watch_name)s) could not be found.")
 
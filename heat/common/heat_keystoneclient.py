@@ -333,3 +333,13 @@ class KeystoneClient(object):
     @property
     def auth_token(self):
         return self.client_v2.auth_token
+
+    @property
+    def auth_token_expires(self):
+        '''
+        The expiry time of the token, or None if it is not known because
+        the client has not authenticated.
+        '''
+        if self._client_v2 is None or self._client_v2.auth_ref is None:
+            return None
+        return self._client_v2.auth_ref.expires
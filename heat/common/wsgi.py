@@ -698,6 +698,11 @@ class Resource(object):
 
             response = webob.Response(request=request)
             self.dispatch(serializer, action, response, action_result)
+            # Controllers may identify the version of the result, so that
+            # clients can request it conditionally
+            etag = request.environ.get('api.etag')
+            if etag is not None:
+                response.etag = etag
             return response
 
         # return unserializable result (typically an exception)
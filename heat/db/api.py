@@ -51,6 +51,10 @@ def raw_template_get(context, template_id):
     return IMPL.raw_template_get(context, template_id)
 
 
+def raw_template_created_at(context, template_id):
+    return IMPL.raw_template_created_at(context, template_id)
+
+
 def raw_template_create(context, values):
     return IMPL.raw_template_create(context, values)
 
@@ -88,10 +92,18 @@ def resource_create(context, values):
     return IMPL.resource_create(context, values)
 
 
+def resource_update(context, resource_id, values, expected_state=None):
+    return IMPL.resource_update(context, resource_id, values, expected_state)
+
+
 def resource_exchange_stacks(context, resource_id1, resource_id2):
     return IMPL.resource_exchange_stacks(context, resource_id1, resource_id2)
 
 
+def resource_metadata_set_batch(context, metadata):
+    return IMPL.resource_metadata_set_batch(context, metadata)
+
+
 def resource_get_all_by_stack(context, stack_id):
     return IMPL.resource_get_all_by_stack(context, stack_id)
 
@@ -141,10 +153,26 @@ def stack_update(context, stack_id, values):
     return IMPL.stack_update(context, stack_id, values)
 
 
+def stack_update_state(context, stack_id, values, expected_state=None):
+    return IMPL.stack_update_state(context, stack_id, values, expected_state)
+
+
 def stack_delete(context, stack_id):
     return IMPL.stack_delete(context, stack_id)
 
 
+def stack_total_resources_get(context, stack_id):
+    return IMPL.stack_total_resources_get(context, stack_id)
+
+
+def stack_total_resources_set(context, stack_id, total):
+    return IMPL.stack_total_resources_set(context, stack_id, total)
+
+
+def stack_total_resources_add(context, stack_id, delta):
+    return IMPL.stack_total_resources_add(context, stack_id, delta)
+
+
 def stack_lock_create(stack_id, engine_id):
     return IMPL.stack_lock_create(stack_id, engine_id)
 
@@ -169,16 +197,27 @@ def event_get(context, event_id):
     return IMPL.event_get(context, event_id)
 
 
+def event_get_by_resource(context, stack_id, resource_name, event_id):
+    return IMPL.event_get_by_resource(context, stack_id, resource_name,
+                                      event_id)
+
+
 def event_get_all(context):
     return IMPL.event_get_all(context)
 
 
-def event_get_all_by_tenant(context):
-    return IMPL.event_get_all_by_tenant(context)
+def event_get_all_by_tenant(context, limit=None, marker=None, sort_keys=None,
+                            sort_dir=None, filters=None):
+    return IMPL.event_get_all_by_tenant(context, limit=limit, marker=marker,
+                                        sort_keys=sort_keys,
+                                        sort_dir=sort_dir, filters=filters)
 
 
-def event_get_all_by_stack(context, stack_id):
-    return IMPL.event_get_all_by_stack(context, stack_id)
+def event_get_all_by_stack(context, stack_id, limit=None, marker=None,
+                           sort_keys=None, sort_dir=None, filters=None):
+    return IMPL.event_get_all_by_stack(context, stack_id, limit=limit,
+                                       marker=marker, sort_keys=sort_keys,
+                                       sort_dir=sort_dir, filters=filters)
 
 
 def event_count_all_by_stack(context, stack_id):
@@ -189,6 +228,10 @@ def event_create(context, values):
     return IMPL.event_create(context, values)
 
 
+def event_create_batch(context, values_list):
+    return IMPL.event_create_batch(context, values_list)
+
+
 def watch_rule_get(context, watch_rule_id):
     return IMPL.watch_rule_get(context, watch_rule_id)
 
@@ -205,6 +248,12 @@ def watch_rule_get_all_by_stack(context, stack_id):
     return IMPL.watch_rule_get_all_by_stack(context, stack_id)
 
 
+def watch_rule_get_all_for_evaluation(context, shard_count=1, shard_index=0,
+                                      exclude_states=None):
+    return IMPL.watch_rule_get_all_for_evaluation(context, shard_count,
+                                                  shard_index, exclude_states)
+
+
 def watch_rule_create(context, values):
     return IMPL.watch_rule_create(context, values)
 
@@ -225,6 +274,27 @@ def watch_data_get_all(context):
     return IMPL.watch_data_get_all(context)
 
 
+def watch_data_get_all_by_watch_rule_id(context, watch_rule_id, since=None,
+                                        until=None):
+    return IMPL.watch_data_get_all_by_watch_rule_id(context, watch_rule_id,
+                                                    since, until)
+
+
+def watch_data_rollup_add(context, watch_rule_id, period, bucket_start,
+                          value):
+    return IMPL.watch_data_rollup_add(context, watch_rule_id, period,
+                                      bucket_start, value)
+
+
+def watch_data_rollup_get_all(context, watch_rule_id, period, since, until):
+    return IMPL.watch_data_rollup_get_all(context, watch_rule_id, period,
+                                          since, until)
+
+
+def watch_data_purge(context, before, batch_size=1000):
+    return IMPL.watch_data_purge(context, before, batch_size)
+
+
 def db_sync(version=None):
     """Migrate the database to `version` or the most recent version."""
     return IMPL.db_sync(version=version)
@@ -20,6 +20,7 @@ from datetime import timedelta
 
 from oslo.config import cfg
 import sqlalchemy
+from sqlalchemy import orm
 from sqlalchemy.orm.session import Session
 
 cfg.CONF.import_opt('max_events_per_stack', 'heat.common.config')
@@ -31,8 +32,10 @@ from heat.common import exception
 from heat.db.sqlalchemy import filters as db_filters
 from heat.db.sqlalchemy import migration
 from heat.db.sqlalchemy import models
+from heat.openstack.common.db import exception as db_exception
 from heat.openstack.common.db.sqlalchemy import session as db_session
 from heat.openstack.common.db.sqlalchemy import utils
+from heat.openstack.common import timeutils
 
 
 get_engine = db_session.get_engine
@@ -81,6 +84,15 @@ def raw_template_get(context, template_id):
     return result
 
 
+def raw_template_created_at(context, template_id):
+    '''
+    Return the creation time of the raw template with the given ID, or None
+    if there is no such template. This does not load the template itself.
+    '''
+    return model_query(context, models.RawTemplate.created_at).\
+        filter_by(id=template_id).scalar()
+
+
 def raw_template_create(context, values):
     raw_template_ref = models.RawTemplate()
     raw_template_ref.update(values)
@@ -226,9 +238,38 @@ def resource_create(context, values):
     return resource_ref
 
 
+def resource_update(context, resource_id, values, expected_state=None):
+    '''
+    Update a resource with a single UPDATE statement, without loading it
+    first. If expected_state is given as an (action, status) tuple, the
+    resource is only updated if it is still in that state. Return True if
+    the resource was updated.
+    '''
+    query = model_query(context, models.Resource).filter_by(id=resource_id)
+    if expected_state is not None:
+        action, status = expected_state
+        query = query.filter_by(action=action, status=status)
+    return query.update(values, synchronize_session='evaluate') > 0
+
+
+def resource_metadata_set_batch(context, metadata):
+    '''
+    Set the metadata of several resources in a single transaction, without
+    loading them first. The metadata is given as a dict indexed by resource
+    ID.
+    '''
+    session = _session(context)
+    with session.begin(subtransactions=True):
+        for resource_id, rsrc_metadata in metadata.iteritems():
+            session.query(models.Resource).filter_by(id=resource_id).update(
+                {'rsrc_metadata': rsrc_metadata},
+                synchronize_session='evaluate')
+
+
 def resource_get_all_by_stack(context, stack_id):
     results = model_query(context, models.Resource).\
-        filter_by(stack_id=stack_id).all()
+        filter_by(stack_id=stack_id).\
+        options(orm.joinedload('data')).all()
 
     if not results:
         raise exception.NotFound(_("no resources for stack_id %s were found")
@@ -338,15 +379,52 @@ def stack_get_all_by_tenant(context, limit=None, sort_keys=None, marker=None,
 
 
 def stack_count_all_by_tenant(context, filters=None):
+    if not filters and not context.show_deleted and context.tenant_id:
+        # Use the count maintained as stacks are created and deleted
+        count = model_query(context, models.TenantStackCount.count).\
+            filter_by(tenant=context.tenant_id).scalar()
+        return count or 0
+
     query = _query_stack_get_all_by_tenant(context)
     query = db_filters.exact_filter(query, models.Stack, filters)
     return query.count()
 
 
+def _tenant_stack_count_create(session, tenant):
+    '''
+    Create the stack count of a tenant that has none yet, with a count of
+    zero. This is done in a transaction of its own, before the stack is
+    created, because two writers may race to create the row and the
+    loser's transaction fails.
+    '''
+    if session.query(models.TenantStackCount).get(tenant) is not None:
+        return
+
+    try:
+        models.TenantStackCount(tenant=tenant, count=0).save(session)
+    except db_exception.DBDuplicateEntry:
+        # Another writer created the row first, which serves as well
+        pass
+
+
+def _tenant_stack_count_update(session, tenant, delta):
+    session.query(models.TenantStackCount).filter_by(tenant=tenant).update(
+        {'count': models.TenantStackCount.count + delta},
+        synchronize_session=False)
+
+
 def stack_create(context, values):
     stack_ref = models.Stack()
     stack_ref.update(values)
-    stack_ref.save(_session(context))
+    counted = (stack_ref.owner_id is None and stack_ref.deleted_at is None and
+               stack_ref.tenant is not None)
+    session = _session(context)
+    if counted:
+        _tenant_stack_count_create(session, stack_ref.tenant)
+    with session.begin(subtransactions=True):
+        stack_ref.save(session)
+        if counted:
+            _tenant_stack_count_update(session, stack_ref.tenant, 1)
     return stack_ref
 
 
@@ -365,6 +443,20 @@ def stack_update(context, stack_id, values):
     stack.save(_session(context))
 
 
+def stack_update_state(context, stack_id, values, expected_state=None):
+    '''
+    Update the state of a stack with a single UPDATE statement, without
+    loading it first. If expected_state is given as an (action, status)
+    tuple, the stack is only updated if it is still in that state. Return
+    True if the stack was updated.
+    '''
+    query = model_query(context, models.Stack).filter_by(id=stack_id)
+    if expected_state is not None:
+        action, status = expected_state
+        query = query.filter_by(action=action, status=status)
+    return query.update(values, synchronize_session='evaluate') > 0
+
+
 def stack_delete(context, stack_id):
     s = stack_get(context, stack_id)
     if not s:
@@ -375,14 +467,47 @@ def stack_delete(context, stack_id):
 
     session = Session.object_session(s)
 
-    for r in s.resources:
-        session.delete(r)
+    with session.begin(subtransactions=True):
+        for r in s.resources:
+            session.delete(r)
 
-    s.soft_delete(session=session)
+        if (s.owner_id is None and s.deleted_at is None and
+                s.tenant is not None):
+            _tenant_stack_count_update(session, s.tenant, -1)
+        s.deleted_at = timeutils.utcnow()
 
     session.flush()
 
 
+def stack_total_resources_get(context, stack_id):
+    '''
+    Return the number of resources in a stack and all of its nested stacks,
+    or None if they have not been counted.
+    '''
+    return model_query(context, models.Stack.total_resources).\
+        filter_by(id=stack_id).scalar()
+
+
+def stack_total_resources_set(context, stack_id, total):
+    '''
+    Set the count of resources in a stack and all of its nested stacks, with
+    a single UPDATE statement.
+    '''
+    model_query(context, models.Stack).filter_by(id=stack_id).\
+        update({'total_resources': total}, synchronize_session='evaluate')
+
+
+def stack_total_resources_add(context, stack_id, delta):
+    '''
+    Add to the count of resources in a stack and all of its nested stacks,
+    with a single UPDATE statement. Nothing is changed if the resources have
+    not been counted.
+    '''
+    model_query(context, models.Stack).filter_by(id=stack_id).\
+        update({'total_resources': models.Stack.total_resources + delta},
+               synchronize_session='evaluate')
+
+
 def stack_lock_create(stack_id, engine_id):
     session = get_session()
     with session.begin():
@@ -446,6 +571,15 @@ def event_get(context, event_id):
     return result
 
 
+def event_get_by_resource(context, stack_id, resource_name, event_id):
+    result = model_query(context, models.Event).\
+        filter_by(id=event_id).\
+        filter_by(stack_id=stack_id).\
+        filter_by(resource_name=resource_name).first()
+
+    return result
+
+
 def event_get_all(context):
     stacks = soft_delete_aware_query(context, models.Stack)
     stack_ids = [stack.id for stack in stacks]
@@ -455,15 +589,44 @@ def event_get_all(context):
     return results
 
 
-def event_get_all_by_tenant(context):
-    stacks = soft_delete_aware_query(context, models.Stack).\
-        filter_by(tenant=context.tenant_id).all()
-    results = []
-    for stack in stacks:
-        results.extend(model_query(context, models.Event).
-                       filter_by(stack_id=stack.id).all())
+def _events_filter_and_page_query(context, query, limit=None, marker=None,
+                                  sort_keys=None, sort_dir=None,
+                                  filters=None):
+    filters = dict(filters or {})
+    # Time range filters, as datetimes
+    since = filters.pop('since', None)
+    if since is not None:
+        query = query.filter(models.Event.created_at >= since)
+    until = filters.pop('until', None)
+    if until is not None:
+        query = query.filter(models.Event.created_at < until)
+    query = db_filters.exact_filter(query, models.Event, filters)
+
+    allowed_sort_keys = [models.Event.created_at.key,
+                         models.Event.resource_name.key,
+                         models.Event.resource_action.key,
+                         models.Event.resource_status.key,
+                         models.Event.resource_type.key]
+    filtered_keys = _filter_sort_keys(sort_keys, allowed_sort_keys)
+    if not filtered_keys:
+        # Oldest first, unlike stacks
+        filtered_keys = [models.Event.created_at.key]
+
+    return _paginate_query(context, query, models.Event, limit, filtered_keys,
+                           marker, sort_dir)
 
-    return results
+
+def event_get_all_by_tenant(context, limit=None, marker=None, sort_keys=None,
+                            sort_dir=None, filters=None):
+    query = model_query(context, models.Event).\
+        join(models.Event.stack).\
+        reset_joinpoint().\
+        filter(models.Stack.tenant == context.tenant_id).\
+        options(orm.contains_eager(models.Event.stack))
+    if not context.show_deleted:
+        query = query.filter(models.Stack.deleted_at.is_(None))
+    return _events_filter_and_page_query(context, query, limit, marker,
+                                         sort_keys, sort_dir, filters).all()
 
 
 def _query_all_by_stack(context, stack_id):
@@ -472,8 +635,11 @@ def _query_all_by_stack(context, stack_id):
     return query
 
 
-def event_get_all_by_stack(context, stack_id):
-    return _query_all_by_stack(context, stack_id).all()
+def event_get_all_by_stack(context, stack_id, limit=None, marker=None,
+                           sort_keys=None, sort_dir=None, filters=None):
+    query = _query_all_by_stack(context, stack_id)
+    return _events_filter_and_page_query(context, query, limit, marker,
+                                         sort_keys, sort_dir, filters).all()
 
 
 def event_count_all_by_stack(context, stack_id):
@@ -515,6 +681,39 @@ def event_create(context, values):
     return event_ref
 
 
+def event_create_batch(context, values_list):
+    '''
+    Create several events in one transaction. Any pruning of old events
+    required to keep within max_events_per_stack is done once per stack for
+    the whole batch, in multiples of event_purge_batch_size.
+    '''
+    if cfg.CONF.max_events_per_stack:
+        new_events = {}
+        for values in values_list:
+            if 'stack_id' in values:
+                stack_id = values['stack_id']
+                new_events[stack_id] = new_events.get(stack_id, 0) + 1
+
+        purge_size = max(cfg.CONF.event_purge_batch_size, 1)
+        for stack_id, count in new_events.items():
+            excess = (event_count_all_by_stack(context, stack_id) + count -
+                      cfg.CONF.max_events_per_stack)
+            if excess > 0:
+                purges = (excess + purge_size - 1) // purge_size
+                _delete_event_rows(context, stack_id, purges * purge_size)
+
+    session = _session(context)
+    event_refs = []
+    with session.begin(subtransactions=True):
+        for values in values_list:
+            event_ref = models.Event()
+            event_ref.update(values)
+            session.add(event_ref)
+            event_refs.append(event_ref)
+        session.flush()
+    return event_refs
+
+
 def watch_rule_get(context, watch_rule_id):
     result = model_query(context, models.WatchRule).get(watch_rule_id)
     return result
@@ -537,6 +736,18 @@ def watch_rule_get_all_by_stack(context, stack_id):
     return results
 
 
+def watch_rule_get_all_for_evaluation(context, shard_count=1, shard_index=0,
+                                      exclude_states=None):
+    query = model_query(context, models.WatchRule)
+    if exclude_states:
+        query = query.filter(~models.WatchRule.state.in_(exclude_states))
+    if shard_count > 1:
+        query = query.filter(
+            models.WatchRule.id % shard_count == shard_index)
+    return query.order_by(models.WatchRule.last_evaluated,
+                          models.WatchRule.id).all()
+
+
 def watch_rule_create(context, values):
     obj_ref = models.WatchRule()
     obj_ref.update(values)
@@ -568,6 +779,8 @@ def watch_rule_delete(context, watch_id):
 
     for d in wr.watch_data:
         session.delete(d)
+    for r in wr.watch_data_rollup:
+        session.delete(r)
 
     session.delete(wr)
     session.flush()
@@ -585,7 +798,86 @@ def watch_data_get_all(context):
     return results
 
 
-def purge_deleted(age, granularity='days'):
+def watch_data_get_all_by_watch_rule_id(context, watch_rule_id, since=None,
+                                        until=None):
+    query = model_query(context, models.WatchData).\
+        filter_by(watch_rule_id=watch_rule_id)
+    if since is not None:
+        query = query.filter(models.WatchData.created_at >= since)
+    if until is not None:
+        query = query.filter(models.WatchData.created_at < until)
+    return query.all()
+
+
+def watch_data_rollup_add(context, watch_rule_id, period, bucket_start,
+                          value):
+    rollup = models.WatchDataRollup
+    query = model_query(context, rollup).\
+        filter_by(watch_rule_id=watch_rule_id).\
+        filter_by(period=period).\
+        filter_by(bucket_start=bucket_start)
+    # Aggregate in the database so that concurrent writers don't race
+    values = {
+        'sample_count': rollup.sample_count + 1,
+        'sample_sum': rollup.sample_sum + value,
+        'sample_min': sqlalchemy.case([(rollup.sample_min > value, value)],
+                                      else_=rollup.sample_min),
+        'sample_max': sqlalchemy.case([(rollup.sample_max < value, value)],
+                                      else_=rollup.sample_max),
+        'updated_at': timeutils.utcnow(),
+    }
+    if query.update(values, synchronize_session=False):
+        return
+
+    session = _session(context)
+    obj_ref = rollup()
+    obj_ref.update({'watch_rule_id': watch_rule_id,
+                    'period': period,
+                    'bucket_start': bucket_start,
+                    'sample_count': 1,
+                    'sample_sum': value,
+                    'sample_min': value,
+                    'sample_max': value})
+    try:
+        obj_ref.save(session)
+    except db_exception.DBDuplicateEntry:
+        # Another writer created the bucket first, so add to theirs
+        session.expunge(obj_ref)
+        query.update(values, synchronize_session=False)
+
+
+def watch_data_rollup_get_all(context, watch_rule_id, period, since, until):
+    rollup = models.WatchDataRollup
+    return model_query(context, rollup).\
+        filter_by(watch_rule_id=watch_rule_id).\
+        filter_by(period=period).\
+        filter(rollup.bucket_start >= since).\
+        filter(rollup.bucket_start < until).all()
+
+
+def watch_data_purge(context, before, batch_size=1000):
+    """
+    Delete the watch data samples and rollups from before the given time, in
+    batches of at most batch_size rows. Return the number of rows deleted.
+    """
+    deleted = 0
+    for model, column in ((models.WatchData, models.WatchData.created_at),
+                          (models.WatchDataRollup,
+                           models.WatchDataRollup.bucket_start)):
+        while True:
+            ids = [row.id for row in model_query(context, model.id).
+                   filter(column < before).limit(batch_size)]
+            if not ids:
+                break
+            deleted += model_query(context, model).\
+                filter(model.id.in_(ids)).\
+                delete(synchronize_session=False)
+            if len(ids) < batch_size:
+                break
+    return deleted
+
+
+def _age_in_seconds(age, granularity):
     try:
         age = int(age)
     except ValueError:
@@ -603,6 +895,37 @@ def purge_deleted(age, granularity='days'):
         age = age * 3600
     elif granularity == 'minutes':
         age = age * 60
+    return age
+
+
+def purge_watch_data(age, granularity='days', batch_size=1000):
+    age = _age_in_seconds(age, granularity)
+    try:
+        batch_size = int(batch_size)
+    except ValueError:
+        raise exception.Error(_("batch size should be an integer"))
+    if batch_size <= 0:
+        raise exception.Error(_("batch size should be a positive integer"))
+
+    time_line = timeutils.utcnow() - timedelta(seconds=age)
+    return watch_data_purge(None, time_line, batch_size)
+
+
+def purge_deleted(age, granularity='days', batch_size=1000, progress=None):
+    """
+    Remove stacks that were deleted more than the given age ago, together
+    with their events, templates and credentials. Stacks are removed in
+    batches of at most batch_size, with one DELETE statement per table per
+    batch; if supplied, progress is called with the running total after each
+    batch. Returns the number of stacks removed.
+    """
+    age = _age_in_seconds(age, granularity)
+    try:
+        batch_size = int(batch_size)
+    except ValueError:
+        raise exception.Error(_("batch size should be an integer"))
+    if batch_size <= 0:
+        raise exception.Error(_("batch size should be a positive integer"))
 
     time_line = datetime.now() - timedelta(seconds=age)
     engine = get_engine()
@@ -617,19 +940,35 @@ def purge_deleted(age, granularity='days'):
     stmt = sqlalchemy.select([stack.c.id,
                               stack.c.raw_template_id,
                               stack.c.user_creds_id]).\
-        where(stack.c.deleted_at < time_line)
-    deleted_stacks = engine.execute(stmt)
-
-    for s in deleted_stacks:
-        event_del = event.delete().where(event.c.stack_id == s[0])
-        engine.execute(event_del)
-        stack_del = stack.delete().where(stack.c.id == s[0])
-        engine.execute(stack_del)
-        raw_template_del = raw_template.delete().\
-            where(raw_template.c.id == s[1])
-        engine.execute(raw_template_del)
-        user_creds_del = user_creds.delete().where(user_creds.c.id == s[2])
-        engine.execute(user_creds_del)
+        where(stack.c.deleted_at < time_line).\
+        limit(batch_size)
+
+    purged = 0
+    while True:
+        deleted_stacks = engine.execute(stmt).fetchall()
+        if not deleted_stacks:
+            break
+
+        stack_ids = [s[0] for s in deleted_stacks]
+        template_ids = [s[1] for s in deleted_stacks if s[1] is not None]
+        creds_ids = [s[2] for s in deleted_stacks if s[2] is not None]
+
+        engine.execute(event.delete().where(event.c.stack_id.in_(stack_ids)))
+        engine.execute(stack.delete().where(stack.c.id.in_(stack_ids)))
+        if template_ids:
+            engine.execute(raw_template.delete().
+                           where(raw_template.c.id.in_(template_ids)))
+        if creds_ids:
+            engine.execute(user_creds.delete().
+                           where(user_creds.c.id.in_(creds_ids)))
+
+        purged += len(stack_ids)
+        if progress is not None:
+            progress(purged)
+        if len(stack_ids) < batch_size:
+            break
+
+    return purged
 
 
 def db_sync(version=None):
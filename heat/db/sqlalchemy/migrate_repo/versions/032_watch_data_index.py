@@ -0,0 +1,38 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import sqlalchemy
+
+
+INDEX_NAME = 'ix_watch_data_watch_rule_id_created_at'
+
+
+def upgrade(migrate_engine):
+    meta = sqlalchemy.MetaData()
+    meta.bind = migrate_engine
+
+    watch_data = sqlalchemy.Table('watch_data', meta, autoload=True)
+    sqlalchemy.Index(INDEX_NAME,
+                     watch_data.c.watch_rule_id,
+                     watch_data.c.created_at).create(migrate_engine)
+
+
+def downgrade(migrate_engine):
+    meta = sqlalchemy.MetaData()
+    meta.bind = migrate_engine
+
+    watch_data = sqlalchemy.Table('watch_data', meta, autoload=True)
+    sqlalchemy.Index(INDEX_NAME,
+                     watch_data.c.watch_rule_id,
+                     watch_data.c.created_at).drop(migrate_engine)
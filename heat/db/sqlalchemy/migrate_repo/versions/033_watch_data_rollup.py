@@ -0,0 +1,55 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import sqlalchemy
+
+
+def upgrade(migrate_engine):
+    meta = sqlalchemy.MetaData()
+    meta.bind = migrate_engine
+
+    sqlalchemy.Table('watch_rule', meta, autoload=True)
+    watch_data_rollup = sqlalchemy.Table(
+        'watch_data_rollup', meta,
+        sqlalchemy.Column('id', sqlalchemy.Integer,
+                          primary_key=True, nullable=False),
+        sqlalchemy.Column('created_at', sqlalchemy.DateTime),
+        sqlalchemy.Column('updated_at', sqlalchemy.DateTime),
+        sqlalchemy.Column('watch_rule_id', sqlalchemy.Integer,
+                          sqlalchemy.ForeignKey('watch_rule.id'),
+                          nullable=False),
+        sqlalchemy.Column('period', sqlalchemy.Integer, nullable=False),
+        sqlalchemy.Column('bucket_start', sqlalchemy.DateTime,
+                          nullable=False),
+        sqlalchemy.Column('sample_count', sqlalchemy.Integer,
+                          nullable=False),
+        sqlalchemy.Column('sample_sum', sqlalchemy.Float, nullable=False),
+        sqlalchemy.Column('sample_min', sqlalchemy.Float, nullable=False),
+        sqlalchemy.Column('sample_max', sqlalchemy.Float, nullable=False),
+        sqlalchemy.UniqueConstraint('watch_rule_id', 'period',
+                                    'bucket_start',
+                                    name='uniq_watch_data_rollup0bucket'),
+        mysql_engine='InnoDB',
+        mysql_charset='utf8'
+    )
+    watch_data_rollup.create()
+
+
+def downgrade(migrate_engine):
+    meta = sqlalchemy.MetaData()
+    meta.bind = migrate_engine
+
+    watch_data_rollup = sqlalchemy.Table('watch_data_rollup', meta,
+                                         autoload=True)
+    watch_data_rollup.drop()
@@ -0,0 +1,57 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import sqlalchemy
+
+
+# One index for each of the keys that stack lists may be sorted by. Lists are
+# also sorted by id, so that the order is stable, and so it is indexed too.
+SORT_KEYS = ('created_at', 'updated_at', 'name', 'status')
+
+
+def _index_name(sort_key):
+    return 'ix_stack_tenant_deleted_at_%s' % sort_key
+
+
+def upgrade(migrate_engine):
+    meta = sqlalchemy.MetaData()
+    meta.bind = migrate_engine
+
+    stack = sqlalchemy.Table('stack', meta, autoload=True)
+    for sort_key in SORT_KEYS:
+        if migrate_engine.name == 'mysql':
+            # The tenant column is one character too long to be indexed in
+            # full using utf8 on InnoDB, so index a prefix of it.
+            migrate_engine.execute(
+                'CREATE INDEX %s ON stack (tenant(255), deleted_at, %s, id)' %
+                (_index_name(sort_key), sort_key))
+        else:
+            sqlalchemy.Index(_index_name(sort_key),
+                             stack.c.tenant,
+                             stack.c.deleted_at,
+                             stack.c[sort_key],
+                             stack.c.id).create(migrate_engine)
+
+
+def downgrade(migrate_engine):
+    meta = sqlalchemy.MetaData()
+    meta.bind = migrate_engine
+
+    stack = sqlalchemy.Table('stack', meta, autoload=True)
+    for sort_key in SORT_KEYS:
+        sqlalchemy.Index(_index_name(sort_key),
+                         stack.c.tenant,
+                         stack.c.deleted_at,
+                         stack.c[sort_key],
+                         stack.c.id).drop(migrate_engine)
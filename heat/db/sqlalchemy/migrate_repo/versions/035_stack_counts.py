@@ -0,0 +1,60 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import sqlalchemy
+
+
+def upgrade(migrate_engine):
+    meta = sqlalchemy.MetaData(bind=migrate_engine)
+
+    stack = sqlalchemy.Table('stack', meta, autoload=True)
+    # Left empty for existing stacks; the engine counts the resources the
+    # first time it needs the total
+    total_resources = sqlalchemy.Column('total_resources',
+                                        sqlalchemy.Integer)
+    total_resources.create(stack)
+
+    tenant_stack_count = sqlalchemy.Table(
+        'tenant_stack_count', meta,
+        sqlalchemy.Column('tenant', sqlalchemy.String(length=255),
+                          primary_key=True,
+                          nullable=False),
+        sqlalchemy.Column('created_at', sqlalchemy.DateTime),
+        sqlalchemy.Column('updated_at', sqlalchemy.DateTime),
+        sqlalchemy.Column('count', sqlalchemy.Integer, nullable=False),
+        mysql_engine='InnoDB',
+        mysql_charset='utf8'
+    )
+    tenant_stack_count.create()
+
+    count = sqlalchemy.func.count(stack.c.id)
+    query = sqlalchemy.select([stack.c.tenant, count]).\
+        where(stack.c.owner_id.is_(None)).\
+        where(stack.c.deleted_at.is_(None)).\
+        group_by(stack.c.tenant)
+    counts = [{'tenant': tenant, 'count': n}
+              for tenant, n in migrate_engine.execute(query)]
+    if counts:
+        migrate_engine.execute(tenant_stack_count.insert(), counts)
+
+
+def downgrade(migrate_engine):
+    meta = sqlalchemy.MetaData(bind=migrate_engine)
+
+    tenant_stack_count = sqlalchemy.Table('tenant_stack_count', meta,
+                                          autoload=True)
+    tenant_stack_count.drop()
+
+    stack = sqlalchemy.Table('stack', meta, autoload=True)
+    stack.c.total_resources.drop()
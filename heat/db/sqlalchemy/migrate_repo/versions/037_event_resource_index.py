@@ -0,0 +1,44 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import sqlalchemy
+
+
+# Event lists for a single resource are filtered by stack and resource name
+# and paged in order of creation, with the id to keep the order stable.
+INDEX_NAME = 'ix_event_stack_id_resource_name_created_at'
+
+
+def _index(event):
+    return sqlalchemy.Index(INDEX_NAME,
+                            event.c.stack_id,
+                            event.c.resource_name,
+                            event.c.created_at,
+                            event.c.id)
+
+
+def upgrade(migrate_engine):
+    meta = sqlalchemy.MetaData()
+    meta.bind = migrate_engine
+
+    event = sqlalchemy.Table('event', meta, autoload=True)
+    _index(event).create(migrate_engine)
+
+
+def downgrade(migrate_engine):
+    meta = sqlalchemy.MetaData()
+    meta.bind = migrate_engine
+
+    event = sqlalchemy.Table('event', meta, autoload=True)
+    _index(event).drop(migrate_engine)
@@ -142,6 +142,9 @@ class Stack(BASE, HeatBase, SoftDelete):
     owner_id = sqlalchemy.Column(sqlalchemy.String(36), nullable=True)
     timeout = sqlalchemy.Column(sqlalchemy.Integer)
     disable_rollback = sqlalchemy.Column(sqlalchemy.Boolean, nullable=False)
+    # The number of resources in this stack and all of its nested stacks.
+    # Only maintained for stacks that are not nested.
+    total_resources = sqlalchemy.Column(sqlalchemy.Integer)
 
 
 class StackLock(BASE, HeatBase):
@@ -155,6 +158,15 @@ class StackLock(BASE, HeatBase):
     engine_id = sqlalchemy.Column(sqlalchemy.String(36))
 
 
+class TenantStackCount(BASE, HeatBase):
+    """Counts the stacks, other than nested stacks, owned by a tenant."""
+
+    __tablename__ = 'tenant_stack_count'
+
+    tenant = sqlalchemy.Column(sqlalchemy.String(255), primary_key=True)
+    count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False, default=0)
+
+
 class UserCreds(BASE, HeatBase):
     """
     Represents user credentials and mirrors the 'context'
@@ -269,3 +281,23 @@ class WatchData(BASE, HeatBase):
         sqlalchemy.ForeignKey('watch_rule.id'),
         nullable=False)
     watch_rule = relationship(WatchRule, backref=backref('watch_data'))
+
+
+class WatchDataRollup(BASE, HeatBase):
+    """Represents aggregated watch_data for one rule over a time bucket."""
+
+    __tablename__ = 'watch_data_rollup'
+
+    id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    period = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+    bucket_start = sqlalchemy.Column(sqlalchemy.DateTime, nullable=False)
+    sample_count = sqlalchemy.Column(sqlalchemy.Integer, nullable=False)
+    sample_sum = sqlalchemy.Column(sqlalchemy.Float, nullable=False)
+    sample_min = sqlalchemy.Column(sqlalchemy.Float, nullable=False)
+    sample_max = sqlalchemy.Column(sqlalchemy.Float, nullable=False)
+
+    watch_rule_id = sqlalchemy.Column(
+        sqlalchemy.Integer,
+        sqlalchemy.ForeignKey('watch_rule.id'),
+        nullable=False)
+    watch_rule = relationship(WatchRule, backref=backref('watch_data_rollup'))
@@ -45,5 +45,9 @@ IMPL = LazyPluggable('db_backend',
                      sqlalchemy='heat.db.sqlalchemy.api')
 
 
-def purge_deleted(age, granularity='days'):
-    IMPL.purge_deleted(age, granularity)
+def purge_deleted(age, granularity='days', batch_size=1000, progress=None):
+    return IMPL.purge_deleted(age, granularity, batch_size, progress)
+
+
+def purge_watch_data(age, granularity='days', batch_size=1000):
+    return IMPL.purge_watch_data(age, granularity, batch_size)
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from heat.common import identifier
 from heat.rpc import api
 from heat.openstack.common import timeutils
 from heat.engine import template
@@ -94,6 +95,31 @@ def format_stack(stack):
     return info
 
 
+def format_stack_summary(stack, tmpl):
+    '''
+    Return a summary of the given stack database record, with the given
+    Template, that matches the API output expectations. Unlike format_stack(),
+    this does not need the stack to be loaded, so the parameters and outputs
+    are omitted.
+    '''
+    stack_id = identifier.HeatIdentifier(stack.tenant, stack.name, stack.id)
+    return {
+        api.STACK_NAME: stack.name,
+        api.STACK_ID: dict(stack_id),
+        api.STACK_CREATION_TIME: timeutils.isotime(stack.created_at),
+        api.STACK_UPDATED_TIME: timeutils.isotime(stack.updated_at),
+        api.STACK_NOTIFICATION_TOPICS: [],  # TODO Not implemented yet
+        api.STACK_DESCRIPTION: tmpl[template.DESCRIPTION],
+        api.STACK_TMPL_DESCRIPTION: tmpl[template.DESCRIPTION],
+        api.STACK_ACTION: stack.action or '',
+        api.STACK_STATUS: stack.status or '',
+        api.STACK_STATUS_DATA: stack.status_reason,
+        api.STACK_CAPABILITIES: [],   # TODO Not implemented yet
+        api.STACK_DISABLE_ROLLBACK: stack.disable_rollback,
+        api.STACK_TIMEOUT: stack.timeout,
+    }
+
+
 def format_stack_resource(resource, detail=True):
     '''
     Return a representation of the given resource that matches the API output
@@ -122,6 +148,36 @@ def format_stack_resource(resource, detail=True):
     return res
 
 
+def format_resource_record(resource, stack, tmpl):
+    '''
+    Return a representation of the given resource database record, in the
+    given stack database record with the given Template, that matches the API
+    output expectations, as for format_stack_resource(). Since the stack is
+    not loaded, the resources that depend on this one are not listed and the
+    description is not parsed.
+    '''
+    stack_identifier = identifier.HeatIdentifier(stack.tenant, stack.name,
+                                                 stack.id)
+    res_identifier = identifier.ResourceIdentifier(resource_name=resource.name,
+                                                   **stack_identifier)
+    snippet = tmpl[template.RESOURCES][resource.name]
+    last_updated_time = resource.updated_at or resource.created_at
+    return {
+        api.RES_UPDATED_TIME: timeutils.isotime(last_updated_time),
+        api.RES_NAME: resource.name,
+        api.RES_PHYSICAL_ID: resource.nova_instance or '',
+        api.RES_METADATA: resource.rsrc_metadata,
+        api.RES_ACTION: resource.action,
+        api.RES_STATUS: resource.status,
+        api.RES_STATUS_DATA: resource.status_reason,
+        api.RES_TYPE: snippet.get('Type'),
+        api.RES_ID: dict(res_identifier),
+        api.RES_STACK_ID: dict(stack_identifier),
+        api.RES_STACK_NAME: stack.name,
+        api.RES_DESCRIPTION: snippet.get('Description', ''),
+    }
+
+
 def format_event(event):
     stack_identifier = event.stack.identifier()
 
@@ -142,6 +198,39 @@ def format_event(event):
     return result
 
 
+def format_event_record(event):
+    '''
+    Return a representation of the given event database record that matches
+    the API output expectations, as for format_event(). The record's stack is
+    also a database record, so no stack need be loaded.
+    '''
+    stack = event.stack
+    stack_identifier = identifier.HeatIdentifier(stack.tenant, stack.name,
+                                                 stack.id)
+    res_identifier = identifier.ResourceIdentifier(
+        resource_name=event.resource_name, **stack_identifier)
+    event_identifier = identifier.EventIdentifier(event_id=str(event.id),
+                                                  **res_identifier)
+    try:
+        properties = dict(event.resource_properties)
+    except ValueError as ex:
+        properties = {'Error': str(ex)}
+
+    return {
+        api.EVENT_ID: dict(event_identifier),
+        api.EVENT_STACK_ID: dict(stack_identifier),
+        api.EVENT_STACK_NAME: stack.name,
+        api.EVENT_TIMESTAMP: timeutils.isotime(event.created_at),
+        api.EVENT_RES_NAME: event.resource_name,
+        api.EVENT_RES_PHYSICAL_ID: event.physical_resource_id,
+        api.EVENT_RES_ACTION: event.resource_action,
+        api.EVENT_RES_STATUS: event.resource_status,
+        api.EVENT_RES_STATUS_DATA: event.resource_status_reason,
+        api.EVENT_RES_TYPE: event.resource_type,
+        api.EVENT_RES_PROPERTIES: properties,
+    }
+
+
 def format_notification_body(stack):
     # some other posibilities here are:
     # - template name
@@ -15,8 +15,10 @@
 
 from oslo.config import cfg
 
+from heat.common import cache
 from heat.openstack.common import importutils
 from heat.openstack.common import log as logging
+from heat.openstack.common import timeutils
 from heat.openstack.common.gettextutils import _
 
 logger = logging.getLogger(__name__)
@@ -64,6 +66,37 @@ cloud_opts = [
 ]
 cfg.CONF.register_opts(cloud_opts)
 
+cfg.CONF.import_opt('client_pool_size', 'heat.common.config')
+cfg.CONF.import_opt('client_pool_ttl', 'heat.common.config')
+
+_client_pool = None
+_nova_extensions = None
+
+
+def client_pool():
+    '''
+    Return the pool of service clients, which is shared by all contexts in
+    the engine so that clients and their connections are reused by every
+    request made with the same token.
+    '''
+    global _client_pool
+    if _client_pool is None:
+        _client_pool = cache.LRUCache(cfg.CONF.client_pool_size,
+                                      ttl=cfg.CONF.client_pool_ttl)
+    return _client_pool
+
+
+def nova_extensions():
+    '''
+    Return the Nova client extensions, which are discovered only once as
+    the discovery scans the installed modules.
+    '''
+    global _nova_extensions
+    if _nova_extensions is None:
+        computeshell = novashell.OpenStackComputeShell()
+        _nova_extensions = computeshell._discover_extensions("1.1")
+    return _nova_extensions
+
 
 class OpenStackClients(object):
     '''
@@ -96,25 +129,63 @@ class OpenStackClients(object):
     def url_for(self, **kwargs):
         return self.keystone().url_for(**kwargs)
 
+    def _pool_key(self, kind):
+        con = self.context
+        if con.trust_id is not None:
+            # The trust-scoped token is only obtained when authenticating
+            self.keystone()
+        if con.auth_token is None:
+            return None
+        return (kind, con.auth_url, con.tenant_id or con.tenant,
+                con.auth_token)
+
+    def _pooled(self, kind, create):
+        '''
+        Return the client of the given kind from the engine-wide pool, or
+        create it with create() and add it to the pool. A pooled client is
+        not reused after its token expires.
+        '''
+        key = self._pool_key(kind)
+        pool = client_pool()
+        client = pool.get(key) if key is not None else None
+        if client is not None:
+            return client
+
+        client = create()
+        if client is not None and key is not None:
+            ttl = cfg.CONF.client_pool_ttl
+            expires = (self._keystone.auth_token_expires
+                       if self._keystone is not None else None)
+            if expires is not None:
+                remaining = timeutils.delta_seconds(
+                    timeutils.utcnow(), timeutils.normalize_time(expires))
+                ttl = max(0, min(ttl, remaining))
+            pool.set(key, client, ttl=ttl)
+        return client
+
     def nova(self, service_type='compute'):
         if service_type in self._nova:
             return self._nova[service_type]
 
+        client = self._pooled(('nova', service_type),
+                              lambda: self._nova_client(service_type))
+        if client is not None:
+            self._nova[service_type] = client
+        return client
+
+    def _nova_client(self, service_type):
         con = self.context
         if self.auth_token is None:
             logger.error(_("Nova connection failed, no auth_token!"))
             return None
 
-        computeshell = novashell.OpenStackComputeShell()
-        extensions = computeshell._discover_extensions("1.1")
-
         args = {
             'project_id': con.tenant,
             'auth_url': con.auth_url,
             'service_type': service_type,
             'username': None,
             'api_key': None,
-            'extensions': extensions,
+            'extensions': nova_extensions(),
             'cacert': self._get_client_option('nova', 'ca_file'),
             'insecure': self._get_client_option('nova', 'insecure')
         }
@@ -124,8 +195,6 @@ class OpenStackClients(object):
         management_url = self.url_for(service_type=service_type)
         client.client.auth_token = self.auth_token
         client.client.management_url = management_url
-
-        self._nova[service_type] = client
         return client
 
     def swift(self):
@@ -159,6 +228,10 @@ class OpenStackClients(object):
         if self._neutron:
             return self._neutron
 
+        self._neutron = self._pooled('neutron', self._neutron_client)
+        return self._neutron
+
+    def _neutron_client(self):
         con = self.context
         if self.auth_token is None:
             logger.error(_("Neutron connection failed, no auth_token!"))
@@ -173,9 +246,7 @@ class OpenStackClients(object):
             'insecure': self._get_client_option('neutron', 'insecure')
         }
 
-        self._neutron = neutronclient.Client(**args)
-
-        return self._neutron
+        return neutronclient.Client(**args)
 
     def cinder(self):
         if cinderclient is None:
@@ -183,6 +254,10 @@ class OpenStackClients(object):
         if self._cinder:
             return self._cinder
 
+        self._cinder = self._pooled('cinder', self._cinder_client)
+        return self._cinder
+
+    def _cinder_client(self):
         con = self.context
         if self.auth_token is None:
             logger.error(_("Cinder connection failed, no auth_token!"))
@@ -198,12 +273,11 @@ class OpenStackClients(object):
             'insecure': self._get_client_option('cinder', 'insecure')
         }
 
-        self._cinder = cinderclient.Client('1', **args)
+        client = cinderclient.Client('1', **args)
         management_url = self.url_for(service_type='volume')
-        self._cinder.client.auth_token = self.auth_token
-        self._cinder.client.management_url = management_url
-
-        return self._cinder
+        client.client.auth_token = self.auth_token
+        client.client.management_url = management_url
+        return client
 
     def trove(self, service_type="database"):
         if troveclient is None:
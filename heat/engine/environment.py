@@ -15,6 +15,7 @@
 
 import itertools
 
+from heat.openstack.common import importutils
 from heat.openstack.common import log
 from heat.openstack.common.gettextutils import _
 from heat.common import exception
@@ -95,6 +96,40 @@ class ClassResourceInfo(ResourceInfo):
     def get_class(self):
         return self.value
 
+    def is_available(self):
+        return True
+
+
+class LazyClassResourceInfo(ClassResourceInfo):
+    """Store the mapping of resource name to the module implementing it.
+
+    The module is imported only when the class is first required. If the
+    module cannot be imported, or does not provide the type (for example
+    because its client library is missing), the type is unavailable.
+    """
+
+    def _load(self):
+        if isinstance(self.value, basestring):
+            module_name = self.value
+            try:
+                module = importutils.import_module(module_name)
+                mapping = module.resource_mapping()
+            except ImportError as ex:
+                LOG.error(_('Failed to import module %(module)s: %(ex)s') % {
+                    'module': module_name, 'ex': str(ex)})
+                mapping = {}
+            self.value = mapping.get(self.name)
+        return self.value
+
+    def get_class(self):
+        if self._load() is None:
+            msg = _("Unknown resource Type : %s") % self.name
+            raise exception.StackValidationFailed(message=msg)
+        return self.value
+
+    def is_available(self):
+        return self._load() is not None
+
 
 class TemplateResourceInfo(ResourceInfo):
     """Store the info needed to start a TemplateResource.
@@ -155,6 +190,10 @@ class ResourceRegistry(object):
         ri = ResourceInfo(self, [resource_type], resource_class)
         self._register_info([resource_type], ri)
 
+    def register_lazy_class(self, resource_type, module_name):
+        ri = LazyClassResourceInfo(self, [resource_type], module_name)
+        self._register_info([resource_type], ri)
+
     def _load_registry(self, path, registry):
         for k, v in iter(registry.items()):
             if v is None:
@@ -296,8 +335,9 @@ class ResourceRegistry(object):
     def get_types(self):
         '''Return a list of valid resource types.'''
         def is_plugin(key):
-            if isinstance(self._registry[key], ClassResourceInfo):
-                return True
+            info = self._registry[key]
+            if isinstance(info, ClassResourceInfo):
+                return info.is_available()
             return False
         return [k for k in self._registry if is_plugin(k)]
 
@@ -345,6 +385,9 @@ class Environment(object):
     def register_class(self, resource_type, resource_class):
         self.registry.register_class(resource_type, resource_class)
 
+    def register_lazy_class(self, resource_type, module_name):
+        self.registry.register_lazy_class(resource_type, module_name)
+
     def get_class(self, resource_type, resource_name=None):
         return self.registry.get_class(resource_type, resource_name)
 
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import eventlet
+
 from heat.db import api as db_api
 from heat.common import exception
 from heat.common import identifier
@@ -69,6 +71,15 @@ class Event(object):
 
     def store(self):
         '''Store the Event in the database.'''
+        if self.id is not None:
+            logger.warning(_('Duplicating event'))
+
+        new_ev = db_api.event_create(self.context, self._db_values())
+        self.id = new_ev.id
+        return self.id
+
+    def _db_values(self):
+        '''Return the values with which to store the Event.'''
         ev = {
             'resource_name': self.resource_name,
             'physical_resource_id': self.physical_resource_id,
@@ -83,12 +94,7 @@ class Event(object):
         if self.timestamp is not None:
             ev['created_at'] = self.timestamp
 
-        if self.id is not None:
-            logger.warning(_('Duplicating event'))
-
-        new_ev = db_api.event_create(self.context, ev)
-        self.id = new_ev.id
-        return self.id
+        return ev
 
     def identifier(self):
         '''Return a unique identifier for the event.'''
@@ -99,3 +105,50 @@ class Event(object):
             resource_name=self.resource_name, **self.stack.identifier())
 
         return identifier.EventIdentifier(event_id=str(self.id), **res_id)
+
+
+class EventWriter(object):
+    '''
+    Writes the Events of a stack to the database.
+
+    If a batch interval is given, Events are buffered and written in a
+    single transaction when the interval has elapsed since the first
+    buffered Event, or when flush() is called (e.g. on a change of stack
+    state). Otherwise each Event is stored immediately.
+    '''
+
+    def __init__(self, context, interval=None):
+        self.context = context
+        self.interval = interval
+        self._pending = []
+        self._timer = None
+
+    def write(self, ev):
+        '''Store the Event, or queue it to be stored in the next batch.'''
+        if not self.interval:
+            ev.store()
+            return
+
+        self._pending.append(ev)
+        if self._timer is None:
+            self._timer = eventlet.spawn_after(self.interval, self.flush)
+
+    def flush(self):
+        '''Store all of the queued Events.'''
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        try:
+            new_evs = db_api.event_create_batch(self.context,
+                                                [ev._db_values()
+                                                 for ev in pending])
+        except Exception as ex:
+            logger.error(_('DB error %s') % str(ex))
+        else:
+            for ev, new_ev in zip(pending, new_evs):
+                ev.id = new_ev.id
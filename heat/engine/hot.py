@@ -48,6 +48,9 @@ class HOTemplate(template.Template):
     A Heat Orchestration Template format stack template.
     """
 
+    RUNTIME_FUNCTIONS = template.Template.RUNTIME_FUNCTIONS + (
+        'get_resource', 'get_attr', 'str_replace')
+
     def __getitem__(self, section):
         """"Get the relevant section in the template."""
         #first translate from CFN into HOT terminology if necessary
@@ -16,6 +16,7 @@
 import collections
 import copy
 import functools
+import json
 import re
 import six
 
@@ -24,6 +25,7 @@ from oslo.config import cfg
 from heat.engine import environment
 from heat.common import exception
 from heat.engine import dependencies
+from heat.engine import event
 from heat.common import identifier
 from heat.engine import notification
 from heat.engine import resource
@@ -43,10 +45,16 @@ from heat.openstack.common import strutils
 
 from heat.common.exception import StackValidationFailed
 
+cfg.CONF.import_opt('event_batch_interval', 'heat.common.config')
+
 logger = logging.getLogger(__name__)
 
 (PARAM_STACK_NAME, PARAM_REGION) = ('AWS::StackName', 'AWS::Region')
 
+# Maximum number of distinct snippets for which a Stack caches the results of
+# resolve_runtime_data() between resource state changes
+RESOLVED_DATA_CACHE_SIZE = 1000
+
 
 class Stack(collections.Mapping):
 
@@ -95,8 +103,18 @@ class Stack(collections.Mapping):
         self.timeout_mins = timeout_mins
         self.disable_rollback = disable_rollback
         self.parent_resource = parent_resource
+        self.event_writer = event.EventWriter(context,
+                                              cfg.CONF.event_batch_interval)
+        # The number of nested stacks of this stack being deleted
+        self.nested_deletes = 0
+        # The number of resources in the stored template, as counted in the
+        # total_resources of the stack that this stack belongs to
+        self._stored_resources = (len(tmpl[template.RESOURCES])
+                                  if stack_id is not None else 0)
         self._resources = None
         self._dependencies = None
+        self._db_resources = None
+        self._resolved_data = {}
 
         resources.initialise()
 
@@ -115,11 +133,44 @@ class Stack(collections.Mapping):
     def resources(self):
         if self._resources is None:
             template_resources = self.t[template.RESOURCES]
-            self._resources = dict((name, resource.Resource(name, data, self))
-                                   for (name, data) in
-                                   template_resources.items())
+            # Fetch the stored state of all of the resources in one query,
+            # rather than one per resource
+            self._db_resources = self._load_db_resources()
+            try:
+                self._resources = dict((name,
+                                        resource.Resource(name, data, self))
+                                       for (name, data) in
+                                       template_resources.items())
+            finally:
+                self._db_resources = None
         return self._resources
 
+    def _load_db_resources(self):
+        '''
+        Return a dict of the database records of the stack's resources,
+        indexed by resource name.
+        '''
+        if self.id is None:
+            return {}
+        try:
+            db_resources = db_api.resource_get_all_by_stack(self.context,
+                                                            self.id)
+        except exception.NotFound:
+            return {}
+        return dict((r.name, r) for r in db_resources)
+
+    def db_resource_get(self, name):
+        '''
+        Return the database record of the named resource, or None if it has
+        not been stored.
+        '''
+        if self._db_resources is not None:
+            return self._db_resources.get(name)
+        if self.id is None:
+            return None
+        return db_api.resource_get_by_name_and_stack(self.context,
+                                                     name, self.id)
+
     @property
     def dependencies(self):
         if self._dependencies is None:
@@ -130,6 +181,29 @@ class Stack(collections.Mapping):
     def reset_dependencies(self):
         self._dependencies = None
 
+    def metadata_referrers(self, resource_name):
+        '''
+        Return the resources, in dependency order, whose metadata refers to
+        the named resource either directly or through other resources, and so
+        may change when the named resource's metadata does. The references
+        are found in the template, without resolving any of it.
+        '''
+        referrers = collections.defaultdict(set)
+        for res in self.resources.itervalues():
+            for name in _references(res.t):
+                referrers[name].add(res.name)
+
+        changed = set([resource_name])
+        unvisited = [resource_name]
+        while unvisited:
+            for name in referrers[unvisited.pop()] - changed:
+                changed.add(name)
+                unvisited.append(name)
+
+        return [res for res in self.dependencies
+                if res.name != resource_name and
+                changed.intersection(_references(res.t.get('Metadata')))]
+
     @property
     def root_stack(self):
         '''
@@ -142,8 +216,21 @@ class Stack(collections.Mapping):
     def total_resources(self):
         '''
         Return the total number of resources in a stack, including nested
-        stacks below.
+        stacks below. For a stored stack that is not nested, this is the count
+        maintained in the database, so the nested stacks need not be loaded.
         '''
+        if self.id is not None and self.owner_id is None:
+            total = db_api.stack_total_resources_get(self.context, self.id)
+            if total is None:
+                # The stack was created before resources were counted
+                total = self._count_resources()
+                db_api.stack_total_resources_set(self.context, self.id,
+                                                 total)
+            return total
+
+        return self._count_resources()
+
+    def _count_resources(self):
         def total_nested(res):
             get_nested = getattr(res, 'nested', None)
             if callable(get_nested):
@@ -154,6 +241,26 @@ class Stack(collections.Mapping):
 
         return len(self) + sum(total_nested(res) for res in self.itervalues())
 
+    def _add_total_resources(self, delta):
+        '''
+        Add to the total_resources of the stack, not nested, that this stack
+        belongs to.
+        '''
+        root = self.root_stack
+        if root.owner_id is None:
+            counted_id = root.id
+        elif root is not self:
+            # A nested stack of a backup stack, whose resources are counted
+            # in the stack that the backup stack belongs to
+            counted_id = root.owner_id
+        else:
+            # A backup stack, whose resources are already counted, or a
+            # nested stack loaded without its parent
+            return
+
+        if delta and counted_id is not None:
+            db_api.stack_total_resources_add(self.context, counted_id, delta)
+
     def _set_param_stackid(self):
         '''
         Update self.parameters with the current ARN which is then provided
@@ -172,8 +279,8 @@ class Stack(collections.Mapping):
     def _get_dependencies(resources):
         '''Return the dependency graph for a list of resources.'''
         deps = dependencies.Dependencies()
-        for resource in resources:
-            resource.add_dependencies(deps)
+        for res in resources:
+            res.add_dependencies(deps)
 
         return deps
 
@@ -216,6 +323,7 @@ class Stack(collections.Mapping):
             'timeout': self.timeout_mins,
             'disable_rollback': self.disable_rollback,
         }
+        resources = len(self.t[template.RESOURCES])
         if self.id:
             db_api.stack_update(self.context, self.id, s)
         else:
@@ -227,9 +335,15 @@ class Stack(collections.Mapping):
             else:
                 new_creds = db_api.user_creds_create(self.context)
             s['user_creds_id'] = new_creds.id
+            if self.owner_id is None:
+                s['total_resources'] = resources
+                self._stored_resources = resources
             new_s = db_api.stack_create(self.context, s)
             self.id = new_s.id
 
+        self._add_total_resources(resources - self._stored_resources)
+        self._stored_resources = resources
+
         self._set_param_stackid()
 
         return self.id
@@ -262,10 +376,12 @@ class Stack(collections.Mapping):
         '''Set the resource with the specified name to a specific value.'''
         resource.stack = self
         self.resources[key] = resource
+        self.reset_resolved_data()
 
     def __delitem__(self, key):
         '''Remove the resource with the specified name.'''
         del self.resources[key]
+        self.reset_resolved_data()
 
     def __contains__(self, key):
         '''Determine whether the stack contains the specified resource.'''
@@ -345,13 +461,16 @@ class Stack(collections.Mapping):
         self.status = status
         self.status_reason = reason
 
+        # Write out any buffered resource events ahead of the stack state
+        self.event_writer.flush()
+
         if self.id is None:
             return
 
-        stack = db_api.stack_get(self.context, self.id)
-        stack.update_and_save({'action': action,
-                               'status': status,
-                               'status_reason': reason})
+        db_api.stack_update_state(self.context, self.id,
+                                  {'action': action,
+                                   'status': status,
+                                   'status_reason': reason})
         notification.send(self)
 
     @property
@@ -528,6 +647,7 @@ class Stack(collections.Mapping):
         # stack resources are stored, even if one is in a failed
         # state (otherwise we won't remove them on delete)
         self.t = newstack.t
+        self.reset_resolved_data()
         template_outputs = self.t[template.OUTPUTS]
         self.outputs = self.resolve_static_data(template_outputs)
         self.store()
@@ -540,6 +660,14 @@ class Stack(collections.Mapping):
         create, which amount to the same thing, but the states are recorded
         differently.
         '''
+        scheduler.TaskRunner(self.delete_task, action)()
+
+    def delete_task(self, action=DELETE):
+        '''
+        A task to delete the stack, as for delete(). The task yields while
+        the resources are being deleted, so that several stacks (such as
+        the nested stacks of a parent stack) can be deleted at once.
+        '''
         if action not in (self.DELETE, self.ROLLBACK):
             logger.error(_("Unexpected action %s passed to delete!") % action)
             self.state_set(self.DELETE, self.FAILED,
@@ -563,8 +691,11 @@ class Stack(collections.Mapping):
         action_task = scheduler.DependencyTaskGroup(self.dependencies,
                                                     resource.Resource.destroy,
                                                     reverse=True)
+        action_runner = scheduler.TaskRunner(action_task)
         try:
-            scheduler.TaskRunner(action_task)(timeout=self.timeout_secs())
+            action_runner.start(timeout=self.timeout_secs())
+            while not action_runner.step():
+                yield
         except exception.ResourceFailure as ex:
             stack_status = self.FAILED
             reason = 'Resource %s failed: %s' % (action.lower(), str(ex))
@@ -589,6 +720,7 @@ class Stack(collections.Mapping):
 
         if stack_status != self.FAILED:
             # delete the stack
+            self._add_total_resources(-self._stored_resources)
             db_api.stack_delete(self.context, self.id)
             self.id = None
 
@@ -682,7 +814,56 @@ class Stack(collections.Mapping):
         return resolve_static_data(self.t, self, self.parameters, snippet)
 
     def resolve_runtime_data(self, snippet):
-        return resolve_runtime_data(self.t, self.resources, snippet)
+        '''
+        Resolve the intrinsic functions in a snippet that depend on the state
+        of the stack's resources.
+
+        Results are cached until the state of a resource in the stack changes
+        (see reset_resolved_data()), so repeated property reads do not
+        re-resolve the same snippet or re-query resource attributes.
+        '''
+        try:
+            key = json.dumps(snippet, sort_keys=True)
+        except (TypeError, ValueError):
+            return resolve_runtime_data(self.t, self.resources, snippet)
+
+        if key not in self._resolved_data:
+            if len(self._resolved_data) >= RESOLVED_DATA_CACHE_SIZE:
+                self._resolved_data.clear()
+            self._resolved_data[key] = resolve_runtime_data(self.t,
+                                                            self.resources,
+                                                            snippet)
+        return copy.deepcopy(self._resolved_data[key])
+
+    def reset_resolved_data(self):
+        '''
+        Discard any cached results of resolve_runtime_data(). This must be
+        called whenever a change to a resource may alter the value of an
+        intrinsic function referring to it.
+        '''
+        self._resolved_data.clear()
+
+
+def _references(snippet):
+    '''
+    Return the set of names referred to by Ref and Fn::GetAtt functions (or
+    their HOT equivalents) in a template snippet.
+    '''
+    names = set()
+    if isinstance(snippet, dict):
+        for key, value in snippet.items():
+            if key in ('Ref', 'get_resource'):
+                if isinstance(value, basestring):
+                    names.add(value)
+            elif key in ('Fn::GetAtt', 'get_attr'):
+                if isinstance(value, list) and value:
+                    names.add(value[0])
+            else:
+                names |= _references(value)
+    elif isinstance(snippet, list):
+        for item in snippet:
+            names |= _references(item)
+    return names
 
 
 def resolve_static_data(template, stack, parameters, snippet):
@@ -720,17 +901,48 @@ def resolve_runtime_data(template, resources, snippet):
                       template.resolve_select,
                       template.resolve_joins,
                       template.resolve_replace,
-                      template.resolve_base64])
+                      template.resolve_base64],
+                     functions=template.RUNTIME_FUNCTIONS)
 
 
-def transform(data, transformations):
+def transform(data, transformations, functions=None):
     '''
     Apply each of the transformation functions in the supplied list to the data
     in turn.
+
+    If the names of the intrinsic functions handled by the transformations are
+    supplied, the data is instead resolved in a single bottom-up pass: the
+    transformations are applied only to intrinsic function calls, after their
+    arguments have been resolved, rather than each one rebuilding the whole
+    of the data.
     '''
+    if functions is not None:
+        return _transform_functions(data, transformations, functions)
+
     def sub_transform(d):
         return transform(d, transformations)
 
     for t in transformations:
         data = t(data, transform=sub_transform)
     return data
+
+
+def _transform_functions(data, transformations, functions):
+    '''
+    Resolve the intrinsic function calls in the data in a single pass.
+    '''
+    def resolve(snippet):
+        if isinstance(snippet, dict):
+            if len(snippet) == 1:
+                key, value = snippet.items()[0]
+                if key in functions:
+                    result = {key: resolve(value)}
+                    for t in transformations:
+                        result = t(result)
+                    return result
+            return dict((k, resolve(v)) for k, v in snippet.iteritems())
+        elif isinstance(snippet, list):
+            return [resolve(s) for s in snippet]
+        return snippet
+
+    return resolve(data)
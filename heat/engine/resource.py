@@ -16,6 +16,8 @@
 import base64
 from datetime import datetime
 
+from oslo.config import cfg
+
 from heat.engine import event
 from heat.common import exception
 from heat.openstack.common import excutils
@@ -34,6 +36,8 @@ from heat.openstack.common.gettextutils import _
 
 logger = logging.getLogger(__name__)
 
+cfg.CONF.import_opt('coalesce_resource_state_writes', 'heat.common.config')
+
 DELETION_POLICY = (DELETE, RETAIN, SNAPSHOT) = ('Delete', 'Retain', 'Snapshot')
 
 
@@ -88,6 +92,7 @@ class Metadata(object):
             raise exception.ResourceNotAvailable(resource_name=resource.name)
         rs = db_api.resource_get(resource.stack.context, resource.id)
         rs.update_and_save({'rsrc_metadata': metadata})
+        resource.stack.reset_resolved_data()
 
 
 class SupportStatus(object):
@@ -180,8 +185,7 @@ class Resource(object):
                                      self.attributes_schema,
                                      self._resolve_attribute)
 
-        resource = db_api.resource_get_by_name_and_stack(self.context,
-                                                         name, stack.id)
+        resource = stack.db_resource_get(name)
         if resource:
             self.resource_id = resource.nova_instance
             self.action = resource.action
@@ -396,12 +400,16 @@ class Resource(object):
         '''
         assert action in self.ACTIONS, 'Invalid action %s' % action
 
-        try:
-            self.state_set(action, self.IN_PROGRESS)
+        action_l = action.lower()
+        handle = getattr(self, 'handle_%s' % action_l, None)
+        check = getattr(self, 'check_%s_complete' % action_l, None)
 
-            action_l = action.lower()
-            handle = getattr(self, 'handle_%s' % action_l, None)
-            check = getattr(self, 'check_%s_complete' % action_l, None)
+        # An action with nothing to wait for completes within this step, so
+        # storing its IN_PROGRESS state may be skipped
+        store = callable(handle) or not cfg.CONF.coalesce_resource_state_writes
+
+        try:
+            self.state_set(action, self.IN_PROGRESS, store=store)
 
             if callable(pre_func):
                 pre_func()
@@ -618,10 +626,20 @@ class Resource(object):
 
         logger.info(_('deleting %s') % str(self))
 
+        deletion_policy = self.t.get('DeletionPolicy', DELETE)
+
+        # A deletion with nothing to wait for completes within this step, so
+        # storing its IN_PROGRESS state may be skipped
+        store = not cfg.CONF.coalesce_resource_state_writes
+        if deletion_policy != RETAIN:
+            handle = ('handle_delete' if deletion_policy == DELETE
+                      else 'handle_snapshot_delete')
+            store = store or any(callable(getattr(self, m, None))
+                                 for m in (handle, 'check_delete_complete'))
+
         try:
-            self.state_set(action, self.IN_PROGRESS)
+            self.state_set(action, self.IN_PROGRESS, store=store)
 
-            deletion_policy = self.t.get('DeletionPolicy', DELETE)
             handle_data = None
             if deletion_policy == DELETE:
                 if callable(getattr(self, 'handle_delete', None)):
@@ -674,10 +692,14 @@ class Resource(object):
 
     def resource_id_set(self, inst):
         self.resource_id = inst
+        self.stack.reset_resolved_data()
         if self.id is not None:
             try:
-                rs = db_api.resource_get(self.context, self.id)
-                rs.update_and_save({'nova_instance': self.resource_id})
+                if not db_api.resource_update(self.context, self.id,
+                                              {'nova_instance':
+                                               self.resource_id}):
+                    logger.warn(_('db error resource %s not found') %
+                                self.id)
             except Exception as ex:
                 logger.warn(_('db error %s') % str(ex))
 
@@ -709,7 +731,7 @@ class Resource(object):
                          self.name, self.type())
 
         try:
-            ev.store()
+            self.stack.event_writer.write(ev)
         except Exception as ex:
             logger.error(_('DB error %s') % str(ex))
 
@@ -720,21 +742,26 @@ class Resource(object):
 
         if self.id is not None:
             try:
-                rs = db_api.resource_get(self.context, self.id)
-                rs.update_and_save({'action': self.action,
-                                    'status': self.status,
-                                    'status_reason': reason,
-                                    'stack_id': self.stack.id,
-                                    'nova_instance': self.resource_id})
+                if not db_api.resource_update(self.context, self.id,
+                                              {'action': self.action,
+                                               'status': self.status,
+                                               'status_reason': reason,
+                                               'stack_id': self.stack.id,
+                                               'nova_instance':
+                                               self.resource_id}):
+                    raise exception.NotFound(_('resource with id %s not '
+                                               'found') % self.id)
 
                 self.stack.updated_time = datetime.utcnow()
             except Exception as ex:
                 logger.error(_('DB error %s') % str(ex))
 
-        # store resource in DB on transition to CREATE_IN_PROGRESS
+        # store resource in DB on transition to CREATE_IN_PROGRESS, or to
+        # CREATE_COMPLETE if storing the IN_PROGRESS state was skipped.
         # all other transistions (other than to DELETE_COMPLETE)
-        # should be handled by the update_and_save above..
-        elif (action, status) == (self.CREATE, self.IN_PROGRESS):
+        # should be handled by the resource_update above..
+        elif action == self.CREATE and status in (self.IN_PROGRESS,
+                                                  self.COMPLETE):
             self._store()
 
     def _resolve_attribute(self, name):
@@ -754,8 +781,15 @@ class Resource(object):
         """
         self.action = self.INIT
         self.status = self.COMPLETE
+        self.stack.reset_resolved_data()
 
-    def state_set(self, action, status, reason="state changed"):
+    def state_set(self, action, status, reason="state changed", store=True):
+        '''
+        Set the state of the resource, and record an event for the change.
+        If store is False, the state is not written to the database; this
+        is only useful when another state will be set before anything can
+        observe the resource.
+        '''
         if action not in self.ACTIONS:
             raise ValueError(_("Invalid action %s") % action)
 
@@ -764,7 +798,13 @@ class Resource(object):
 
         old_state = (self.action, self.status)
         new_state = (action, status)
-        self._store_or_update(action, status, reason)
+        if store:
+            self._store_or_update(action, status, reason)
+        else:
+            self.action = action
+            self.status = status
+            self.status_reason = reason
+        self.stack.reset_resolved_data()
 
         if new_state != old_state:
             self._add_event(action, status, reason)
@@ -859,6 +899,13 @@ class Resource(object):
             logger.warning(_("Resource %s does not implement metadata update")
                            % self.name)
 
+    def refreshed_metadata(self):
+        '''
+        Return the metadata that a refresh by metadata_update() would store,
+        or None for resources which don't refresh their metadata.
+        '''
+        return None
+
     @classmethod
     def resource_to_template(cls, resource_type):
         '''
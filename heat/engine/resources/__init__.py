@@ -106,13 +106,30 @@ def initialise():
     _load_all(_environment)
 
 
-def _load_global_resources(env):
+def scan_resource_modules():
+    '''
+    Import every module in this package and return a dict mapping each
+    resource type found to the name of the module implementing it.
+    '''
     import sys
     from heat.common import plugin_loader
 
-    # load plugin modules
-    _register_modules(env, plugin_loader.load_modules(sys.modules[__name__]))
+    mapping = {}
+    for module in plugin_loader.load_modules(sys.modules[__name__]):
+        for res_name, res_class in _get_module_resources(module) or []:
+            mapping[res_name] = module.__name__
+    return mapping
+
+
+def _load_global_resources(env):
+    from heat.common import plugin_loader
+    from heat.engine.resources import manifest
 
+    # register the built-in resources, which are imported on first use
+    for res_name, module_name in manifest.RESOURCE_MODULES.iteritems():
+        env.register_lazy_class(res_name, '%s.%s' % (__name__, module_name))
+
+    # load plugin modules
     cfg.CONF.import_opt('plugin_dirs', 'heat.common.config')
     plugin_pkg = plugin_loader.create_subpackage(cfg.CONF.plugin_dirs,
                                                  'heat.engine')
@@ -15,6 +15,9 @@
 
 import copy
 import math
+import time
+
+from eventlet import event
 
 from heat.engine import resource
 from heat.engine import signal_responder
@@ -31,6 +34,47 @@ from heat.engine import stack_resource
 
 logger = logging.getLogger(__name__)
 
+# Load balancer membership updates in progress, keyed by load balancer
+_lb_member_updates = {}
+
+
+def _update_lb_members(lb_resource, members):
+    '''
+    Update the members of a load balancer, coalescing concurrent requests.
+
+    While an update of the load balancer is in progress, further requests
+    only record the list of members they want and wait. When the update
+    finishes, one more update applies the most recently requested list on
+    behalf of all of the waiting requests.
+    '''
+    key = (lb_resource.stack.id, lb_resource.name)
+    pending = _lb_member_updates.get(key)
+    if pending is not None:
+        pending['members'] = members
+        if pending['waiter'] is None:
+            pending['waiter'] = event.Event()
+        return pending['waiter'].wait()
+
+    pending = _lb_member_updates[key] = {'members': members, 'waiter': None}
+    waiter = None
+    try:
+        while True:
+            try:
+                lb_resource.update_members(pending['members'])
+            except Exception as ex:
+                for w in (waiter, pending['waiter']):
+                    if w is not None:
+                        w.send_exception(ex)
+                raise
+            if waiter is not None:
+                waiter.send(None)
+            waiter = pending['waiter']
+            pending['waiter'] = None
+            if waiter is None:
+                return
+    finally:
+        del _lb_member_updates[key]
+
 
 class CooldownMixin(object):
     '''
@@ -289,23 +333,47 @@ class InstanceGroup(stack_resource.StackResource):
         # the minimum number of instances in service during update
         efft_capacity = max(capacity - efft_bat_sz, efft_min_sz) + efft_bat_sz
 
+        def batch_template(remainder):
+            # the temporary capacity is no longer needed once enough
+            # instances have been replaced
+            if capacity - remainder >= efft_min_sz:
+                batch_capacity = capacity
+            else:
+                batch_capacity = efft_capacity
+            return batch_capacity, self._create_template(batch_capacity,
+                                                         efft_bat_sz)
+
+        lb_members = None
         try:
             remainder = capacity
-            while remainder > 0 or efft_capacity > capacity:
-                if capacity - remainder >= efft_min_sz:
-                    efft_capacity = capacity
-                template = self._create_template(efft_capacity, efft_bat_sz)
-                self._lb_reload(exclude=changing_instances(template))
+            batch_capacity = efft_capacity
+            batch_num = 0
+            while remainder > 0 or batch_capacity > capacity:
+                # Without a pause, this also brings the previous batch back
+                # into the load balancers, so one reload serves both
+                batch_capacity, template = batch_template(remainder)
+                lb_members = self._lb_reload(
+                    exclude=changing_instances(template), current=lb_members)
+
+                batch_num += 1
+                start_time = time.time()
                 updater = self.update_with_template(template, {})
                 updater.run_to_completion()
                 self.check_update_complete(updater)
+                logger.info(_('%(name)s rolling update batch %(num)d '
+                              'completed in %(secs).1fs') % {
+                                  'name': self.name, 'num': batch_num,
+                                  'secs': time.time() - start_time})
+
                 remainder -= efft_bat_sz
                 if remainder > 0 and pause_sec > 0:
-                    self._lb_reload()
+                    # Bring this batch into the load balancers for the
+                    # pause, keeping the group at full capacity
+                    lb_members = self._lb_reload(current=lb_members)
                     waiter = scheduler.TaskRunner(pause_between_batch)
                     waiter(timeout=pause_sec)
         finally:
-            self._lb_reload()
+            self._lb_reload(current=lb_members)
 
     def resize(self, new_capacity):
         """
@@ -313,42 +381,71 @@ class InstanceGroup(stack_resource.StackResource):
 
         When shrinking, the oldest instances will be removed.
         """
-        new_template = self._create_template(new_capacity)
         try:
-            updater = self.update_with_template(new_template, {})
-            updater.run_to_completion()
-            self.check_update_complete(updater)
+            if not self._resize_incremental(new_capacity):
+                new_template = self._create_template(new_capacity)
+                updater = self.update_with_template(new_template, {})
+                updater.run_to_completion()
+                self.check_update_complete(updater)
         finally:
             # Reload the LB in any case, so it's only pointing at healthy
             # nodes.
             self._lb_reload()
 
-    def _lb_reload(self, exclude=[]):
+    def _resize_incremental(self, new_capacity):
+        """
+        Resize the group by creating or deleting only the instances that
+        differ, without updating the rest of the nested stack.
+
+        This is only possible while the nested stack is in a complete state
+        and contains no failed instances, which a full update would remove.
+        Return False if the group must be resized by a full update instead.
+        """
+        nested = self.nested()
+        if nested is None or nested.status != nested.COMPLETE:
+            return False
+
+        instances = self.get_instances()
+        if len(instances) != len(nested):
+            return False
+
+        delta = new_capacity - len(instances)
+        if delta > 0:
+            definition = self._get_instance_definition()
+            self.add_nested_resources(dict((short_id.generate_id(),
+                                            definition)
+                                           for i in range(delta)))
+        elif delta < 0:
+            self.remove_nested_resources([inst.name for inst in
+                                          instances[:-delta]])
+        return True
+
+    def _lb_reload(self, exclude=[], current=None):
         '''
         Notify the LoadBalancer to reload its config to include
         the changes in instances we have just made.
 
         This must be done after activation (instance in ACTIVE state),
         otherwise the instances' IP addresses may not be available.
+
+        Only the members that have changed are added to or removed from
+        each load balancer. If the load balancers are known to hold the list
+        of members given in current, they are only updated if the list has
+        changed. Return the list of members the load balancers now hold.
         '''
         if self.properties['LoadBalancerNames']:
             id_list = [inst.FnGetRefId() for inst in self.get_instances()
                        if inst.FnGetRefId() not in exclude]
+            if id_list == current:
+                return current
             for lb in self.properties['LoadBalancerNames']:
                 lb_resource = self.stack[lb]
-                if 'Instances' in lb_resource.properties_schema:
-                    lb_resource.json_snippet['Properties']['Instances'] = (
-                        id_list)
-                elif 'members' in lb_resource.properties_schema:
-                    lb_resource.json_snippet['Properties']['members'] = (
-                        id_list)
-                else:
+                if not callable(getattr(lb_resource, 'update_members', None)):
                     raise exception.Error(
                         "Unsupported resource '%s' in LoadBalancerNames" %
                         (lb,))
-                resolved_snippet = self.stack.resolve_static_data(
-                    lb_resource.json_snippet)
-                scheduler.TaskRunner(lb_resource.update, resolved_snippet)()
+                _update_lb_members(lb_resource, id_list)
+            return id_list
 
     def FnGetRefId(self):
         return self.physical_resource_name()
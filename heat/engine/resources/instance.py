@@ -298,9 +298,11 @@ class Instance(resource.Resource):
 
         image_name = self.properties['ImageId']
 
-        image_id = nova_utils.get_image_id(self.nova(), image_name)
+        image_id = nova_utils.get_image_id(self.nova(), image_name,
+                                           tenant_id=self.context.tenant_id)
 
-        flavor_id = nova_utils.get_flavor_id(self.nova(), flavor)
+        flavor_id = nova_utils.get_flavor_id(self.nova(), flavor,
+                                             tenant_id=self.context.tenant_id)
 
         scheduler_hints = {}
         if self.properties['NovaSchedulerHints']:
@@ -350,7 +352,7 @@ class Instance(resource.Resource):
 
         if not volume_attach.started():
             if server.status != 'ACTIVE':
-                server.get()
+                nova_utils.refresh_server(server, self.context.tenant_id)
 
             # Some clouds append extra (STATUS) strings to the status
             short_server_status = server.status.split('(')[0]
@@ -403,7 +405,8 @@ class Instance(resource.Resource):
 
         if 'InstanceType' in prop_diff:
             flavor = prop_diff['InstanceType']
-            flavor_id = nova_utils.get_flavor_id(self.nova(), flavor)
+            flavor_id = nova_utils.get_flavor_id(
+                self.nova(), flavor, tenant_id=self.context.tenant_id)
             if not server:
                 server = self.nova().servers.get(self.resource_id)
             checker = scheduler.TaskRunner(nova_utils.resize, server, flavor,
@@ -419,7 +422,10 @@ class Instance(resource.Resource):
         Refresh the metadata if new_metadata is None
         '''
         if new_metadata is None:
-            self.metadata = self.parsed_template('Metadata')
+            self.metadata = self.refreshed_metadata()
+
+    def refreshed_metadata(self):
+        return self.parsed_template('Metadata')
 
     def validate(self):
         '''
@@ -442,7 +448,8 @@ class Instance(resource.Resource):
                 'NetworkInterfaces')
 
         # make sure the image exists.
-        nova_utils.get_image_id(self.nova(), self.properties['ImageId'])
+        nova_utils.get_image_id(self.nova(), self.properties['ImageId'],
+                                tenant_id=self.context.tenant_id)
 
     @scheduler.wrappertask
     def _delete_server(self, server):
@@ -457,7 +464,7 @@ class Instance(resource.Resource):
             yield
 
             try:
-                server.get()
+                nova_utils.refresh_server(server, self.context.tenant_id)
                 if server.status == "DELETED":
                     self.resource_id_set(None)
                     break
@@ -540,7 +547,7 @@ class Instance(resource.Resource):
                 if server.status == 'SUSPENDED':
                     return True
 
-                server.get()
+                nova_utils.refresh_server(server, self.context.tenant_id)
                 logger.debug("%s check_suspend_complete status = %s" %
                              (self.name, server.status))
                 if server.status in list(nova_utils.deferred_server_statuses +
@@ -14,6 +14,8 @@
 #    under the License.
 
 from heat.common import template_format
+from heat.db import api as db_api
+from heat.engine import properties
 from heat.engine import stack_resource
 from heat.engine.resources import nova_utils
 
@@ -351,9 +353,7 @@ class LoadBalancer(stack_resource.StackResource):
 
         servers = []
         n = 1
-        client = self.nova()
-        for i in instances:
-            ip = nova_utils.server_to_ipaddress(client, i) or '0.0.0.0'
+        for ip in self._instance_addresses(instances):
             logger.debug(_('haproxy server:%s') % ip)
             servers.append('%sserver server%d %s:%s %s' % (spaces, n,
                                                            ip, inst_port,
@@ -362,6 +362,72 @@ class LoadBalancer(stack_resource.StackResource):
 
         return '%s%s%s%s\n' % (gl, frontend, backend, '\n'.join(servers))
 
+    def _instance_addresses(self, instances):
+        '''
+        Return the IP addresses of the instances. Addresses are remembered
+        in the resource data, so that only instances new to the load
+        balancer need to be looked up in Nova.
+        '''
+        known = db_api.resource_data_get_all(self) if self.id else {}
+        client = None
+        addresses = []
+        for i in instances:
+            ip = known.get(i)
+            if ip is None:
+                client = client or self.nova()
+                ip = nova_utils.server_to_ipaddress(client, i)
+                if ip is not None and self.id:
+                    db_api.resource_data_set(self, i, ip)
+            addresses.append(ip or '0.0.0.0')
+        return addresses
+
+    def _reconfigure(self, instances):
+        '''
+        Regenerate the HAProxy configuration for the given instances and
+        store it in the metadata of the nested LB instance, from where
+        cfn-hup will pick it up.
+        '''
+        templ = template_format.parse(lb_template)
+        cfg = self._haproxy_config(templ, instances)
+
+        md = self.nested()['LB_instance'].metadata
+        files = md['AWS::CloudFormation::Init']['config']['files']
+        files['/etc/haproxy/haproxy.cfg']['content'] = cfg
+
+        self.nested()['LB_instance'].metadata = md
+
+        if self.id:
+            for i in set(db_api.resource_data_get_all(self)) - set(instances):
+                db_api.resource_data_delete(self, i)
+
+    def update_members(self, instances):
+        '''
+        Balance exactly the given instances, without a full update of the
+        resource. Only instances new to the load balancer are looked up.
+        '''
+        if instances == self.properties['Instances']:
+            return
+        self._reconfigure(instances)
+
+        self.json_snippet.setdefault('Properties', {})['Instances'] = (
+            instances)
+        self.t = self.stack.resolve_static_data(self.json_snippet)
+        self.properties = properties.Properties(self.properties_schema,
+                                                self.t.get('Properties', {}),
+                                                self._resolve_runtime_data,
+                                                self.name)
+
+    def add_members(self, instances):
+        '''Add the given instances to the load balancer.'''
+        current = self.properties['Instances'] or []
+        self.update_members(current + [i for i in instances
+                                       if i not in current])
+
+    def remove_members(self, instances):
+        '''Remove the given instances from the load balancer.'''
+        current = self.properties['Instances'] or []
+        self.update_members([i for i in current if i not in instances])
+
     def handle_create(self):
         templ = template_format.parse(lb_template)
 
@@ -389,14 +455,7 @@ class LoadBalancer(stack_resource.StackResource):
         rely on the cfn-hup to reconfigure HAProxy
         '''
         if 'Instances' in prop_diff:
-            templ = template_format.parse(lb_template)
-            cfg = self._haproxy_config(templ, prop_diff['Instances'])
-
-            md = self.nested()['LB_instance'].metadata
-            files = md['AWS::CloudFormation::Init']['config']['files']
-            files['/etc/haproxy/haproxy.cfg']['content'] = cfg
-
-            self.nested()['LB_instance'].metadata = md
+            self._reconfigure(prop_diff['Instances'] or [])
 
     def handle_delete(self):
         return self.delete_nested()
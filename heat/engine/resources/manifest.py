@@ -0,0 +1,81 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+'''
+The resource types implemented in this package, and the modules (relative to
+this package) implementing them, so that each module need only be imported
+when it is first used.
+
+This file is generated by tools/generate_resource_manifest. Do not edit it.
+'''
+
+RESOURCE_MODULES = {
+    'AWS::AutoScaling::AutoScalingGroup': 'autoscaling',
+    'AWS::AutoScaling::LaunchConfiguration': 'autoscaling',
+    'AWS::AutoScaling::ScalingPolicy': 'autoscaling',
+    'AWS::CloudFormation::Stack': 'stack',
+    'AWS::CloudFormation::WaitCondition': 'wait_condition',
+    'AWS::CloudFormation::WaitConditionHandle': 'wait_condition',
+    'AWS::EC2::EIP': 'eip',
+    'AWS::EC2::EIPAssociation': 'eip',
+    'AWS::EC2::Instance': 'instance',
+    'AWS::EC2::InternetGateway': 'internet_gateway',
+    'AWS::EC2::NetworkInterface': 'network_interface',
+    'AWS::EC2::RouteTable': 'route_table',
+    'AWS::EC2::SecurityGroup': 'security_group',
+    'AWS::EC2::Subnet': 'subnet',
+    'AWS::EC2::SubnetRouteTableAssocation': 'route_table',
+    'AWS::EC2::VPC': 'vpc',
+    'AWS::EC2::VPCGatewayAttachment': 'internet_gateway',
+    'AWS::EC2::Volume': 'volume',
+    'AWS::EC2::VolumeAttachment': 'volume',
+    'AWS::ElasticLoadBalancing::LoadBalancer': 'loadbalancer',
+    'AWS::IAM::AccessKey': 'user',
+    'AWS::IAM::User': 'user',
+    'AWS::S3::Bucket': 's3',
+    'OS::Ceilometer::Alarm': 'ceilometer.alarm',
+    'OS::Cinder::Volume': 'volume',
+    'OS::Cinder::VolumeAttachment': 'volume',
+    'OS::Heat::AccessPolicy': 'user',
+    'OS::Heat::CWLiteAlarm': 'cloud_watch',
+    'OS::Heat::HARestarter': 'instance',
+    'OS::Heat::InstanceGroup': 'autoscaling',
+    'OS::Heat::RandomString': 'random_string',
+    'OS::Heat::ResourceGroup': 'resource_group',
+    'OS::Neutron::Firewall': 'neutron.firewall',
+    'OS::Neutron::FirewallPolicy': 'neutron.firewall',
+    'OS::Neutron::FirewallRule': 'neutron.firewall',
+    'OS::Neutron::FloatingIP': 'neutron.floatingip',
+    'OS::Neutron::FloatingIPAssociation': 'neutron.floatingip',
+    'OS::Neutron::HealthMonitor': 'neutron.loadbalancer',
+    'OS::Neutron::IKEPolicy': 'neutron.vpnservice',
+    'OS::Neutron::IPsecPolicy': 'neutron.vpnservice',
+    'OS::Neutron::IPsecSiteConnection': 'neutron.vpnservice',
+    'OS::Neutron::LoadBalancer': 'neutron.loadbalancer',
+    'OS::Neutron::Net': 'neutron.net',
+    'OS::Neutron::NetDHCPAgent': 'neutron.net',
+    'OS::Neutron::Pool': 'neutron.loadbalancer',
+    'OS::Neutron::PoolMember': 'neutron.loadbalancer',
+    'OS::Neutron::Port': 'neutron.port',
+    'OS::Neutron::Router': 'neutron.router',
+    'OS::Neutron::RouterGateway': 'neutron.router',
+    'OS::Neutron::RouterInterface': 'neutron.router',
+    'OS::Neutron::SecurityGroup': 'neutron.security_group',
+    'OS::Neutron::Subnet': 'neutron.subnet',
+    'OS::Neutron::VPNService': 'neutron.vpnservice',
+    'OS::Nova::KeyPair': 'nova_keypair',
+    'OS::Nova::Server': 'server',
+    'OS::Swift::Container': 'swift',
+    'OS::Trove::Instance': 'os_database',
+}
@@ -415,13 +415,13 @@ class LoadBalancer(resource.Resource):
 
     update_allowed_keys = ('Properties',)
 
-    def handle_create(self):
+    def _create_members(self, members):
         pool = self.properties['pool_id']
         client = self.neutron()
         nova_client = self.nova()
         protocol_port = self.properties['protocol_port']
 
-        for member in self.properties.get('members'):
+        for member in members:
             address = nova_utils.server_to_ipaddress(nova_client, member)
             lb_member = client.create_member({
                 'member': {
@@ -430,31 +430,61 @@ class LoadBalancer(resource.Resource):
                     'protocol_port': protocol_port}})['member']
             db_api.resource_data_set(self, member, lb_member['id'])
 
+    def _delete_members(self, rd_members):
+        client = self.neutron()
+        for member, member_id in rd_members.items():
+            try:
+                client.delete_member(member_id)
+            except NeutronClientException as ex:
+                if ex.status_code != 404:
+                    raise ex
+            db_api.resource_data_delete(self, member)
+
+    def _change_members(self, members):
+        '''
+        Create and delete pool members so that exactly the given servers are
+        load balanced, leaving the members common to both untouched.
+        '''
+        rd_members = db_api.resource_data_get_all(self)
+        removed = dict((m, m_id) for m, m_id in rd_members.items()
+                       if m not in members)
+        if removed:
+            self._delete_members(removed)
+        added = [m for m in members if m not in rd_members]
+        if added:
+            self._create_members(added)
+
+    def handle_create(self):
+        self._create_members(self.properties.get('members'))
+
     def handle_update(self, json_snippet, tmpl_diff, prop_diff):
         if 'members' in prop_diff:
-            members = set(prop_diff['members'])
-            rd_members = db_api.resource_data_get_all(self)
-            old_members = set(rd_members.keys())
-            client = self.neutron()
-            for member in old_members - members:
-                member_id = rd_members[member]
-                try:
-                    client.delete_member(member_id)
-                except NeutronClientException as ex:
-                    if ex.status_code != 404:
-                        raise ex
-                db_api.resource_data_delete(self, member)
-            pool = self.properties['pool_id']
-            nova_client = self.nova()
-            protocol_port = self.properties['protocol_port']
-            for member in members - old_members:
-                address = nova_utils.server_to_ipaddress(nova_client, member)
-                lb_member = client.create_member({
-                    'member': {
-                        'pool_id': pool,
-                        'address': address,
-                        'protocol_port': protocol_port}})['member']
-                db_api.resource_data_set(self, member, lb_member['id'])
+            self._change_members(prop_diff['members'] or [])
+
+    def update_members(self, members):
+        '''
+        Load balance exactly the given servers, without a full update of the
+        resource.
+        '''
+        self._change_members(members)
+
+        self.json_snippet.setdefault('Properties', {})['members'] = members
+        self.t = self.stack.resolve_static_data(self.json_snippet)
+        self.properties = properties.Properties(self.properties_schema,
+                                                self.t.get('Properties', {}),
+                                                self._resolve_runtime_data,
+                                                self.name)
+
+    def add_members(self, members):
+        '''Add the given servers to the pool.'''
+        current = self.properties['members']
+        self.update_members(current + [m for m in members
+                                       if m not in current])
+
+    def remove_members(self, members):
+        '''Remove the given servers from the pool.'''
+        self.update_members([m for m in self.properties['members']
+                             if m not in members])
 
     def handle_delete(self):
         client = self.neutron()
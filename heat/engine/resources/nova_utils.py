@@ -21,8 +21,10 @@ import json
 import os
 import pkgutil
 
+from eventlet import event
 from oslo.config import cfg
 
+from heat.common import cache
 from heat.common import exception
 from heat.engine import clients
 from heat.engine import scheduler
@@ -34,6 +36,10 @@ from heat.openstack.common.py3kcompat import urlutils
 
 logger = logging.getLogger(__name__)
 
+cfg.CONF.import_opt('nova_lookup_cache_size', 'heat.common.config')
+cfg.CONF.import_opt('nova_lookup_cache_ttl', 'heat.common.config')
+cfg.CONF.import_opt('server_status_poll_max_skip', 'heat.common.config')
+
 
 deferred_server_statuses = ['BUILD',
                             'HARD_REBOOT',
@@ -47,15 +53,87 @@ deferred_server_statuses = ['BUILD',
                             'VERIFY_RESIZE']
 
 
-def get_image_id(nova_client, image_identifier):
+_lookup_cache = None
+
+# Callers waiting for a lookup that is already in progress, by cache key
+_pending_lookups = {}
+
+# Lookup failures that are cached like any other result
+_CACHED_ERRORS = (exception.ImageNotFound,
+                  exception.PhysicalResourceNameAmbiguity,
+                  exception.FlavorMissing)
+
+
+def lookup_cache():
+    '''
+    Return the cache of image and flavor lookups, which is shared by all
+    clients in the engine.
+    '''
+    global _lookup_cache
+    if _lookup_cache is None:
+        _lookup_cache = cache.LRUCache(cfg.CONF.nova_lookup_cache_size,
+                                       ttl=cfg.CONF.nova_lookup_cache_ttl)
+    return _lookup_cache
+
+
+def _cached_lookup(tenant_id, kind, name, lookup):
+    '''
+    Return the result of lookup(), caching it for the tenant.
+
+    Failures to find the named item are cached too. If the same lookup is
+    already in progress in another thread, wait for its result rather than
+    making a second API call.
+    '''
+    if tenant_id is None:
+        return lookup()
+
+    key = (tenant_id, kind, name)
+    lookups = lookup_cache()
+    cached = lookups.get(key)
+    if cached is not None:
+        result, error = cached
+        if error is not None:
+            raise error
+        return result
+
+    waiter = _pending_lookups.get(key)
+    if waiter is not None:
+        return waiter.wait()
+
+    waiter = _pending_lookups[key] = event.Event()
+    try:
+        result = lookup()
+    except _CACHED_ERRORS as ex:
+        lookups.set(key, (None, ex))
+        waiter.send_exception(ex)
+        raise
+    except Exception as ex:
+        waiter.send_exception(ex)
+        raise
+    else:
+        lookups.set(key, (result, None))
+        waiter.send(result)
+        return result
+    finally:
+        del _pending_lookups[key]
+
+
+def get_image_id(nova_client, image_identifier, tenant_id=None):
     '''
     Return an id for the specified image name or identifier.
 
     :param nova_client: the nova client to use
     :param image_identifier: image name or a UUID-like identifier
+    :param tenant_id: if specified, cache the result for this tenant
     :returns: the id of the requested :image_identifier:
     :raises: exception.ImageNotFound, exception.PhysicalResourceNameAmbiguity
     '''
+    return _cached_lookup(tenant_id, 'image', image_identifier,
+                          lambda: _get_image_id(nova_client,
+                                                image_identifier))
+
+
+def _get_image_id(nova_client, image_identifier):
     image_id = None
     if uuidutils.is_uuid_like(image_identifier):
         try:
@@ -87,16 +165,22 @@ def get_image_id(nova_client, image_identifier):
     return image_id
 
 
-def get_flavor_id(nova_client, flavor):
+def get_flavor_id(nova_client, flavor, tenant_id=None):
     '''
     Get the id for the specified flavor name.
     If the specified value is flavor id, just return it.
 
     :param nova_client: the nova client to use
     :param flavor: the name of the flavor to find
+    :param tenant_id: if specified, cache the result for this tenant
     :returns: the id of :flavor:
     :raises: exception.FlavorMissing
     '''
+    return _cached_lookup(tenant_id, 'flavor', flavor,
+                          lambda: _get_flavor_id(nova_client, flavor))
+
+
+def _get_flavor_id(nova_client, flavor):
     flavor_id = None
     flavor_list = nova_client.flavors.list()
     for o in flavor_list:
@@ -115,6 +199,9 @@ def get_keypair(nova_client, key_name):
     '''
     Get the public key specified by :key_name:
 
+    Keypairs belong to a user rather than a tenant, so unlike images and
+    flavors they are not cached per tenant.
+
     :param nova_client: the nova client to use
     :param key_name: the name of the key to look for
     :returns: the keypair (name, public_key) for :key_name:
@@ -126,6 +213,113 @@ def get_keypair(nova_client, key_name):
     raise exception.UserKeyPairMissing(key_name=key_name)
 
 
+class ServerStatusPoller(object):
+    '''
+    Refresh the status of many servers from a single server listing.
+
+    Every server that is refreshed is watched until it has not been
+    refreshed for a whole step. A step is deemed to begin whenever a server
+    that has already been refreshed from the current listing is refreshed
+    again. While two or more servers are watched, the first refresh in each
+    step lists all of the tenant's servers once, and the remaining
+    refreshes in that step are served from the listing. Each step that
+    sees no change in the status of any watched server doubles the number
+    of steps before the next listing, up to server_status_poll_max_skip.
+    '''
+
+    def __init__(self):
+        self._watched = {}
+        self._servers = {}
+        self._served = set()
+        self._step = 0
+        self._idle = 0
+        self._skip = 0
+
+    def _prune(self):
+        stale = [server_id for server_id, step in self._watched.items()
+                 if step < self._step - 1]
+        for server_id in stale:
+            del self._watched[server_id]
+            self._servers.pop(server_id, None)
+
+    def _poll(self, manager):
+        try:
+            servers = manager.list(detailed=True)
+        except clients.novaclient.exceptions.ClientException as ex:
+            logger.warn(_('Failed to list servers: %s') % str(ex))
+            self._servers = {}
+            return
+
+        previous = dict((server_id, info.get('status'))
+                        for server_id, info in self._servers.items())
+        self._servers = dict((server.id, server._info) for server in servers
+                             if server.id in self._watched)
+        current = dict((server_id, info.get('status'))
+                       for server_id, info in self._servers.items())
+
+        if current == previous:
+            self._idle += 1
+        else:
+            self._idle = 0
+        self._skip = min(2 ** self._idle - 1,
+                         cfg.CONF.server_status_poll_max_skip)
+
+    def refresh(self, server):
+        '''
+        Update the server with its current details from Nova.
+
+        :raises: novaclient.exceptions.NotFound if the server is gone
+        '''
+        if server.id in self._served:
+            self._served.clear()
+            self._step += 1
+            self._prune()
+        self._watched[server.id] = self._step
+
+        if len(self._watched) < 2:
+            server.get()
+            return
+
+        if not self._served:
+            if self._skip > 0:
+                self._skip -= 1
+            else:
+                self._poll(server.manager)
+        self._served.add(server.id)
+
+        info = self._servers.get(server.id)
+        if info is None:
+            # Not in the listing, so ask for it directly
+            server.get()
+        else:
+            server._add_details(info)
+
+
+# Status pollers by tenant, bounded so that those of tenants no longer
+# refreshing any servers are eventually discarded
+_status_pollers = cache.LRUCache(1000)
+
+
+def refresh_server(server, tenant_id=None):
+    '''
+    Update the server with its current details from Nova.
+
+    :param server: the server to refresh
+    :param tenant_id: if specified, batch the refresh with those of the
+                      tenant's other servers
+    :raises: novaclient.exceptions.NotFound if the server is gone
+    '''
+    if tenant_id is None:
+        server.get()
+        return
+
+    poller = _status_pollers.get(tenant_id)
+    if poller is None:
+        poller = ServerStatusPoller()
+        _status_pollers.set(tenant_id, poller)
+    poller.refresh(server)
+
+
 def build_userdata(resource, userdata=None, instance_user=None,
                    user_data_format='HEAT_CFNTOOLS'):
     '''
@@ -229,9 +229,11 @@ class Server(resource.Resource):
 
         image = self.properties.get('image')
         if image:
-            image = nova_utils.get_image_id(self.nova(), image)
+            image = nova_utils.get_image_id(self.nova(), image,
+                                            tenant_id=self.context.tenant_id)
 
-        flavor_id = nova_utils.get_flavor_id(self.nova(), flavor)
+        flavor_id = nova_utils.get_flavor_id(self.nova(), flavor,
+                                             tenant_id=self.context.tenant_id)
         instance_meta = self.properties.get('metadata')
         scheduler_hints = self.properties.get('scheduler_hints')
         nics = self._build_nics(self.properties.get('networks'))
@@ -272,7 +274,7 @@ class Server(resource.Resource):
     def _check_active(self, server):
 
         if server.status != 'ACTIVE':
-            server.get()
+            nova_utils.refresh_server(server, self.context.tenant_id)
 
         # Some clouds append extra (STATUS) strings to the status
         short_server_status = server.status.split('(')[0]
@@ -373,7 +375,8 @@ class Server(resource.Resource):
                 raise resource.UpdateReplace(self.name)
 
             flavor = prop_diff['flavor']
-            flavor_id = nova_utils.get_flavor_id(self.nova(), flavor)
+            flavor_id = nova_utils.get_flavor_id(
+                self.nova(), flavor, tenant_id=self.context.tenant_id)
             if not server:
                 server = self.nova().servers.get(self.resource_id)
             checker = scheduler.TaskRunner(nova_utils.resize, server, flavor,
@@ -387,7 +390,8 @@ class Server(resource.Resource):
             if image_update_policy == 'REPLACE':
                 raise resource.UpdateReplace(self.name)
             image = prop_diff['image']
-            image_id = nova_utils.get_image_id(self.nova(), image)
+            image_id = nova_utils.get_image_id(
+                self.nova(), image, tenant_id=self.context.tenant_id)
             if not server:
                 server = self.nova().servers.get(self.resource_id)
             checker = scheduler.TaskRunner(nova_utils.rebuild, server,
@@ -415,7 +419,10 @@ class Server(resource.Resource):
         Refresh the metadata if new_metadata is None
         '''
         if new_metadata is None:
-            self.metadata = self.parsed_template('Metadata')
+            self.metadata = self.refreshed_metadata()
+
+    def refreshed_metadata(self):
+        return self.parsed_template('Metadata')
 
     def validate(self):
         '''
@@ -447,7 +454,8 @@ class Server(resource.Resource):
         # make sure the image exists if specified.
         image = self.properties.get('image', None)
         if image:
-            nova_utils.get_image_id(self.nova(), image)
+            nova_utils.get_image_id(self.nova(), image,
+                                    tenant_id=self.context.tenant_id)
         elif not image and not bootable_vol:
             msg = _('Neither image nor bootable volume is specified for'
                     ' instance %s') % self.name
@@ -502,7 +510,7 @@ class Server(resource.Resource):
             if server.status == 'SUSPENDED':
                 return True
 
-            server.get()
+            nova_utils.refresh_server(server, self.context.tenant_id)
             logger.debug(_('%(name)s check_suspend_complete status '
                          '= %(status)s') % {
                          'name': self.name, 'status': server.status})
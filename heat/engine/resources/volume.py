@@ -397,7 +397,8 @@ class CinderVolume(Volume):
         }
         if self.properties.get('image'):
             arguments['imageRef'] = nova_utils.get_image_id(
-                self.nova(), self.properties['image'])
+                self.nova(), self.properties['image'],
+                tenant_id=self.context.tenant_id)
         elif self.properties.get('imageRef'):
             arguments['imageRef'] = self.properties['imageRef']
 
@@ -14,6 +14,9 @@
 #    under the License.
 
 import json
+from time import time as wallclock
+
+from oslo.config import cfg
 
 from heat.common import exception
 from heat.common import identifier
@@ -25,6 +28,45 @@ from heat.openstack.common import log as logging
 
 logger = logging.getLogger(__name__)
 
+cfg.CONF.import_opt('wait_condition_poll_interval', 'heat.common.config')
+
+
+class SignalWatch(object):
+    '''
+    Counts the signals received by the WaitConditionHandles that
+    WaitConditions in this engine are waiting for, indexed by the database ID
+    of each handle. A waiting WaitCondition need only read its handle's
+    metadata when the count changes.
+    '''
+
+    def __init__(self):
+        self._watchers = {}
+        self._signals = {}
+
+    def watch(self, handle_id):
+        '''Start counting the signals to the given handle.'''
+        self._watchers[handle_id] = self._watchers.get(handle_id, 0) + 1
+        self._signals.setdefault(handle_id, 0)
+
+    def unwatch(self, handle_id):
+        '''Stop counting the signals to the given handle.'''
+        self._watchers[handle_id] -= 1
+        if not self._watchers[handle_id]:
+            del self._watchers[handle_id]
+            del self._signals[handle_id]
+
+    def signalled(self, handle_id):
+        '''Record a signal to the given handle, if it is being watched.'''
+        if handle_id in self._signals:
+            self._signals[handle_id] += 1
+
+    def count(self, handle_id):
+        '''Return the number of signals to the given handle so far.'''
+        return self._signals.get(handle_id, 0)
+
+
+signal_watch = SignalWatch()
+
 
 class WaitConditionHandle(signal_responder.SignalResponder):
     '''
@@ -80,6 +122,7 @@ class WaitConditionHandle(signal_responder.SignalResponder):
             # is a Metadata descriptor object which only supports get/set
             rsrc_metadata.update({new_metadata['UniqueId']: safe_metadata})
             self.metadata = rsrc_metadata
+            signal_watch.signalled(self.id)
         else:
             logger.error(_("Metadata failed validation for %s") % self.name)
             raise ValueError(_("Metadata format invalid"))
@@ -181,26 +224,41 @@ class WaitCondition(resource.Resource):
         return handle_id.resource_name
 
     def _wait(self, handle):
-        while True:
-            try:
-                yield
-            except scheduler.Timeout:
-                timeout = WaitConditionTimeout(self, handle)
-                logger.info(_('%(name)s Timed out (%(timeout)s)') % {
-                            'name': str(self), 'timeout': str(timeout)})
-                raise timeout
-
-            handle_status = handle.get_status()
-
-            if any(s != STATUS_SUCCESS for s in handle_status):
-                failure = WaitConditionFailure(self, handle)
-                logger.info(_('%(name)s Failed (%(failure)s)') % {
-                            'name': str(self), 'failure': str(failure)})
-                raise failure
-
-            if len(handle_status) >= self.count:
-                logger.info(_("%s Succeeded") % str(self))
-                return
+        # The handle is checked when this engine is told that it has been
+        # signalled, and also occasionally in case a notification is lost
+        signal_watch.watch(handle.id)
+        try:
+            signals = None
+            next_poll = None
+            while True:
+                try:
+                    yield
+                except scheduler.Timeout:
+                    timeout = WaitConditionTimeout(self, handle)
+                    logger.info(_('%(name)s Timed out (%(timeout)s)') % {
+                                'name': str(self), 'timeout': str(timeout)})
+                    raise timeout
+
+                now = wallclock()
+                if (signals == signal_watch.count(handle.id) and
+                        now < next_poll):
+                    continue
+                signals = signal_watch.count(handle.id)
+                next_poll = now + cfg.CONF.wait_condition_poll_interval
+
+                handle_status = handle.get_status()
+
+                if any(s != STATUS_SUCCESS for s in handle_status):
+                    failure = WaitConditionFailure(self, handle)
+                    logger.info(_('%(name)s Failed (%(failure)s)') % {
+                                'name': str(self), 'failure': str(failure)})
+                    raise failure
+
+                if len(handle_status) >= self.count:
+                    logger.info(_("%s Succeeded") % str(self))
+                    return
+        finally:
+            signal_watch.unwatch(handle.id)
 
     def handle_create(self):
         self._validate_handle_url()
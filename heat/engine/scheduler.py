@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import eventlet
 import functools
 import itertools
@@ -265,6 +266,13 @@ def wrappertask(task):
 class DependencyTaskGroup(object):
     """
     A task which manages a group of subtasks that have ordering dependencies.
+
+    Rather than rescanning the whole dependency graph on every step, the
+    group keeps a count of the outstanding requirements of each subtask and
+    a queue of subtasks that are ready to start. When a subtask completes,
+    the subtasks that require it are started straight away (in the same
+    step) once their last requirement is satisfied, instead of waiting for
+    the next step of the group.
     """
 
     def __init__(self, dependencies, task=lambda o: o(),
@@ -278,7 +286,13 @@ class DependencyTaskGroup(object):
         stored in the dependency tree is passed as an argument.
         """
         self._runners = dict((o, TaskRunner(task, o)) for o in dependencies)
-        self._graph = dependencies.graph(reverse=reverse)
+        graph = dependencies.graph(reverse=reverse)
+
+        self._pending = dict((k, len(n)) for k, n in graph.iteritems())
+        self._required_by = dict((k, list(n.required_by()))
+                                 for k, n in graph.iteritems())
+        self._ready = collections.deque(k for k, n in graph.iteritems()
+                                        if not n)
 
         if name is None:
             name = '(%s) %s' % (getattr(task, '__name__',
@@ -292,39 +306,52 @@ class DependencyTaskGroup(object):
 
     def __call__(self):
         """Return a co-routine which runs the task group."""
+        running = []
+
         try:
-            while any(self._runners.itervalues()):
-                for k, r in self._ready():
-                    r.start()
+            self._start_ready(running)
 
+            while running:
                 yield
 
-                for k, r in self._running():
+                still_running = []
+                for k, r in running:
                     if r.step():
-                        del self._graph[k]
+                        self._complete(k)
+                    else:
+                        still_running.append((k, r))
+                running = still_running
+
+                self._start_ready(running)
         except:
             with excutils.save_and_reraise_exception():
                 for r in self._runners.itervalues():
                     r.cancel()
 
-    def _ready(self):
+    def _start_ready(self, running):
         """
-        Iterate over all subtasks that are ready to start - i.e. all their
-        dependencies have been satisfied but they have not yet been started.
+        Start all subtasks that are ready to run - i.e. all of their
+        dependencies have been satisfied - appending those that do not
+        complete immediately to the running list.
         """
-        for k, n in self._graph.iteritems():
-            if not n:
-                runner = self._runners[k]
-                if not runner.started():
-                    yield k, runner
+        while self._ready:
+            k = self._ready.popleft()
+            runner = self._runners[k]
+            runner.start()
+            if runner.done():
+                self._complete(k)
+            else:
+                running.append((k, runner))
 
-    def _running(self):
+    def _complete(self, key):
         """
-        Iterate over all subtasks that are currently running - i.e. they have
-        been started but have not yet completed.
+        Record the completion of a subtask, queueing any subtasks that were
+        waiting only on it.
         """
-        running = lambda (k, r): k in self._graph and r.started()
-        return itertools.ifilter(running, self._runners.iteritems())
+        for k in self._required_by[key]:
+            self._pending[k] -= 1
+            if not self._pending[k]:
+                self._ready.append(k)
 
 
 class PollingTaskGroup(object):
@@ -16,20 +16,26 @@
 import functools
 import json
 
+import eventlet
 from oslo.config import cfg
 import webob
 
 cfg.CONF.import_opt('max_resources_per_stack', 'heat.common.config')
 cfg.CONF.import_opt('max_stacks_per_tenant', 'heat.common.config')
+cfg.CONF.import_opt('stack_user_access_cache_size', 'heat.common.config')
+cfg.CONF.import_opt('watch_evaluation_batch_size', 'heat.common.config')
+cfg.CONF.import_opt('watch_shard_count', 'heat.common.config')
+cfg.CONF.import_opt('watch_shard_index', 'heat.common.config')
 
 from heat.openstack.common import timeutils
+from heat.common import cache
 from heat.common import context
 from heat.db import api as db_api
 from heat.engine import api
 from heat.rpc import api as rpc_api
+from heat.rpc import client as rpc_client
 from heat.engine import attributes
 from heat.engine import clients
-from heat.engine.event import Event
 from heat.engine import environment
 from heat.common import exception
 from heat.common import identifier
@@ -39,6 +45,8 @@ from heat.engine import parser
 from heat.engine import properties
 from heat.engine import resource
 from heat.engine import resources
+from heat.engine.resources import template_resource
+from heat.engine.resources import wait_condition
 from heat.engine import template as tpl
 from heat.engine import watchrule
 
@@ -75,6 +83,10 @@ class EngineService(service.Service):
         super(EngineService, self).__init__(host, topic)
         # stg == "Stack Thread Groups"
         self.stg = {}
+        self.watch_start_time = None
+        self.engine_rpcapi = rpc_client.EngineClient()
+        self._access_cache = cache.LRUCache(
+            cfg.CONF.stack_user_access_cache_size)
         resources.initialise()
 
     def _start_in_thread(self, stack_id, func, *args, **kwargs):
@@ -82,16 +94,6 @@ class EngineService(service.Service):
             self.stg[stack_id] = threadgroup.ThreadGroup()
         self.stg[stack_id].add_thread(func, *args, **kwargs)
 
-    def _timer_in_thread(self, stack_id, func, *args, **kwargs):
-        """
-        Define a periodic task, to be run in a separate thread, in the stack
-        threadgroups.  Periodicity is cfg.CONF.periodic_interval
-        """
-        if stack_id not in self.stg:
-            self.stg[stack_id] = threadgroup.ThreadGroup()
-        self.stg[stack_id].add_timer(cfg.CONF.periodic_interval,
-                                     func, *args, **kwargs)
-
     def _service_task(self):
         """
         This is a dummy task which gets queued on the service.Service
@@ -100,33 +102,8 @@ class EngineService(service.Service):
         This could also be used to trigger periodic non-stack-specific
         housekeeping tasks
         """
-        pass
-
-    def _start_watch_task(self, stack_id, cnxt):
-
-        def stack_has_a_watchrule(sid):
-            wrs = db_api.watch_rule_get_all_by_stack(cnxt, sid)
-
-            now = timeutils.utcnow()
-            start_watch_thread = False
-            for wr in wrs:
-                # reset the last_evaluated so we don't fire off alarms when
-                # the engine has not been running.
-                db_api.watch_rule_update(cnxt, wr.id, {'last_evaluated': now})
-
-                if wr.state != rpc_api.WATCH_STATE_CEILOMETER_CONTROLLED:
-                    start_watch_thread = True
-
-            children = db_api.stack_get_all_by_owner_id(cnxt, sid)
-            for child in children:
-                if stack_has_a_watchrule(child.id):
-                    start_watch_thread = True
-
-            return start_watch_thread
-
-        if stack_has_a_watchrule(stack_id):
-            self._timer_in_thread(stack_id, self._periodic_watcher_task,
-                                  sid=stack_id)
+        logger.debug(_('Template cache statistics: %s') %
+                     tpl.template_cache().stats())
 
     def start(self):
         super(EngineService, self).start()
@@ -136,11 +113,11 @@ class EngineService(service.Service):
         self.tg.add_timer(cfg.CONF.periodic_interval,
                           self._service_task)
 
-        # Create a periodic_watcher_task per-stack
-        admin_context = context.get_admin_context()
-        stacks = db_api.stack_get_all(admin_context)
-        for s in stacks:
-            self._start_watch_task(s.id, admin_context)
+        # Evaluate the watch rules of all stacks from a single periodic task.
+        # Don't fire off alarms for the time the engine was not running.
+        self.watch_start_time = timeutils.utcnow()
+        self.tg.add_timer(cfg.CONF.periodic_interval,
+                          self._periodic_watcher_task)
 
     @request_context
     def identify_stack(self, cnxt, stack_name):
@@ -204,18 +181,23 @@ class EngineService(service.Service):
 
     @request_context
     def list_stacks(self, cnxt, limit=None, marker=None, sort_keys=None,
-                    sort_dir=None, filters=None):
+                    sort_dir=None, filters=None, show_details=False):
         """
         The list_stacks method returns attributes of all stacks.  It supports
         pagination (``limit`` and ``marker``), sorting (``sort_keys`` and
         ``sort_dir``) and filtering (``filters``) of the results.
 
+        Unless ``show_details`` is set, stacks are summarised from their
+        database records without being loaded, and their parameters and
+        outputs are omitted.
+
         :param cnxt: RPC context
         :param limit: the number of stacks to list (integer or string)
         :param marker: the ID of the last item in the previous page
         :param sort_keys: an array of fields used to sort the list
         :param sort_dir: the direction of the sort ('asc' or 'desc')
         :param filters: a dict with attribute:value to filter the list
+        :param show_details: whether to include parameters and outputs
         :returns: a list of formatted stacks
         """
 
@@ -231,9 +213,16 @@ class EngineService(service.Service):
                 else:
                     yield api.format_stack(stack)
 
+        def format_stack_summaries(stacks):
+            for s in stacks:
+                tmpl = tpl.Template.load(cnxt, s.raw_template_id)
+                yield api.format_stack_summary(s, tmpl)
+
         stacks = db_api.stack_get_all_by_tenant(cnxt, limit, sort_keys, marker,
                                                 sort_dir, filters) or []
-        return list(format_stack_details(stacks))
+        if show_details:
+            return list(format_stack_details(stacks))
+        return list(format_stack_summaries(stacks))
 
     @request_context
     def count_stacks(self, cnxt, filters=None):
@@ -275,12 +264,11 @@ class EngineService(service.Service):
         logger.info(_('template is %s') % template)
 
         def _stack_create(stack):
-            # Create the stack, and create the periodic task if successful
+            # Create the stack; its watch rules are picked up by the
+            # periodic watcher task
             stack.create()
-            if stack.action == stack.CREATE and stack.status == stack.COMPLETE:
-                # Schedule a periodic watcher task for this stack
-                self._start_watch_task(stack.id, cnxt)
-            else:
+            if (stack.action != stack.CREATE or
+                    stack.status != stack.COMPLETE):
                 logger.warning(_("Stack create failed, status %s") %
                                stack.status)
 
@@ -399,7 +387,7 @@ class EngineService(service.Service):
                         'Found a [%s] instead' % type_res}
 
             ResourceClass = resource.get_class(res['Type'])
-            if ResourceClass == resources.template_resource.TemplateResource:
+            if ResourceClass == template_resource.TemplateResource:
                 # we can't validate a TemplateResource unless we instantiate
                 # it as we need to download the template and convert the
                 # paramerters into properties_schema.
@@ -538,38 +526,74 @@ class EngineService(service.Service):
             raise exception.ResourceTypeNotFound(type_name=type_name)
 
     @request_context
-    def list_events(self, cnxt, stack_identity):
+    def list_events(self, cnxt, stack_identity, filters=None, limit=None,
+                    marker=None, sort_keys=None, sort_dir=None):
         """
         The list_events method lists all events associated with a given stack.
+        It supports pagination (``limit`` and ``marker``), sorting
+        (``sort_keys`` and ``sort_dir``) and filtering (``filters``) of the
+        results.
 
         :param cnxt: RPC context.
         :param stack_identity: Name of the stack you want to get events for.
+        :param filters: a dict with attribute:value to filter the list, which
+                        may also give ``since`` and ``until`` times (in ISO
+                        8601 format) to list only the events between them
+        :param limit: the number of events to list (integer or string)
+        :param marker: the ID of the last event in the previous page
+        :param sort_keys: an array of fields used to sort the list
+        :param sort_dir: the direction of the sort ('asc' or 'desc')
         """
+        filters = dict(filters or {})
+        for key in rpc_api.EVENT_FILTER_KEYS:
+            if key in filters:
+                try:
+                    filters[key] = timeutils.normalize_time(
+                        timeutils.parse_isotime(filters[key]))
+                except ValueError as ex:
+                    raise exception.Invalid(reason=str(ex))
 
         if stack_identity is not None:
             st = self._get_stack(cnxt, stack_identity, show_deleted=True)
 
-            events = db_api.event_get_all_by_stack(cnxt, st.id)
+            events = db_api.event_get_all_by_stack(cnxt, st.id, limit, marker,
+                                                   sort_keys, sort_dir,
+                                                   filters)
         else:
-            events = db_api.event_get_all_by_tenant(cnxt)
+            events = db_api.event_get_all_by_tenant(cnxt, limit, marker,
+                                                    sort_keys, sort_dir,
+                                                    filters)
 
-        stacks = {}
+        return [api.format_event_record(e) for e in events]
+
+    @request_context
+    def show_event(self, cnxt, stack_identity, resource_name, event_id):
+        """
+        The show_event method returns a single event of a given resource.
+
+        :param cnxt: RPC context.
+        :param stack_identity: Name of the stack the event belongs to.
+        :param resource_name: Name of the resource the event belongs to.
+        :param event_id: The ID of the event.
+        """
+        st = self._get_stack(cnxt, stack_identity, show_deleted=True)
 
-        def get_stack(stack_id):
-            if stack_id not in stacks:
-                stacks[stack_id] = parser.Stack.load(cnxt, stack_id)
-            return stacks[stack_id]
+        event = db_api.event_get_by_resource(cnxt, st.id, resource_name,
+                                             event_id)
+        if event is None:
+            raise exception.EventNotFound(event_id=event_id,
+                                          resource_name=resource_name)
 
-        return [api.format_event(Event.load(cnxt,
-                                            e.id, e,
-                                            get_stack(e.stack_id)))
-                for e in events]
+        return api.format_event_record(event)
 
-    def _authorize_stack_user(self, cnxt, stack, resource_name):
+    def _authorize_stack_user(self, cnxt, s, resource_name):
         '''
         Filter access to describe_stack_resource for stack in-instance users
         - The user must map to a User resource defined in the requested stack
         - The user resource must validate OK against any Policy specified
+
+        The decision is cached until the stack's database record changes, so
+        that polling in-instance users do not cause the stack to be loaded.
         '''
         # We're expecting EC2 credentials because all in-instance credentials
         # are deployed as ec2 keypairs
@@ -578,39 +602,63 @@ class EngineService(service.Service):
         except (TypeError, AttributeError):
             ec2_creds = None
 
-        if ec2_creds:
-            access_key = ec2_creds.get('access')
-            # Then we look up the AccessKey resource and check the stack
-            try:
-                akey_rsrc = self.find_physical_resource(cnxt, access_key)
-            except exception.PhysicalResourceNotFound:
-                logger.warning(_("access_key % not found!") % access_key)
-                return False
-
-            akey_rsrc_id = identifier.ResourceIdentifier(**akey_rsrc)
-            if stack.identifier() == akey_rsrc_id.stack():
-                # The stack matches, so check if access is allowed to this
-                # resource via the AccessKey resource access_allowed()
-                ak_akey_rsrc = stack[akey_rsrc_id.resource_name]
-                return ak_akey_rsrc.access_allowed(resource_name)
-            else:
-                logger.warning(_("Cannot access resource from wrong stack!"))
-        else:
+        if not ec2_creds:
             logger.warning(_("Cannot access resource, invalid credentials!"))
-
-        return False
+            return False
+
+        access_key = ec2_creds.get('access')
+        cache_key = (s.id, s.raw_template_id, s.updated_at, access_key,
+                     resource_name)
+        allowed = self._access_cache.get(cache_key)
+        if allowed is None:
+            allowed = self._access_allowed(cnxt, s, access_key, resource_name)
+            self._access_cache.set(cache_key, allowed)
+        return allowed
+
+    def _access_allowed(self, cnxt, s, access_key, resource_name):
+        # Look up the AccessKey resource and check the stack
+        akey_rs = db_api.resource_get_by_physical_resource_id(cnxt,
+                                                              access_key)
+        if akey_rs is None:
+            logger.warning(_("access_key %s not found!") % access_key)
+            return False
+
+        if akey_rs.stack_id != s.id:
+            logger.warning(_("Cannot access resource from wrong stack!"))
+            return False
+
+        # The stack matches, so check if access is allowed to this
+        # resource via the AccessKey resource access_allowed()
+        stack = parser.Stack.load(cnxt, stack=s)
+        return stack[akey_rs.name].access_allowed(resource_name)
 
     @request_context
-    def describe_stack_resource(self, cnxt, stack_identity, resource_name):
+    def describe_stack_resource(self, cnxt, stack_identity, resource_name,
+                                with_dependencies=True):
+        """
+        Return the details of a resource in a stack.
+
+        :param cnxt: RPC context.
+        :param stack_identity: Name of the stack containing the resource.
+        :param resource_name: Name of the resource.
+        :param with_dependencies: if False, the resources that depend on the
+            resource are not listed, and the details are read from the
+            database without loading the stack
+        """
         s = self._get_stack(cnxt, stack_identity)
-        stack = parser.Stack.load(cnxt, stack=s)
 
         if cfg.CONF.heat_stack_user_role in cnxt.roles:
-            if not self._authorize_stack_user(cnxt, stack, resource_name):
+            if not self._authorize_stack_user(cnxt, s, resource_name):
                 logger.warning(_("Access denied to resource %s")
                                % resource_name)
                 raise exception.Forbidden()
 
+        if not with_dependencies:
+            return self._describe_stack_resource_record(cnxt, s,
+                                                        resource_name)
+
+        stack = parser.Stack.load(cnxt, stack=s)
+
         if resource_name not in stack:
             raise exception.ResourceNotFound(resource_name=resource_name,
                                              stack_name=stack.name)
@@ -621,6 +669,18 @@ class EngineService(service.Service):
 
         return api.format_stack_resource(stack[resource_name])
 
+    def _describe_stack_resource_record(self, cnxt, s, resource_name):
+        tmpl = tpl.Template.load(cnxt, s.raw_template_id)
+        if resource_name not in tmpl[tpl.RESOURCES]:
+            raise exception.ResourceNotFound(resource_name=resource_name,
+                                             stack_name=s.name)
+
+        rs = db_api.resource_get_by_name_and_stack(cnxt, resource_name, s.id)
+        if rs is None:
+            raise exception.ResourceNotAvailable(resource_name=resource_name)
+
+        return api.format_resource_record(rs, s, tmpl)
+
     @request_context
     def resource_signal(self, cnxt, stack_identity, resource_name, details):
         s = self._get_stack(cnxt, stack_identity)
@@ -727,55 +787,78 @@ class EngineService(service.Service):
         """
         s = self._get_stack(cnxt, stack_identity)
 
-        stack = parser.Stack.load(cnxt, stack=s)
+        # This is not "nice" converting to the stored context here,
+        # but this happens because the keystone user associated with the
+        # WaitCondition doesn't have permission to read the secret key of
+        # the user associated with the cfn-credentials file
+        stack_context = self._load_user_creds(s.user_creds_id)
+        stack = parser.Stack.load(stack_context, stack=s)
         if resource_name not in stack:
             raise exception.ResourceNotFound(resource_name=resource_name,
                                              stack_name=stack.name)
 
         resource = stack[resource_name]
         resource.metadata_update(new_metadata=metadata)
-
-        # This is not "nice" converting to the stored context here,
-        # but this happens because the keystone user associated with the
-        # WaitCondition doesn't have permission to read the secret key of
-        # the user associated with the cfn-credentials file
-        stack_context = self._load_user_creds(s.user_creds_id)
-        refresh_stack = parser.Stack.load(stack_context, stack=s)
-
-        # Refresh the metadata for all other resources, since we expect
-        # resource_name to be a WaitCondition resource, and other
-        # resources may refer to WaitCondition Fn::GetAtt Data, which
-        # is updated here.
-        for res in refresh_stack.dependencies:
-            if res.name != resource_name and res.id is not None:
-                res.metadata_update()
+        # Wake anything waiting for the update, in whichever engine it is.
+        # Waiters also check periodically, so this need not succeed.
+        try:
+            self.engine_rpcapi.metadata_updated(cnxt, resource.id)
+        except Exception as ex:
+            logger.warning(_("Failed to notify engines of metadata update "
+                             "for %(res)s: %(err)s") % {'res': resource_name,
+                                                        'err': str(ex)})
+
+        # Refresh the metadata of the other resources that refer to this
+        # one, since we expect resource_name to be a WaitConditionHandle, and
+        # other resources may refer to the Fn::GetAtt Data of its
+        # WaitCondition, which is updated here.
+        refreshed = {}
+        for res in stack.metadata_referrers(resource_name):
+            if res.id is not None:
+                res_metadata = res.refreshed_metadata()
+                if res_metadata is not None:
+                    refreshed[res.id] = res_metadata
+        if refreshed:
+            db_api.resource_metadata_set_batch(stack_context, refreshed)
+            stack.reset_resolved_data()
 
         return resource.metadata
 
-    def _check_stack_watches(self, sid):
-        # Retrieve the stored credentials & create context
-        # Require tenant_safe=False to the stack_get to defeat tenant
-        # scoping otherwise we fail to retrieve the stack
-        logger.debug(_("Periodic watcher task for stack %s") % sid)
-        admin_context = context.get_admin_context()
-        stack = db_api.stack_get(admin_context, sid, tenant_safe=False)
-        if not stack:
-            logger.error(_("Unable to retrieve stack %s for periodic task") %
-                         sid)
-            return
-        stack_context = self._load_user_creds(stack.user_creds_id)
-
-        # recurse into any nested stacks.
-        children = db_api.stack_get_all_by_owner_id(admin_context, sid)
-        for child in children:
-            self._check_stack_watches(child.id)
+    def metadata_updated(self, cnxt, resource_id):
+        """
+        Handle the notification that the metadata for a resource was updated
+        by another engine, or by this one.
+        """
+        wait_condition.signal_watch.signalled(resource_id)
 
-        # Get all watchrules for this stack and evaluate them
-        try:
-            wrs = db_api.watch_rule_get_all_by_stack(stack_context, sid)
-        except Exception as ex:
-            logger.warn(_('periodic_task db error (%(msg)s) %(ex)s') % {
-                        'msg': 'watch rule removed?', 'ex': str(ex)})
+    def _load_watch_stack(self, sid, stacks):
+        """
+        Return the stored stack with the given ID, and a context created from
+        its stored credentials. Results are memoised in the stacks dict.
+        """
+        if sid not in stacks:
+            stacks[sid] = None, None
+            try:
+                # Require tenant_safe=False to the stack_get to defeat tenant
+                # scoping otherwise we fail to retrieve the stack
+                admin_context = context.get_admin_context()
+                stack = db_api.stack_get(admin_context, sid,
+                                         tenant_safe=False)
+                if stack is None:
+                    logger.error(_("Unable to retrieve stack %s for "
+                                   "periodic task") % sid)
+                else:
+                    stacks[sid] = stack, self._load_user_creds(
+                        stack.user_creds_id)
+            except Exception as ex:
+                logger.warn(_('periodic_task unable to load stack '
+                              '%(stack)s: %(err)s') % {'stack': sid,
+                                                       'err': str(ex)})
+        return stacks[sid]
+
+    def _check_watch_rule(self, wr, stacks):
+        stack, stack_context = self._load_watch_stack(wr.stack_id, stacks)
+        if stack is None:
             return
 
         def run_alarm_action(actions, details):
@@ -786,20 +869,48 @@ class EngineService(service.Service):
             for res in stk.itervalues():
                 res.metadata_update()
 
-        for wr in wrs:
-            rule = watchrule.WatchRule.load(stack_context, watch=wr)
-            actions = rule.evaluate()
-            if actions:
-                self._start_in_thread(sid, run_alarm_action, actions,
-                                      rule.get_details())
+        rule = watchrule.WatchRule.load(stack_context, watch=wr)
+        if (self.watch_start_time is not None and
+                rule.last_evaluated < self.watch_start_time):
+            rule.last_evaluated = self.watch_start_time
+        actions = rule.evaluate()
+        if actions:
+            self._start_in_thread(stack.id, run_alarm_action, actions,
+                                  rule.get_details())
 
-    def _periodic_watcher_task(self, sid):
+    def _periodic_watcher_task(self):
         """
-        Periodic task, created for each stack, triggers watch-rule
-        evaluation for all rules defined for the stack
-        sid = stack ID
+        Periodic task, run once per engine, which triggers evaluation of the
+        watch rules in this engine's shard, least recently evaluated first
         """
-        self._check_stack_watches(sid)
+        logger.debug(_("Periodic watcher task"))
+        admin_context = context.get_admin_context()
+        try:
+            wrs = db_api.watch_rule_get_all_for_evaluation(
+                admin_context,
+                shard_count=cfg.CONF.watch_shard_count,
+                shard_index=cfg.CONF.watch_shard_index,
+                exclude_states=(rpc_api.WATCH_STATE_SUSPENDED,
+                                rpc_api.WATCH_STATE_CEILOMETER_CONTROLLED))
+        except Exception as ex:
+            logger.warn(_('periodic_task db error %s') % str(ex))
+            return
+
+        stacks = {}
+        batch_size = max(cfg.CONF.watch_evaluation_batch_size, 1)
+        for start in range(0, len(wrs), batch_size):
+            for wr in wrs[start:start + batch_size]:
+                # A failure must not stop the evaluation of the other rules
+                try:
+                    self._check_watch_rule(wr, stacks)
+                except Exception as ex:
+                    logger.warn(_('periodic_task failed to evaluate watch '
+                                  'rule %(name)s for stack %(stack)s: '
+                                  '%(err)s') % {'name': wr.name,
+                                                'stack': wr.stack_id,
+                                                'err': str(ex)})
+            # Let other threads run between batches
+            eventlet.sleep(0)
 
     @request_context
     def create_watch_data(self, cnxt, watch_name, stats_data):
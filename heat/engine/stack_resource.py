@@ -23,11 +23,14 @@ from heat.engine import resource
 from heat.engine import scheduler
 from heat.engine import template as tmpl
 
+from heat.openstack.common import excutils
 from heat.openstack.common import log as logging
 from heat.openstack.common.gettextutils import _
 
 logger = logging.getLogger(__name__)
 
+cfg.CONF.import_opt('max_concurrent_nested_deletes', 'heat.common.config')
+
 
 class StackResource(resource.Resource):
     '''
@@ -175,6 +178,108 @@ class StackResource(resource.Resource):
                                   nested_stack.status_reason)
         return True
 
+    def add_nested_resources(self, definitions):
+        '''
+        Create new resources in the nested stack, leaving the existing
+        resources untouched. This avoids comparing every resource in the
+        nested stack, as update_with_template() must.
+
+        :param definitions: template snippets indexed by resource name
+        '''
+        nested_stack = self._nested_for_update()
+        new_size = (nested_stack.root_stack.total_resources() +
+                    len(definitions))
+        if new_size > cfg.CONF.max_resources_per_stack:
+            raise exception.RequestLimitExceeded(
+                message=exception.StackResourceLimitExceeded.msg_fmt)
+
+        # Validate only the new resources, not the whole nested stack
+        parser.Stack(self.context,
+                     self.physical_resource_name(),
+                     parser.Template({tmpl.RESOURCES: definitions}),
+                     nested_stack.env,
+                     disable_rollback=True,
+                     parent_resource=self,
+                     owner_id=self.stack.id).validate()
+
+        new_resources = []
+        for name, snippet in definitions.items():
+            res = resource.Resource(name, snippet, nested_stack)
+            nested_stack[name] = res
+            new_resources.append(res)
+
+        task = scheduler.PollingTaskGroup(r.create for r in new_resources)
+        self._run_nested_change(task, definitions)
+
+    def remove_nested_resources(self, names):
+        '''
+        Delete the named resources from the nested stack, leaving the
+        remaining resources untouched.
+
+        :param names: the names of the resources to delete
+        '''
+        nested_stack = self._nested_for_update()
+
+        @scheduler.wrappertask
+        def remove(res):
+            yield res.destroy()
+            del nested_stack[res.name]
+
+        task = scheduler.PollingTaskGroup.from_task_with_args(
+            remove, [nested_stack[name] for name in names])
+        self._run_nested_change(task, {})
+
+    def _nested_for_update(self):
+        nested_stack = self.nested()
+        if nested_stack is None:
+            raise exception.Error(_('Cannot update %s, stack not created')
+                                  % self.name)
+        return nested_stack
+
+    def _run_nested_change(self, task, definitions):
+        '''
+        Run a task that adds or removes resources in the nested stack, then
+        store the nested stack with a template that matches its resources.
+        The nested stack's template must be in CloudFormation format.
+        '''
+        nested_stack = self.nested()
+        snippets = dict(nested_stack.t[tmpl.RESOURCES])
+        snippets.update(definitions)
+
+        nested_stack.state_set(nested_stack.UPDATE, nested_stack.IN_PROGRESS,
+                               'Stack UPDATE started')
+        status = nested_stack.FAILED
+        try:
+            scheduler.TaskRunner(task)(timeout=nested_stack.timeout_secs())
+        except scheduler.Timeout:
+            reason = 'Timed out'
+        except exception.ResourceFailure as ex:
+            reason = str(ex)
+        except Exception as ex:
+            # Don't leave the nested stack in progress
+            with excutils.save_and_reraise_exception():
+                logger.exception(_('Nested stack update failed'))
+                nested_stack.state_set(nested_stack.UPDATE,
+                                       nested_stack.FAILED, str(ex))
+        else:
+            status = nested_stack.COMPLETE
+            reason = 'Stack successfully updated'
+        finally:
+            # Record every resource that still exists, even if it failed,
+            # so that it is removed when the nested stack is deleted
+            template = dict(nested_stack.t.t)
+            template[tmpl.RESOURCES] = dict((name, snippets[name])
+                                            for name in nested_stack)
+            nested_stack.t = parser.Template(template,
+                                             files=nested_stack.t.files)
+            nested_stack.reset_dependencies()
+            nested_stack.store()
+
+        nested_stack.state_set(nested_stack.UPDATE, status, reason)
+        if status != nested_stack.COMPLETE:
+            raise exception.Error(_("Nested stack update failed: %s") %
+                                  reason)
+
     def delete_nested(self):
         '''
         Delete the nested stack.
@@ -185,16 +290,36 @@ class StackResource(resource.Resource):
             logger.info(_("Stack not found to delete"))
         else:
             if stack is not None:
-                delete_task = scheduler.TaskRunner(stack.delete)
-                delete_task.start()
-                return delete_task
+                return scheduler.TaskRunner(stack.delete_task)
 
     def check_delete_complete(self, delete_task):
+        '''
+        Start deleting the nested stack once fewer than
+        max_concurrent_nested_deletes nested stacks of the parent stack are
+        being deleted, and step the deletion until it is complete.
+        '''
         if delete_task is None:
             return True
 
-        done = delete_task.step()
+        if not delete_task.started():
+            limit = cfg.CONF.max_concurrent_nested_deletes
+            if limit and self.stack.nested_deletes >= limit:
+                return False
+            self.stack.nested_deletes += 1
+            try:
+                delete_task.start()
+            except Exception:
+                self.stack.nested_deletes -= 1
+                raise
+
+        try:
+            done = delete_task.step()
+        except Exception:
+            self.stack.nested_deletes -= 1
+            raise
+
         if done:
+            self.stack.nested_deletes -= 1
             nested_stack = self.nested()
             if nested_stack.state != (nested_stack.DELETE,
                                       nested_stack.COMPLETE):
@@ -16,20 +16,53 @@
 import collections
 import json
 
+from oslo.config import cfg
+
 from heat.api.aws import utils as aws_utils
 from heat.db import api as db_api
+from heat.common import cache
 from heat.common import exception
 from heat.engine.parameters import ParamSchema
 
+cfg.CONF.import_opt('template_cache_size', 'heat.common.config')
+cfg.CONF.import_opt('template_cache_max_bytes', 'heat.common.config')
+
 SECTIONS = (VERSION, DESCRIPTION, MAPPINGS,
             PARAMETERS, RESOURCES, OUTPUTS) = \
            ('AWSTemplateFormatVersion', 'Description', 'Mappings',
             'Parameters', 'Resources', 'Outputs')
 
+_template_cache = None
+
+
+def template_cache():
+    '''
+    Return the engine-wide cache of stored templates, indexed by template ID.
+
+    Stored templates are never modified, but they are deleted when their
+    stacks are purged, and the ID of a deleted template may be reused. So
+    each entry holds the creation time of the template along with the JSON
+    serialisation of it, and is only used while the stored template with
+    that ID has the same creation time. The serialisation is cached, rather
+    than the data, so that every Template loaded from the cache gets its
+    own copy of the data.
+    '''
+    global _template_cache
+    if _template_cache is None:
+        _template_cache = cache.LRUCache(cfg.CONF.template_cache_size,
+                                         cfg.CONF.template_cache_max_bytes,
+                                         sizeof=lambda entry: len(entry[1]))
+    return _template_cache
+
 
 class Template(collections.Mapping):
     '''A stack template.'''
 
+    # Intrinsic functions that are resolved by resolve_runtime_data()
+    RUNTIME_FUNCTIONS = ('Ref', 'Fn::GetAtt', 'Fn::Split',
+                         'Fn::MemberListToMap', 'Fn::Select', 'Fn::Join',
+                         'Fn::Replace', 'Fn::Base64')
+
     def __new__(cls, template, *args, **kwargs):
         '''Create a new Template of the appropriate class.'''
 
@@ -54,7 +87,16 @@ class Template(collections.Mapping):
     @classmethod
     def load(cls, context, template_id):
         '''Retrieve a Template with the given ID from the database.'''
+        cached = template_cache().get(template_id)
+        if cached is not None:
+            created_at, serialised = cached
+            if (db_api.raw_template_created_at(context, template_id) ==
+                    created_at):
+                return cls(json.loads(serialised), template_id)
+
         t = db_api.raw_template_get(context, template_id)
+        template_cache().set(template_id,
+                             (t.created_at, json.dumps(t.template)))
         return cls(t.template, template_id)
 
     def store(self, context=None):
@@ -26,6 +26,41 @@ from heat.rpc import api as rpc_api
 
 logger = logging.getLogger(__name__)
 
+# Lengths in seconds of the buckets that watch data is rolled up into,
+# longest first
+ROLLUP_PERIODS = (3600, 60)
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _bucket_start(when, period, round_up=False):
+    '''
+    Return the start of the rollup bucket of the given length containing a
+    time, or of the first bucket starting at or after it if round_up is set.
+    '''
+    delta = when - _EPOCH
+    seconds = delta.days * 86400 + delta.seconds
+    start = seconds - seconds % period
+    if round_up and (start < seconds or delta.microseconds):
+        start += period
+    return _EPOCH + datetime.timedelta(seconds=start)
+
+
+def _sample_stats(values):
+    '''Return the count, sum, minimum and maximum of a list of values.'''
+    if not values:
+        return 0, 0, None, None
+    return len(values), sum(values), min(values), max(values)
+
+
+def _combine_stats(stats):
+    '''Combine a list of (count, sum, minimum, maximum) statistics.'''
+    stats = [s for s in stats if s[0]]
+    if not stats:
+        return 0, 0, None, None
+    return (sum(s[0] for s in stats), sum(s[1] for s in stats),
+            min(s[2] for s in stats), max(s[3] for s in stats))
+
 
 class WatchRule(object):
     WATCH_STATES = (
@@ -49,7 +84,7 @@ class WatchRule(object):
     updated_at = timestamp.Timestamp(db_api.watch_rule_get, 'updated_at')
 
     def __init__(self, context, watch_name, rule, stack_id=None,
-                 state=NODATA, wid=None, watch_data=[],
+                 state=NODATA, wid=None, watch_data=None,
                  last_evaluated=timeutils.utcnow()):
         self.context = context
         self.now = timeutils.utcnow()
@@ -88,7 +123,6 @@ class WatchRule(object):
                        stack_id=watch.stack_id,
                        state=watch.state,
                        wid=watch.id,
-                       watch_data=watch.watch_data,
                        last_evaluated=watch.last_evaluated)
 
     def store(self):
@@ -130,96 +164,89 @@ class WatchRule(object):
         else:
             return False
 
-    def do_Maximum(self):
-        data = 0
-        have_data = False
-        for d in self.watch_data:
-            if d.created_at < self.now - self.timeperiod:
-                continue
-            if not have_data:
-                data = float(d.data[self.rule['MetricName']]['Value'])
-                have_data = True
-            if float(d.data[self.rule['MetricName']]['Value']) > data:
-                data = float(d.data[self.rule['MetricName']]['Value'])
+    def _sample_values(self, watch_data):
+        metric = self.rule['MetricName']
+        return [float(d.data[metric]['Value']) for d in watch_data]
 
-        if not have_data:
-            return self.NODATA
+    def _stored_stats(self, since):
+        '''
+        Return the statistics of the stored samples since the given time.
+        Whole rollup buckets within the period are used where possible, and
+        only the samples at the edges of the period are read individually.
+        '''
+        stats = []
+        segments = [(since, None)]
+        for period in ROLLUP_PERIODS:
+            remaining = []
+            for start, end in segments:
+                first = _bucket_start(start, period, round_up=True)
+                last = _bucket_start(end or self.now, period)
+                if first >= last:
+                    remaining.append((start, end))
+                    continue
+                rollups = db_api.watch_data_rollup_get_all(
+                    self.context, self.id, period, first, last)
+                stats.extend((r.sample_count, r.sample_sum,
+                              r.sample_min, r.sample_max) for r in rollups)
+                if start < first:
+                    remaining.append((start, first))
+                remaining.append((last, end))
+            segments = remaining
+
+        for start, end in segments:
+            watch_data = db_api.watch_data_get_all_by_watch_rule_id(
+                self.context, self.id, start, end)
+            stats.append(_sample_stats(self._sample_values(watch_data)))
+        return _combine_stats(stats)
+
+    def _period_stats(self):
+        '''
+        Return the sample count, sum, minimum and maximum of the metric
+        values within the evaluation period.
+        '''
+        since = self.now - self.timeperiod
+        if self.watch_data is not None:
+            return _sample_stats(self._sample_values(
+                d for d in self.watch_data if d.created_at >= since))
+        if not self.id:
+            return _sample_stats([])
+        return self._stored_stats(since)
 
+    def _compare(self, data):
         if self.do_data_cmp(data,
                             float(self.rule['Threshold'])):
             return self.ALARM
         else:
             return self.NORMAL
 
-    def do_Minimum(self):
-        data = 0
-        have_data = False
-        for d in self.watch_data:
-            if d.created_at < self.now - self.timeperiod:
-                continue
-            if not have_data:
-                data = float(d.data[self.rule['MetricName']]['Value'])
-                have_data = True
-            elif float(d.data[self.rule['MetricName']]['Value']) < data:
-                data = float(d.data[self.rule['MetricName']]['Value'])
-
-        if not have_data:
+    def do_Maximum(self):
+        count, total, minimum, maximum = self._period_stats()
+        if not count:
             return self.NODATA
+        return self._compare(maximum)
 
-        if self.do_data_cmp(data,
-                            float(self.rule['Threshold'])):
-            return self.ALARM
-        else:
-            return self.NORMAL
+    def do_Minimum(self):
+        count, total, minimum, maximum = self._period_stats()
+        if not count:
+            return self.NODATA
+        return self._compare(minimum)
 
     def do_SampleCount(self):
         '''
         count all samples within the specified period
         '''
-        data = 0
-        for d in self.watch_data:
-            if d.created_at < self.now - self.timeperiod:
-                continue
-            data = data + 1
-
-        if self.do_data_cmp(data,
-                            float(self.rule['Threshold'])):
-            return self.ALARM
-        else:
-            return self.NORMAL
+        count, total, minimum, maximum = self._period_stats()
+        return self._compare(count)
 
     def do_Average(self):
-        data = 0
-        samples = 0
-        for d in self.watch_data:
-            if d.created_at < self.now - self.timeperiod:
-                continue
-            samples = samples + 1
-            data = data + float(d.data[self.rule['MetricName']]['Value'])
-
-        if samples == 0:
+        count, total, minimum, maximum = self._period_stats()
+        if not count:
             return self.NODATA
-
-        data = data / samples
-        if self.do_data_cmp(data,
-                            float(self.rule['Threshold'])):
-            return self.ALARM
-        else:
-            return self.NORMAL
+        return self._compare(total / count)
 
     def do_Sum(self):
-        data = 0
-        for d in self.watch_data:
-            if d.created_at < self.now - self.timeperiod:
-                logger.debug(_('ignoring %s') % str(d.data))
-                continue
-            data = data + float(d.data[self.rule['MetricName']]['Value'])
-
-        if self.do_data_cmp(data,
-                            float(self.rule['Threshold'])):
-            return self.ALARM
-        else:
-            return self.NORMAL
+        count, total, minimum, maximum = self._period_stats()
+        return self._compare(total)
 
     def get_alarm_state(self):
         fn = getattr(self, 'do_%s' % self.rule['Statistic'])
@@ -319,6 +346,17 @@ class WatchRule(object):
         logger.debug(_('new watch:%(name)s data:%(data)s')
                      % {'name': self.name, 'data': str(wd.data)})
 
+        try:
+            value = float(data[self.rule['MetricName']]['Value'])
+        except (KeyError, TypeError, ValueError):
+            logger.warning(_('Invalid metric value for watch %(name)s: '
+                             '%(data)s') % {'name': self.name, 'data': data})
+            return
+        for period in ROLLUP_PERIODS:
+            db_api.watch_data_rollup_add(None, self.id, period,
+                                         _bucket_start(wd.created_at, period),
+                                         value)
+
     def state_set(self, state):
         '''
         Persistently store the watch state
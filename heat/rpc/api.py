@@ -82,6 +82,13 @@ EVENT_KEYS = (
     'resource_properties',
 )
 
+# Filters on listed events other than the event attributes themselves
+EVENT_FILTER_KEYS = (
+    EVENT_FILTER_SINCE, EVENT_FILTER_UNTIL,
+) = (
+    'since', 'until',
+)
+
 NOTIFY_KEYS = (
     NOTIFY_TENANT_ID,
     NOTIFY_USER_ID,
@@ -51,7 +51,7 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
                                              stack_name=stack_name))
 
     def list_stacks(self, ctxt, limit=None, marker=None, sort_keys=None,
-                    sort_dir=None, filters=None):
+                    sort_dir=None, filters=None, show_details=False):
         """
         The list_stacks method returns attributes of all stacks.  It supports
         pagination (``limit`` and ``marker``), sorting (``sort_keys`` and
@@ -63,11 +63,13 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
         :param sort_keys: an array of fields used to sort the list
         :param sort_dir: the direction of the sort ('asc' or 'desc')
         :param filters: a dict with attribute:value to filter the list
+        :param show_details: whether to include parameters and outputs
         :returns: a list of stacks
         """
         return self.call(ctxt, self.make_msg('list_stacks', limit=limit,
                          sort_keys=sort_keys, marker=marker,
-                         sort_dir=sort_dir, filters=filters))
+                         sort_dir=sort_dir, filters=filters,
+                         show_details=show_details))
 
     def count_stacks(self, ctxt, filters=None):
         """
@@ -212,26 +214,60 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
         return self.call(ctxt, self.make_msg('generate_template',
                                              type_name=type_name))
 
-    def list_events(self, ctxt, stack_identity):
+    def list_events(self, ctxt, stack_identity, filters=None, limit=None,
+                    marker=None, sort_keys=None, sort_dir=None):
         """
         The list_events method lists all events associated with a given stack.
+        It supports pagination (``limit`` and ``marker``), sorting
+        (``sort_keys`` and ``sort_dir``) and filtering (``filters``) of the
+        results.
 
         :param ctxt: RPC context.
         :param stack_identity: Name of the stack you want to get events for.
+        :param filters: a dict with attribute:value to filter the list, which
+                        may also give ``since`` and ``until`` times (in ISO
+                        8601 format) to list only the events between them
+        :param limit: the number of events to list (integer or string)
+        :param marker: the ID of the last event in the previous page
+        :param sort_keys: an array of fields used to sort the list
+        :param sort_dir: the direction of the sort ('asc' or 'desc')
         """
         return self.call(ctxt, self.make_msg('list_events',
-                                             stack_identity=stack_identity))
+                                             stack_identity=stack_identity,
+                                             filters=filters, limit=limit,
+                                             marker=marker,
+                                             sort_keys=sort_keys,
+                                             sort_dir=sort_dir))
 
-    def describe_stack_resource(self, ctxt, stack_identity, resource_name):
+    def show_event(self, ctxt, stack_identity, resource_name, event_id):
+        """
+        The show_event method returns a single event of a given resource.
+
+        :param ctxt: RPC context.
+        :param stack_identity: Name of the stack the event belongs to.
+        :param resource_name: Name of the resource the event belongs to.
+        :param event_id: The ID of the event.
+        """
+        return self.call(ctxt, self.make_msg('show_event',
+                                             stack_identity=stack_identity,
+                                             resource_name=resource_name,
+                                             event_id=event_id))
+
+    def describe_stack_resource(self, ctxt, stack_identity, resource_name,
+                                with_dependencies=True):
         """
         Get detailed resource information about a particular resource.
         :param ctxt: RPC context.
         :param stack_identity: Name of the stack.
         :param resource_name: the Resource.
+        :param with_dependencies: if False, omit the resources that depend on
+            the Resource, so that the stack need not be loaded.
         """
-        return self.call(ctxt, self.make_msg('describe_stack_resource',
-                                             stack_identity=stack_identity,
-                                             resource_name=resource_name))
+        return self.call(ctxt, self.make_msg(
+            'describe_stack_resource',
+            stack_identity=stack_identity,
+            resource_name=resource_name,
+            with_dependencies=with_dependencies))
 
     def find_physical_resource(self, ctxt, physical_resource_id):
         """
@@ -282,6 +318,15 @@ class EngineClient(heat.openstack.common.rpc.proxy.RpcProxy):
                                              resource_name=resource_name,
                                              metadata=metadata))
 
+    def metadata_updated(self, ctxt, resource_id):
+        """
+        Notify every engine that the metadata for a resource was updated.
+        :param ctxt: RPC context.
+        :param resource_id: the database ID of the resource.
+        """
+        return self.fanout_cast(ctxt, self.make_msg('metadata_updated',
+                                                    resource_id=resource_id))
+
     def resource_signal(self, ctxt, stack_identity, resource_name, details):
         """
         Generate an alarm on the resource.
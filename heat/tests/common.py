@@ -23,9 +23,12 @@ import testtools
 
 from oslo.config import cfg
 
+from heat.engine import clients
 from heat.engine import environment
 from heat.engine import resources
+from heat.engine.resources import nova_utils
 from heat.engine import scheduler
+from heat.engine import template
 
 
 class HeatTestCase(testtools.TestCase):
@@ -38,6 +41,13 @@ class HeatTestCase(testtools.TestCase):
         self.addCleanup(self.m.UnsetStubs)
         self.useFixture(fixtures.FakeLogger(level=logging.DEBUG))
         scheduler.ENABLE_SLEEP = False
+        # Template IDs are reused when the test database is reset
+        template.template_cache().clear()
+        # Tests share tenants but not fake images, flavors and keypairs
+        nova_utils.lookup_cache().clear()
+        nova_utils._status_pollers.clear()
+        # Clients are pooled by token, which tests share
+        clients.client_pool().clear()
         self.useFixture(fixtures.MonkeyPatch(
             'heat.common.exception._FATAL_EXCEPTION_FORMAT_ERRORS',
             True))
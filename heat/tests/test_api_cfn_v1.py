@@ -17,6 +17,7 @@ import mock
 import os
 
 from oslo.config import cfg
+import webob
 
 from heat.common import exception as heat_exception
 from heat.common import identifier
@@ -157,7 +158,8 @@ class CfnStackControllerTest(HeatTestCase):
                        u'StackStatus': u'CREATE_COMPLETE'}]}}}
         self.assertEqual(result, expected)
         default_args = {'limit': None, 'sort_keys': None, 'marker': None,
-                        'sort_dir': None, 'filters': None}
+                        'sort_dir': None, 'filters': None,
+                        'show_details': False}
         mock_call.assert_called_once_with(dummy_req.context, self.topic,
                                           {'namespace': None,
                                            'method': 'list_stacks',
@@ -1273,7 +1275,10 @@ class CfnStackControllerTest(HeatTestCase):
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'list_events',
-                  'args': {'stack_identity': identity},
+                  'args': {'stack_identity': identity,
+                           'filters': None,
+                           'limit': None, 'marker': None,
+                           'sort_keys': None, 'sort_dir': None},
                   'version': self.api_version}, None).AndReturn(engine_resp)
 
         self.m.ReplayAll()
@@ -1315,7 +1320,10 @@ class CfnStackControllerTest(HeatTestCase):
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'list_events',
-                  'args': {'stack_identity': identity},
+                  'args': {'stack_identity': identity,
+                           'filters': None,
+                           'limit': None, 'marker': None,
+                           'sort_keys': None, 'sort_dir': None},
                   'version': self.api_version}, None
                  ).AndRaise(Exception())
 
@@ -1347,39 +1355,45 @@ class CfnStackControllerTest(HeatTestCase):
         self.assertEqual(type(result),
                          exception.HeatInvalidParameterValueError)
 
-    def test_describe_stack_resource(self):
-        # Format a dummy request
+    def _describe_stack_resource_engine_resp(self, status=u'COMPLETE'):
+        return {u'description': u'',
+                u'resource_identity': {
+                    u'tenant': u't',
+                    u'stack_name': u'wordpress',
+                    u'stack_id': u'6',
+                    u'path': u'resources/WikiDatabase'
+                },
+                u'stack_name': u'wordpress',
+                u'resource_name': u'WikiDatabase',
+                u'resource_status_reason': None,
+                u'updated_time': u'2012-07-23T13:06:00Z',
+                u'stack_identity': {u'tenant': u't',
+                                    u'stack_name': u'wordpress',
+                                    u'stack_id': u'6',
+                                    u'path': u''},
+                u'resource_action': u'CREATE',
+                u'resource_status': status,
+                u'physical_resource_id':
+                u'a3455d8c-9f88-404d-a85b-5315293e67de',
+                u'resource_type': u'AWS::EC2::Instance',
+                u'metadata': {u'wordpress': []}}
+
+    def _describe_stack_resource_detail(self, status=u'CREATE_COMPLETE'):
+        return {'StackId': u'arn:openstack:heat::t:stacks/wordpress/6',
+                'ResourceStatus': status,
+                'Description': u'',
+                'ResourceType': u'AWS::EC2::Instance',
+                'ResourceStatusReason': None,
+                'LastUpdatedTimestamp': u'2012-07-23T13:06:00Z',
+                'StackName': u'wordpress',
+                'PhysicalResourceId':
+                u'a3455d8c-9f88-404d-a85b-5315293e67de',
+                'Metadata': {u'wordpress': []},
+                'LogicalResourceId': u'WikiDatabase'}
+
+    def _stub_describe_stack_resource(self, dummy_req, engine_resp):
         stack_name = "wordpress"
         identity = dict(identifier.HeatIdentifier('t', stack_name, '6'))
-        params = {'Action': 'DescribeStackResource',
-                  'StackName': stack_name,
-                  'LogicalResourceId': "WikiDatabase"}
-        dummy_req = self._dummy_GET_request(params)
-        self._stub_enforce(dummy_req, 'DescribeStackResource')
-
-        # Stub out the RPC call to the engine with a pre-canned response
-        engine_resp = {u'description': u'',
-                       u'resource_identity': {
-                           u'tenant': u't',
-                           u'stack_name': u'wordpress',
-                           u'stack_id': u'6',
-                           u'path': u'resources/WikiDatabase'
-                       },
-                       u'stack_name': u'wordpress',
-                       u'resource_name': u'WikiDatabase',
-                       u'resource_status_reason': None,
-                       u'updated_time': u'2012-07-23T13:06:00Z',
-                       u'stack_identity': {u'tenant': u't',
-                                           u'stack_name': u'wordpress',
-                                           u'stack_id': u'6',
-                                           u'path': u''},
-                       u'resource_action': u'CREATE',
-                       u'resource_status': u'COMPLETE',
-                       u'physical_resource_id':
-                       u'a3455d8c-9f88-404d-a85b-5315293e67de',
-                       u'resource_type': u'AWS::EC2::Instance',
-                       u'metadata': {u'wordpress': []}}
-
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
@@ -1389,33 +1403,76 @@ class CfnStackControllerTest(HeatTestCase):
         args = {
             'stack_identity': identity,
             'resource_name': dummy_req.params.get('LogicalResourceId'),
+            'with_dependencies': False,
         }
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
                   'method': 'describe_stack_resource',
                   'args': args,
                   'version': self.api_version}, None).AndReturn(engine_resp)
-
         self.m.ReplayAll()
 
+    def _describe_stack_resource_request(self):
+        params = {'Action': 'DescribeStackResource',
+                  'StackName': 'wordpress',
+                  'LogicalResourceId': "WikiDatabase"}
+        dummy_req = self._dummy_GET_request(params)
+        self._stub_enforce(dummy_req, 'DescribeStackResource')
+        return dummy_req
+
+    def test_describe_stack_resource(self):
+        dummy_req = self._describe_stack_resource_request()
+
+        # Stub out the RPC call to the engine with a pre-canned response
+        self._stub_describe_stack_resource(
+            dummy_req, self._describe_stack_resource_engine_resp())
+
         response = self.controller.describe_stack_resource(dummy_req)
 
+        detail = self._describe_stack_resource_detail()
         expected = {'DescribeStackResourceResponse':
                     {'DescribeStackResourceResult':
-                     {'StackResourceDetail':
-                      {'StackId': u'arn:openstack:heat::t:stacks/wordpress/6',
-                       'ResourceStatus': u'CREATE_COMPLETE',
-                       'Description': u'',
-                       'ResourceType': u'AWS::EC2::Instance',
-                       'ResourceStatusReason': None,
-                       'LastUpdatedTimestamp': u'2012-07-23T13:06:00Z',
-                       'StackName': u'wordpress',
-                       'PhysicalResourceId':
-                       u'a3455d8c-9f88-404d-a85b-5315293e67de',
-                       'Metadata': {u'wordpress': []},
-                       'LogicalResourceId': u'WikiDatabase'}}}}
+                     {'StackResourceDetail': detail}}}
 
         self.assertEqual(response, expected)
+        self.assertEqual(stacks.resource_etag(detail),
+                         dummy_req.environ['api.etag'])
+        self.m.VerifyAll()
+
+    def test_describe_stack_resource_not_modified(self):
+        dummy_req = self._describe_stack_resource_request()
+        etag = stacks.resource_etag(self._describe_stack_resource_detail())
+        dummy_req.if_none_match = etag
+
+        self._stub_describe_stack_resource(
+            dummy_req, self._describe_stack_resource_engine_resp())
+
+        ex = self.assertRaises(webob.exc.HTTPNotModified,
+                               self.controller.describe_stack_resource,
+                               dummy_req)
+        self.assertEqual('"%s"' % etag, ex.headers['ETag'])
+        self.m.VerifyAll()
+
+    def test_describe_stack_resource_status_modified(self):
+        # The metadata is unchanged, but the status is not
+        dummy_req = self._describe_stack_resource_request()
+        old_detail = self._describe_stack_resource_detail(
+            status=u'CREATE_IN_PROGRESS')
+        dummy_req.if_none_match = stacks.resource_etag(old_detail)
+
+        self._stub_describe_stack_resource(
+            dummy_req, self._describe_stack_resource_engine_resp())
+
+        response = self.controller.describe_stack_resource(dummy_req)
+
+        detail = self._describe_stack_resource_detail()
+        self.assertEqual(detail,
+                         response['DescribeStackResourceResponse']
+                         ['DescribeStackResourceResult']
+                         ['StackResourceDetail'])
+        self.assertEqual(stacks.resource_etag(detail),
+                         dummy_req.environ['api.etag'])
+        self.m.VerifyAll()
 
     def test_describe_stack_resource_nonexistent_stack(self):
         # Format a dummy request
@@ -1462,6 +1519,7 @@ class CfnStackControllerTest(HeatTestCase):
         args = {
             'stack_identity': identity,
             'resource_name': dummy_req.params.get('LogicalResourceId'),
+            'with_dependencies': False,
         }
         rpc.call(dummy_req.context, self.topic,
                  {'namespace': None,
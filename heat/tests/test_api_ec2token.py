@@ -22,6 +22,7 @@ from oslo.config import cfg
 from heat.api.aws import exception
 from heat.common.wsgi import Request
 from heat.api.aws import ec2token
+from heat.common import cache
 
 from heat.openstack.common import importutils
 
@@ -33,7 +34,7 @@ class Ec2TokenTest(HeatTestCase):
 
     def setUp(self):
         super(Ec2TokenTest, self).setUp()
-        self.m.StubOutWithMock(requests, 'post')
+        self.m.StubOutWithMock(requests.Session, 'post')
 
     def _dummy_GET_request(self, params={}, environ={}):
         # Mangle the params dict into a query string
@@ -202,8 +203,9 @@ class Ec2TokenTest(HeatTestCase):
                                  "path": "/v1",
                                  "body_hash": body_hash}})
         req_headers = {'Content-Type': 'application/json'}
-        requests.post(req_url, data=req_creds,
-                      headers=req_headers).AndReturn(DummyHTTPResponse())
+        requests.Session.post(
+            req_url, data=req_creds,
+            headers=req_headers).AndReturn(DummyHTTPResponse())
 
     def test_call_ok(self):
         dummy_conf = {'auth_uri': 'http://123:5000/v2.0'}
@@ -257,6 +259,61 @@ class Ec2TokenTest(HeatTestCase):
         self.assertEqual('aa,bb,cc', dummy_req.headers['X-Roles'])
         self.m.VerifyAll()
 
+    def _test_call_cached(self, ok_resp, expect_calls):
+        dummy_conf = {'auth_uri': 'http://123:5000/v2.0'}
+        ec2 = ec2token.EC2Token(app='woot', conf=dummy_conf)
+        params = {'AWSAccessKeyId': 'foo', 'Signature': 'xyz'}
+        req_env = {'SERVER_NAME': 'heat',
+                   'SERVER_PORT': '8000',
+                   'PATH_INFO': '/v1'}
+
+        for i in range(expect_calls):
+            self._stub_http_connection(response=ok_resp,
+                                       params={'AWSAccessKeyId': 'foo'})
+        self.m.ReplayAll()
+        for i in range(2):
+            dummy_req = self._dummy_GET_request(params, dict(req_env))
+            self.assertEqual('woot', ec2.__call__(dummy_req))
+            self.assertEqual('abcd1234', dummy_req.headers['X-Tenant-Id'])
+        self.m.VerifyAll()
+
+    def test_call_cached(self):
+        ok_resp = json.dumps({'access': {'token': {
+            'id': 123,
+            'tenant': {'name': 'tenant', 'id': 'abcd1234'}}}})
+        self._test_call_cached(ok_resp, 1)
+
+    def test_call_cached_token_expired(self):
+        ok_resp = json.dumps({'access': {'token': {
+            'id': 123,
+            'expires': '2013-01-01T00:00:00Z',
+            'tenant': {'name': 'tenant', 'id': 'abcd1234'}}}})
+        self._test_call_cached(ok_resp, 2)
+
+    def test_call_cached_ttl_not_extended(self):
+        now = [1000.0]
+        self.patch(cache, 'wallclock', lambda: now[0])
+        ok_resp = json.dumps({'access': {'token': {
+            'id': 123,
+            'tenant': {'name': 'tenant', 'id': 'abcd1234'}}}})
+        dummy_conf = {'auth_uri': 'http://123:5000/v2.0', 'cache_ttl': 300}
+        ec2 = ec2token.EC2Token(app='woot', conf=dummy_conf)
+        params = {'AWSAccessKeyId': 'foo', 'Signature': 'xyz'}
+        req_env = {'SERVER_NAME': 'heat',
+                   'SERVER_PORT': '8000',
+                   'PATH_INFO': '/v1'}
+
+        for i in range(2):
+            self._stub_http_connection(response=ok_resp,
+                                       params={'AWSAccessKeyId': 'foo'})
+        self.m.ReplayAll()
+        # The hit at 200s does not keep the result beyond 300s
+        for t in (0, 200, 400):
+            now[0] = 1000.0 + t
+            dummy_req = self._dummy_GET_request(params, dict(req_env))
+            self.assertEqual('woot', ec2.__call__(dummy_req))
+        self.m.VerifyAll()
+
     def test_call_err_tokenid(self):
         dummy_conf = {'auth_uri': 'http://123:5000/v2.0/'}
         ec2 = ec2token.EC2Token(app='woot', conf=dummy_conf)
@@ -346,7 +346,8 @@ class StackControllerTest(ControllerTest, HeatTestCase):
         }
         self.assertEqual(result, expected)
         default_args = {'limit': None, 'sort_keys': None, 'marker': None,
-                        'sort_dir': None, 'filters': {}}
+                        'sort_dir': None, 'filters': {},
+                        'show_details': False}
         mock_call.assert_called_once_with(req.context, self.topic,
                                           {'namespace': None,
                                           'method': 'list_stacks',
@@ -370,12 +371,13 @@ class StackControllerTest(ControllerTest, HeatTestCase):
 
         rpc_call_args, _ = mock_call.call_args
         engine_args = rpc_call_args[2]['args']
-        self.assertEqual(5, len(engine_args))
+        self.assertEqual(6, len(engine_args))
         self.assertIn('limit', engine_args)
         self.assertIn('sort_keys', engine_args)
         self.assertIn('marker', engine_args)
         self.assertIn('sort_dir', engine_args)
         self.assertIn('filters', engine_args)
+        self.assertIn('show_details', engine_args)
         self.assertNotIn('balrog', engine_args)
 
     @mock.patch.object(rpc, 'call')
@@ -489,7 +491,8 @@ class StackControllerTest(ControllerTest, HeatTestCase):
 
         self.assertEqual(result, expected)
         default_args = {'limit': None, 'sort_keys': None, 'marker': None,
-                        'sort_dir': None, 'filters': None}
+                        'sort_dir': None, 'filters': None,
+                        'show_details': True}
         mock_call.assert_called_once_with(req.context, self.topic,
                                           {'namespace': None,
                                           'method': 'list_stacks',
@@ -1532,7 +1535,8 @@ class ResourceControllerTest(ControllerTest, HeatTestCase):
                  {'namespace': None,
                   'method': 'describe_stack_resource',
                   'args': {'stack_identity': stack_identity,
-                           'resource_name': res_name},
+                           'resource_name': res_name,
+                           'with_dependencies': True},
                   'version': self.api_version},
                  None).AndReturn(engine_resp)
         self.m.ReplayAll()
@@ -1578,7 +1582,8 @@ class ResourceControllerTest(ControllerTest, HeatTestCase):
                  {'namespace': None,
                   'method': 'describe_stack_resource',
                   'args': {'stack_identity': stack_identity,
-                           'resource_name': res_name},
+                           'resource_name': res_name,
+                           'with_dependencies': True},
                   'version': self.api_version},
                  None).AndRaise(to_remote_error(error))
         self.m.ReplayAll()
@@ -1609,7 +1614,8 @@ class ResourceControllerTest(ControllerTest, HeatTestCase):
                  {'namespace': None,
                   'method': 'describe_stack_resource',
                   'args': {'stack_identity': stack_identity,
-                           'resource_name': res_name},
+                           'resource_name': res_name,
+                           'with_dependencies': True},
                   'version': self.api_version},
                  None).AndRaise(to_remote_error(error))
         self.m.ReplayAll()
@@ -1640,7 +1646,8 @@ class ResourceControllerTest(ControllerTest, HeatTestCase):
                  {'namespace': None,
                   'method': 'describe_stack_resource',
                   'args': {'stack_identity': stack_identity,
-                           'resource_name': res_name},
+                           'resource_name': res_name,
+                           'with_dependencies': True},
                   'version': self.api_version},
                  None).AndRaise(to_remote_error(error))
         self.m.ReplayAll()
@@ -1685,7 +1692,8 @@ class ResourceControllerTest(ControllerTest, HeatTestCase):
                  {'namespace': None,
                   'method': 'describe_stack_resource',
                   'args': {'stack_identity': stack_identity,
-                           'resource_name': res_name},
+                           'resource_name': res_name,
+                           'with_dependencies': True},
                   'version': self.api_version},
                  None).AndReturn(engine_resp)
         self.m.ReplayAll()
@@ -1715,7 +1723,8 @@ class ResourceControllerTest(ControllerTest, HeatTestCase):
                  {'namespace': None,
                   'method': 'describe_stack_resource',
                   'args': {'stack_identity': stack_identity,
-                           'resource_name': res_name},
+                           'resource_name': res_name,
+                           'with_dependencies': True},
                   'version': self.api_version},
                  None).AndRaise(to_remote_error(error))
         self.m.ReplayAll()
@@ -1746,7 +1755,8 @@ class ResourceControllerTest(ControllerTest, HeatTestCase):
                  {'namespace': None,
                   'method': 'describe_stack_resource',
                   'args': {'stack_identity': stack_identity,
-                           'resource_name': res_name},
+                           'resource_name': res_name,
+                           'with_dependencies': True},
                   'version': self.api_version},
                  None).AndRaise(to_remote_error(error))
         self.m.ReplayAll()
@@ -1785,6 +1795,38 @@ class EventControllerTest(ControllerTest, HeatTestCase):
     def test_resource_index_event_id_uuid(self):
         self._test_resource_index('a3455d8c-9f88-404d-a85b-5315293e67de')
 
+    @mock.patch.object(rpc, 'call')
+    def test_index_whitelists_params(self, mock_call):
+        stack_identity = identifier.HeatIdentifier(self.tenant,
+                                                   'wordpress', '6')
+        params = {
+            'limit': '10',
+            'marker': 'fake marker',
+            'sort_keys': 'resource_name',
+            'sort_dir': 'desc',
+            'resource_status': 'COMPLETE',
+            'since': '2014-01-01T00:00:00Z',
+            'balrog': 'you shall not pass!'
+        }
+        req = self._get(stack_identity._tenant_path() + '/events',
+                        params=params)
+        mock_call.return_value = []
+
+        self.controller.index(req, tenant_id=self.tenant,
+                              stack_name=stack_identity.stack_name,
+                              stack_id=stack_identity.stack_id)
+
+        rpc_call_args, _ = mock_call.call_args
+        engine_args = rpc_call_args[2]['args']
+        self.assertEqual('10', engine_args['limit'])
+        self.assertEqual('fake marker', engine_args['marker'])
+        self.assertEqual(['resource_name'], engine_args['sort_keys'])
+        self.assertEqual('desc', engine_args['sort_dir'])
+        self.assertEqual({'resource_status': 'COMPLETE',
+                          'since': '2014-01-01T00:00:00Z'},
+                         engine_args['filters'])
+        self.assertNotIn('balrog', engine_args)
+
     def _test_resource_index(self, event_id):
         res_name = 'WikiDatabase'
         stack_identity = identifier.HeatIdentifier(self.tenant,
@@ -1810,27 +1852,16 @@ class EventControllerTest(ControllerTest, HeatTestCase):
                 u'physical_resource_id': None,
                 u'resource_properties': {u'UserData': u'blah'},
                 u'resource_type': u'AWS::EC2::Instance',
-            },
-            {
-                u'stack_name': u'wordpress',
-                u'event_time': u'2012-07-23T13:05:39Z',
-                u'stack_identity': dict(stack_identity),
-                u'resource_name': 'SomeOtherResource',
-                u'logical_resource_id': 'SomeOtherResource',
-                u'resource_status_reason': u'state changed',
-                u'event_identity': dict(ev_identity),
-                u'resource_action': u'CREATE',
-                u'resource_status': u'IN_PROGRESS',
-                u'physical_resource_id': None,
-                u'resource_properties': {u'UserData': u'blah'},
-                u'resource_type': u'AWS::EC2::Instance',
             }
         ]
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(req.context, self.topic,
                  {'namespace': None,
                   'method': 'list_events',
-                  'args': {'stack_identity': stack_identity},
+                  'args': {'stack_identity': stack_identity,
+                           'filters': {'resource_name': res_name},
+                           'limit': None, 'marker': None,
+                           'sort_keys': None, 'sort_dir': None},
                   'version': self.api_version},
                  None).AndReturn(engine_resp)
         self.m.ReplayAll()
@@ -1898,7 +1929,10 @@ class EventControllerTest(ControllerTest, HeatTestCase):
         rpc.call(req.context, self.topic,
                  {'namespace': None,
                   'method': 'list_events',
-                  'args': {'stack_identity': stack_identity},
+                  'args': {'stack_identity': stack_identity,
+                           'filters': {},
+                           'limit': None, 'marker': None,
+                           'sort_keys': None, 'sort_dir': None},
                   'version': self.api_version},
                  None).AndReturn(engine_resp)
         self.m.ReplayAll()
@@ -1940,7 +1974,10 @@ class EventControllerTest(ControllerTest, HeatTestCase):
         rpc.call(req.context, self.topic,
                  {'namespace': None,
                   'method': 'list_events',
-                  'args': {'stack_identity': stack_identity},
+                  'args': {'stack_identity': stack_identity,
+                           'filters': {},
+                           'limit': None, 'marker': None,
+                           'sort_keys': None, 'sort_dir': None},
                   'version': self.api_version},
                  None).AndRaise(to_remote_error(error))
         self.m.ReplayAll()
@@ -1956,40 +1993,23 @@ class EventControllerTest(ControllerTest, HeatTestCase):
         self.m.VerifyAll()
 
     def test_index_resource_nonexist(self):
-        event_id = '42'
         res_name = 'WikiDatabase'
         stack_identity = identifier.HeatIdentifier(self.tenant,
                                                    'wordpress', '6')
-        res_identity = identifier.ResourceIdentifier(resource_name=res_name,
-                                                     **stack_identity)
-        ev_identity = identifier.EventIdentifier(event_id=event_id,
-                                                 **res_identity)
 
         req = self._get(stack_identity._tenant_path() +
                         '/resources/' + res_name + '/events')
 
-        engine_resp = [
-            {
-                u'stack_name': u'wordpress',
-                u'event_time': u'2012-07-23T13:05:39Z',
-                u'stack_identity': dict(stack_identity),
-                u'resource_name': 'SomeOtherResource',
-                u'resource_status_reason': u'state changed',
-                u'event_identity': dict(ev_identity),
-                u'resource_action': u'CREATE',
-                u'resource_status': u'IN_PROGRESS',
-                u'physical_resource_id': None,
-                u'resource_properties': {u'UserData': u'blah'},
-                u'resource_type': u'AWS::EC2::Instance',
-            }
-        ]
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(req.context, self.topic,
                  {'namespace': None,
                   'method': 'list_events',
-                  'args': {'stack_identity': stack_identity},
+                  'args': {'stack_identity': stack_identity,
+                           'filters': {'resource_name': res_name},
+                           'limit': None, 'marker': None,
+                           'sort_keys': None, 'sort_dir': None},
                   'version': self.api_version},
-                 None).AndReturn(engine_resp)
+                 None).AndReturn([])
         self.m.ReplayAll()
 
         self.assertRaises(webob.exc.HTTPNotFound,
@@ -2000,6 +2020,34 @@ class EventControllerTest(ControllerTest, HeatTestCase):
                           resource_name=res_name)
         self.m.VerifyAll()
 
+    def test_index_resource_page_empty(self):
+        res_name = 'WikiDatabase'
+        stack_identity = identifier.HeatIdentifier(self.tenant,
+                                                   'wordpress', '6')
+
+        req = self._get(stack_identity._tenant_path() +
+                        '/resources/' + res_name + '/events',
+                        params={'marker': '42', 'limit': '10'})
+
+        self.m.StubOutWithMock(rpc, 'call')
+        rpc.call(req.context, self.topic,
+                 {'namespace': None,
+                  'method': 'list_events',
+                  'args': {'stack_identity': stack_identity,
+                           'filters': {'resource_name': res_name},
+                           'limit': '10', 'marker': '42',
+                           'sort_keys': None, 'sort_dir': None},
+                  'version': self.api_version},
+                 None).AndReturn([])
+        self.m.ReplayAll()
+
+        result = self.controller.index(req, tenant_id=self.tenant,
+                                       stack_name=stack_identity.stack_name,
+                                       stack_id=stack_identity.stack_id,
+                                       resource_name=res_name)
+        self.assertEqual({'events': []}, result)
+        self.m.VerifyAll()
+
     def test_show_event_id_integer(self):
         self._test_show('42')
 
@@ -2012,48 +2060,33 @@ class EventControllerTest(ControllerTest, HeatTestCase):
                                                    'wordpress', '6')
         res_identity = identifier.ResourceIdentifier(resource_name=res_name,
                                                      **stack_identity)
-        ev1_identity = identifier.EventIdentifier(event_id='41',
-                                                  **res_identity)
         ev_identity = identifier.EventIdentifier(event_id=event_id,
                                                  **res_identity)
 
         req = self._get(stack_identity._tenant_path() +
                         '/resources/' + res_name + '/events/' + event_id)
 
-        engine_resp = [
-            {
-                u'stack_name': u'wordpress',
-                u'event_time': u'2012-07-23T13:05:39Z',
-                u'stack_identity': dict(stack_identity),
-                u'resource_name': res_name,
-                u'resource_status_reason': u'state changed',
-                u'event_identity': dict(ev1_identity),
-                u'resource_action': u'CREATE',
-                u'resource_status': u'IN_PROGRESS',
-                u'physical_resource_id': None,
-                u'resource_properties': {u'UserData': u'blah'},
-                u'resource_type': u'AWS::EC2::Instance',
-            },
-            {
-                u'stack_name': u'wordpress',
-                u'event_time': u'2012-07-23T13:06:00Z',
-                u'stack_identity': dict(stack_identity),
-                u'resource_name': res_name,
-                u'resource_status_reason': u'state changed',
-                u'event_identity': dict(ev_identity),
-                u'resource_action': u'CREATE',
-                u'resource_status': u'COMPLETE',
-                u'physical_resource_id':
-                u'a3455d8c-9f88-404d-a85b-5315293e67de',
-                u'resource_properties': {u'UserData': u'blah'},
-                u'resource_type': u'AWS::EC2::Instance',
-            }
-        ]
+        engine_resp = {
+            u'stack_name': u'wordpress',
+            u'event_time': u'2012-07-23T13:06:00Z',
+            u'stack_identity': dict(stack_identity),
+            u'resource_name': res_name,
+            u'resource_status_reason': u'state changed',
+            u'event_identity': dict(ev_identity),
+            u'resource_action': u'CREATE',
+            u'resource_status': u'COMPLETE',
+            u'physical_resource_id':
+            u'a3455d8c-9f88-404d-a85b-5315293e67de',
+            u'resource_properties': {u'UserData': u'blah'},
+            u'resource_type': u'AWS::EC2::Instance',
+        }
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(req.context, self.topic,
                  {'namespace': None,
-                  'method': 'list_events',
-                  'args': {'stack_identity': stack_identity},
+                  'method': 'show_event',
+                  'args': {'stack_identity': stack_identity,
+                           'resource_name': res_name,
+                           'event_id': event_id},
                   'version': self.api_version},
                  None).AndReturn(engine_resp)
         self.m.ReplayAll()
@@ -2088,99 +2121,42 @@ class EventControllerTest(ControllerTest, HeatTestCase):
         self.m.VerifyAll()
 
     def test_show_nonexist_event_id_integer(self):
-        self._test_show_nonexist('42', '41')
+        self._test_show_nonexist('42')
 
     def test_show_nonexist_event_id_uuid(self):
-        self._test_show_nonexist('a3455d8c-9f88-404d-a85b-5315293e67de',
-                                 'x3455x8x-9x88-404x-x85x-5315293x67xx')
+        self._test_show_nonexist('a3455d8c-9f88-404d-a85b-5315293e67de')
 
-    def _test_show_nonexist(self, event_id, search_event_id):
+    def _test_show_nonexist(self, event_id):
         res_name = 'WikiDatabase'
         stack_identity = identifier.HeatIdentifier(self.tenant,
                                                    'wordpress', '6')
-        res_identity = identifier.ResourceIdentifier(resource_name=res_name,
-                                                     **stack_identity)
-        ev_identity = identifier.EventIdentifier(event_id=search_event_id,
-                                                 **res_identity)
 
         req = self._get(stack_identity._tenant_path() +
                         '/resources/' + res_name + '/events/' + event_id)
 
-        engine_resp = [
-            {
-                u'stack_name': u'wordpress',
-                u'event_time': u'2012-07-23T13:05:39Z',
-                u'stack_identity': dict(stack_identity),
-                u'resource_name': res_name,
-                u'resource_status_reason': u'state changed',
-                u'event_identity': dict(ev_identity),
-                u'resource_action': u'CREATE',
-                u'resource_status': u'IN_PROGRESS',
-                u'physical_resource_id': None,
-                u'resource_properties': {u'UserData': u'blah'},
-                u'resource_type': u'AWS::EC2::Instance',
-            }
-        ]
+        error = heat_exc.EventNotFound(event_id=event_id,
+                                       resource_name=res_name)
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(req.context, self.topic,
                  {'namespace': None,
-                  'method': 'list_events',
-                  'args': {'stack_identity': stack_identity},
+                  'method': 'show_event',
+                  'args': {'stack_identity': stack_identity,
+                           'resource_name': res_name,
+                           'event_id': event_id},
                   'version': self.api_version},
-                 None).AndReturn(engine_resp)
+                 None).AndRaise(to_remote_error(error))
         self.m.ReplayAll()
 
-        self.assertRaises(webob.exc.HTTPNotFound,
-                          self.controller.show,
-                          req, tenant_id=self.tenant,
-                          stack_name=stack_identity.stack_name,
-                          stack_id=stack_identity.stack_id,
-                          resource_name=res_name, event_id=event_id)
-        self.m.VerifyAll()
-
-    def test_show_bad_resource(self):
-        event_id = '42'
-        res_name = 'WikiDatabase'
-        stack_identity = identifier.HeatIdentifier(self.tenant,
-                                                   'wordpress', '6')
-        res_identity = identifier.ResourceIdentifier(resource_name=res_name,
-                                                     **stack_identity)
-        ev_identity = identifier.EventIdentifier(event_id='41',
-                                                 **res_identity)
-
-        req = self._get(stack_identity._tenant_path() +
-                        '/resources/' + res_name + '/events/' + event_id)
-
-        engine_resp = [
-            {
-                u'stack_name': u'wordpress',
-                u'event_time': u'2012-07-23T13:05:39Z',
-                u'stack_identity': dict(stack_identity),
-                u'resource_name': 'SomeOtherResourceName',
-                u'resource_status_reason': u'state changed',
-                u'event_identity': dict(ev_identity),
-                u'resource_action': u'CREATE',
-                u'resource_status': u'IN_PROGRESS',
-                u'physical_resource_id': None,
-                u'resource_properties': {u'UserData': u'blah'},
-                u'resource_type': u'AWS::EC2::Instance',
-            }
-        ]
-        self.m.StubOutWithMock(rpc, 'call')
-        rpc.call(req.context, self.topic,
-                 {'namespace': None,
-                  'method': 'list_events',
-                  'args': {'stack_identity': stack_identity},
-                  'version': self.api_version},
-                 None).AndReturn(engine_resp)
-        self.m.ReplayAll()
+        resp = request_with_middleware(fault.FaultWrapper,
+                                       self.controller.show,
+                                       req, tenant_id=self.tenant,
+                                       stack_name=stack_identity.stack_name,
+                                       stack_id=stack_identity.stack_id,
+                                       resource_name=res_name,
+                                       event_id=event_id)
 
-        self.assertRaises(webob.exc.HTTPNotFound,
-                          self.controller.show,
-                          req, tenant_id=self.tenant,
-                          stack_name=stack_identity.stack_name,
-                          stack_id=stack_identity.stack_id,
-                          resource_name=res_name, event_id=event_id)
+        self.assertEqual(resp.json['code'], 404)
+        self.assertEqual(resp.json['error']['type'], 'EventNotFound')
         self.m.VerifyAll()
 
     def test_show_stack_nonexist(self):
@@ -2196,8 +2172,10 @@ class EventControllerTest(ControllerTest, HeatTestCase):
         self.m.StubOutWithMock(rpc, 'call')
         rpc.call(req.context, self.topic,
                  {'namespace': None,
-                  'method': 'list_events',
-                  'args': {'stack_identity': stack_identity},
+                  'method': 'show_event',
+                  'args': {'stack_identity': stack_identity,
+                           'resource_name': res_name,
+                           'event_id': event_id},
                   'version': self.api_version},
                  None).AndRaise(to_remote_error(error))
         self.m.ReplayAll()
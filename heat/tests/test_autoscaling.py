@@ -15,6 +15,7 @@
 import datetime
 import copy
 
+import eventlet
 import mox
 
 from testtools import skipIf
@@ -148,7 +149,7 @@ class AutoScalingTest(HeatTestCase):
         instance.Instance.check_create_complete(
             cookie).MultipleTimes().AndReturn(True)
 
-    def _stub_lb_reload(self, num, unset=True, nochange=False):
+    def _stub_lb_reload(self, num, unset=True):
         expected_list = [self.dummy_instance_id] * num
         if unset:
             self.m.VerifyAll()
@@ -158,14 +159,9 @@ class AutoScalingTest(HeatTestCase):
             instance.Instance.FnGetRefId().MultipleTimes().AndReturn(
                 self.dummy_instance_id)
 
-        self.m.StubOutWithMock(loadbalancer.LoadBalancer, 'handle_update')
-        if nochange:
-            loadbalancer.LoadBalancer.handle_update(
-                mox.IgnoreArg(), mox.IgnoreArg(), {}).AndReturn(None)
-        else:
-            loadbalancer.LoadBalancer.handle_update(
-                mox.IgnoreArg(), mox.IgnoreArg(),
-                {'Instances': expected_list}).AndReturn(None)
+        self.m.StubOutWithMock(loadbalancer.LoadBalancer, 'update_members')
+        loadbalancer.LoadBalancer.update_members(
+            expected_list).AndReturn(None)
 
     def _stub_meta_expected(self, now, data, nmeta=1):
         # Stop time at now
@@ -654,10 +650,8 @@ class AutoScalingTest(HeatTestCase):
         stack = utils.parse_stack(t, params=self.params)
 
         lb = stack['ElasticLoadBalancer']
-        self.m.StubOutWithMock(lb, 'handle_update')
-        lb.handle_update(expected,
-                         mox.IgnoreArg(),
-                         mox.IgnoreArg()).AndReturn(None)
+        self.m.StubOutWithMock(lb, '_reconfigure')
+        lb._reconfigure(['aaaabbbbcccc']).AndReturn(None)
         self.m.ReplayAll()
 
         rsrc = self.create_scaling_group(t, stack, 'WebServerGroup')
@@ -667,6 +661,7 @@ class AutoScalingTest(HeatTestCase):
         update_snippet = copy.deepcopy(rsrc.parsed_template())
         update_snippet['Properties']['Cooldown'] = '61'
         scheduler.TaskRunner(rsrc.update, update_snippet)()
+        self.assertEqual(expected, lb.t)
 
         rsrc.delete()
         self.m.VerifyAll()
@@ -693,10 +688,9 @@ class AutoScalingTest(HeatTestCase):
         self.m.StubOutWithMock(short_id, 'generate_id')
         short_id.generate_id().AndReturn('aaaabbbbcccc')
 
-        self.m.StubOutWithMock(neutron_lb.LoadBalancer, 'handle_update')
-        neutron_lb.LoadBalancer.handle_update(expected,
-                                              mox.IgnoreArg(),
-                                              mox.IgnoreArg()).AndReturn(None)
+        self.m.StubOutWithMock(neutron_lb.LoadBalancer, '_create_members')
+        neutron_lb.LoadBalancer._create_members(
+            [u'aaaabbbbcccc']).AndReturn(None)
 
         now = timeutils.utcnow()
         self._stub_meta_expected(now, 'ExactCapacity : 1')
@@ -704,9 +698,56 @@ class AutoScalingTest(HeatTestCase):
         self.m.ReplayAll()
         stack = utils.parse_stack(t, params=self.params)
         self.create_scaling_group(t, stack, 'WebServerGroup')
+        self.assertEqual(expected, stack['ElasticLoadBalancer'].t)
 
         self.m.VerifyAll()
 
+    def test_lb_reload_unchanged(self):
+        t = template_format.parse(as_template)
+        stack = utils.parse_stack(t, params=self.params)
+
+        self._stub_lb_reload(1)
+        now = timeutils.utcnow()
+        self._stub_meta_expected(now, 'ExactCapacity : 1')
+        self._stub_create(1)
+        self.m.ReplayAll()
+        rsrc = self.create_scaling_group(t, stack, 'WebServerGroup')
+        self.m.VerifyAll()
+        self.m.UnsetStubs()
+
+        # The load balancer is not updated when its members are unchanged
+        self.m.StubOutWithMock(instance.Instance, 'FnGetRefId')
+        instance.Instance.FnGetRefId().MultipleTimes().AndReturn(
+            self.dummy_instance_id)
+        self.m.StubOutWithMock(loadbalancer.LoadBalancer, 'update_members')
+        self.m.ReplayAll()
+        members = [self.dummy_instance_id]
+        self.assertEqual(members, rsrc._lb_reload(current=members))
+        self.m.VerifyAll()
+
+    def test_lb_update_members_coalesced(self):
+        t = template_format.parse(as_template)
+        stack = utils.parse_stack(t, params=self.params)
+        lb = stack['ElasticLoadBalancer']
+        requests = []
+        waiters = []
+
+        def update_members(members):
+            requests.append(members)
+            if len(requests) == 1:
+                # More requests arrive while the first is in progress
+                waiters.extend(eventlet.spawn(asc._update_lb_members, lb, m)
+                               for m in (['b'], ['c']))
+                eventlet.sleep(0)
+
+        lb.update_members = update_members
+        asc._update_lb_members(lb, ['a'])
+        for waiter in waiters:
+            waiter.wait()
+
+        self.assertEqual([['a'], ['c']], requests)
+        self.assertEqual({}, asc._lb_member_updates)
+
     @skipIf(neutronclient is None, 'neutronclient unavailable')
     def test_lb_reload_invalid_resource(self):
         t = template_format.parse(as_template)
@@ -747,7 +788,6 @@ class AutoScalingTest(HeatTestCase):
 
         # reduce to 1
         self._stub_lb_reload(1)
-        self._stub_validate()
         self._stub_meta_expected(now, 'ChangeInCapacity : -2')
         self.m.ReplayAll()
         rsrc.adjust(-2)
@@ -763,13 +803,53 @@ class AutoScalingTest(HeatTestCase):
 
         # set to 2
         self._stub_lb_reload(2)
-        self._stub_validate()
         self._stub_meta_expected(now, 'ExactCapacity : 2')
         self.m.ReplayAll()
         rsrc.adjust(2, 'ExactCapacity')
         self.assertEqual(len(rsrc.get_instance_names()), 2)
         self.m.VerifyAll()
 
+    def test_scaling_group_adjust_incremental(self):
+        t = template_format.parse(as_template)
+        stack = utils.parse_stack(t, params=self.params)
+
+        # start with 2
+        properties = t['Resources']['WebServerGroup']['Properties']
+        properties['DesiredCapacity'] = '2'
+        self._stub_lb_reload(2)
+        now = timeutils.utcnow()
+        self._stub_meta_expected(now, 'ExactCapacity : 2')
+        self._stub_create(2)
+        self.m.ReplayAll()
+        rsrc = self.create_scaling_group(t, stack, 'WebServerGroup')
+        old_names = rsrc.get_instance_names()
+
+        # raise to 3 without updating the existing instances
+        self._stub_lb_reload(3)
+        self._stub_meta_expected(now, 'ChangeInCapacity : 1')
+        self._stub_create(1)
+        self.m.StubOutWithMock(asc.AutoScalingGroup, 'update_with_template')
+        self.m.ReplayAll()
+        rsrc.adjust(1)
+        names = rsrc.get_instance_names()
+        self.assertEqual(3, len(names))
+        new_names = [n for n in names if n not in old_names]
+        self.assertEqual(1, len(new_names))
+
+        # reduce to 1, removing the oldest instances
+        self._stub_lb_reload(1)
+        self._stub_meta_expected(now, 'ChangeInCapacity : -2')
+        self.m.StubOutWithMock(asc.AutoScalingGroup, 'update_with_template')
+        self.m.ReplayAll()
+        rsrc.adjust(-2)
+        self.assertEqual(new_names, rsrc.get_instance_names())
+
+        # the stored nested stack matches the remaining instance
+        nested = parser.Stack.load(rsrc.context, rsrc.resource_id)
+        self.assertEqual(new_names, list(nested))
+        self.assertEqual((nested.UPDATE, nested.COMPLETE), nested.state)
+        self.m.VerifyAll()
+
     def test_scaling_group_scale_up_failure(self):
         t = template_format.parse(as_template)
         stack = utils.parse_stack(t, params=self.params)
@@ -788,7 +868,7 @@ class AutoScalingTest(HeatTestCase):
         # Scale up one 1 instance with resource failure
         self.m.StubOutWithMock(instance.Instance, 'handle_create')
         instance.Instance.handle_create().AndRaise(exception.Error())
-        self._stub_lb_reload(1, unset=False, nochange=True)
+        self._stub_lb_reload(1, unset=False)
         self._stub_validate()
         self.m.ReplayAll()
 
@@ -823,7 +903,6 @@ class AutoScalingTest(HeatTestCase):
 
         # lower below the min
         self._stub_lb_reload(1)
-        self._stub_validate()
         self._stub_meta_expected(now, 'ChangeInCapacity : -5')
         self.m.ReplayAll()
         rsrc.adjust(-5)
@@ -857,7 +936,6 @@ class AutoScalingTest(HeatTestCase):
         self._stub_lb_reload(lowest)
         adjust = 'PercentChangeInCapacity : %d' % decrease
         self._stub_meta_expected(now, adjust)
-        self._stub_validate()
         self.m.ReplayAll()
         rsrc.adjust(decrease, 'PercentChangeInCapacity')
         self.assertEqual(len(rsrc.get_instance_names()), lowest)
@@ -901,7 +979,6 @@ class AutoScalingTest(HeatTestCase):
 
         # reduce by 50%
         self._stub_lb_reload(1)
-        self._stub_validate()
         self._stub_meta_expected(now, 'PercentChangeInCapacity : -50')
         self.m.ReplayAll()
         rsrc.adjust(-50, 'PercentChangeInCapacity')
@@ -953,7 +1030,6 @@ class AutoScalingTest(HeatTestCase):
 
         # reduce by 50%
         self._stub_lb_reload(1)
-        self._stub_validate()
         self._stub_meta_expected(now, 'PercentChangeInCapacity : -50')
         self.m.ReplayAll()
         rsrc.adjust(-50, 'PercentChangeInCapacity')
@@ -1008,7 +1084,6 @@ class AutoScalingTest(HeatTestCase):
         # reduce by 50%
         self._stub_lb_reload(1)
         self._stub_meta_expected(now, 'PercentChangeInCapacity : -50')
-        self._stub_validate()
         self.m.ReplayAll()
         rsrc.adjust(-50, 'PercentChangeInCapacity')
         self.assertEqual(len(rsrc.get_instance_names()), 1)
@@ -1093,7 +1168,6 @@ class AutoScalingTest(HeatTestCase):
 
         # Scale down one
         self._stub_lb_reload(1)
-        self._stub_validate()
         self._stub_meta_expected(now, 'ChangeInCapacity : -1', 2)
 
         self.m.StubOutWithMock(asc.ScalingPolicy, 'keystone')
@@ -227,11 +227,9 @@ class AutoScalingGroupTest(HeatTestCase):
 
     def _stub_lb_reload(self, num=1, setup=True):
         if setup:
-            self.m.StubOutWithMock(lb.LoadBalancer, 'handle_update')
+            self.m.StubOutWithMock(lb.LoadBalancer, 'update_members')
         for i in range(num):
-            lb.LoadBalancer.handle_update(
-                mox.IgnoreArg(), mox.IgnoreArg(),
-                mox.IgnoreArg()).AndReturn(None)
+            lb.LoadBalancer.update_members(mox.IgnoreArg()).AndReturn(None)
 
     def _stub_grp_create(self, capacity=0, setup_lb=True):
         """
@@ -560,7 +558,7 @@ class AutoScalingGroupTest(HeatTestCase):
                                       num_updates_expected_on_updt=10,
                                       num_creates_expected_on_updt=0,
                                       num_deletes_expected_on_updt=0,
-                                      num_reloads_expected_on_updt=9,
+                                      num_reloads_expected_on_updt=8,
                                       update_replace=True)
 
     def test_autoscaling_group_update_replace_with_adjusted_capacity(self):
@@ -581,7 +579,7 @@ class AutoScalingGroupTest(HeatTestCase):
                                       num_updates_expected_on_updt=8,
                                       num_creates_expected_on_updt=2,
                                       num_deletes_expected_on_updt=2,
-                                      num_reloads_expected_on_updt=7,
+                                      num_reloads_expected_on_updt=6,
                                       update_replace=True)
 
     def test_autoscaling_group_update_replace_huge_batch_size(self):
@@ -601,7 +599,7 @@ class AutoScalingGroupTest(HeatTestCase):
                                       num_updates_expected_on_updt=10,
                                       num_creates_expected_on_updt=0,
                                       num_deletes_expected_on_updt=0,
-                                      num_reloads_expected_on_updt=3,
+                                      num_reloads_expected_on_updt=2,
                                       update_replace=True)
 
     def test_autoscaling_group_update_replace_huge_min_in_service(self):
@@ -622,7 +620,7 @@ class AutoScalingGroupTest(HeatTestCase):
                                       num_updates_expected_on_updt=9,
                                       num_creates_expected_on_updt=1,
                                       num_deletes_expected_on_updt=1,
-                                      num_reloads_expected_on_updt=13,
+                                      num_reloads_expected_on_updt=11,
                                       update_replace=True)
 
     def test_autoscaling_group_update_no_replace(self):
@@ -645,7 +643,7 @@ class AutoScalingGroupTest(HeatTestCase):
                                       num_updates_expected_on_updt=10,
                                       num_creates_expected_on_updt=0,
                                       num_deletes_expected_on_updt=0,
-                                      num_reloads_expected_on_updt=6,
+                                      num_reloads_expected_on_updt=5,
                                       update_replace=False)
 
     def test_instance_group_update_no_replace_with_adjusted_capacity(self):
@@ -668,7 +666,7 @@ class AutoScalingGroupTest(HeatTestCase):
                                       num_updates_expected_on_updt=8,
                                       num_creates_expected_on_updt=2,
                                       num_deletes_expected_on_updt=2,
-                                      num_reloads_expected_on_updt=5,
+                                      num_reloads_expected_on_updt=4,
                                       update_replace=False)
 
     def test_autoscaling_group_update_policy_removed(self):
@@ -715,7 +713,7 @@ class AutoScalingGroupTest(HeatTestCase):
         updated_stack = utils.parse_stack(updated_tmpl)
         self._stub_grp_replace(num_creates_expected_on_updt=0,
                                num_deletes_expected_on_updt=0,
-                               num_reloads_expected_on_updt=1)
+                               num_reloads_expected_on_updt=0)
         self.m.ReplayAll()
         stack.update(updated_stack)
         self.m.VerifyAll()
@@ -770,7 +768,7 @@ class AutoScalingGroupTest(HeatTestCase):
         updated_stack = utils.parse_stack(updated_tmpl)
         self._stub_grp_replace(num_creates_expected_on_updt=0,
                                num_deletes_expected_on_updt=0,
-                               num_reloads_expected_on_updt=1)
+                               num_reloads_expected_on_updt=0)
         self.m.ReplayAll()
         stack.update(updated_stack)
         self.m.VerifyAll()
@@ -0,0 +1,107 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import testtools
+
+from heat.common import cache
+
+
+class LRUCacheTest(testtools.TestCase):
+
+    def test_get_set(self):
+        c = cache.LRUCache(2)
+        self.assertIsNone(c.get('a'))
+        c.set('a', 1)
+        self.assertEqual(1, c.get('a'))
+        self.assertIn('a', c)
+        self.assertEqual(1, len(c))
+
+    def test_default(self):
+        c = cache.LRUCache(2)
+        self.assertEqual('missing', c.get('a', 'missing'))
+
+    def test_evict_least_recently_used(self):
+        c = cache.LRUCache(2)
+        c.set('a', 1)
+        c.set('b', 2)
+        c.get('a')
+        c.set('c', 3)
+        self.assertIn('a', c)
+        self.assertNotIn('b', c)
+        self.assertIn('c', c)
+
+    def test_replace(self):
+        c = cache.LRUCache(2)
+        c.set('a', 1)
+        c.set('a', 2)
+        self.assertEqual(2, c.get('a'))
+        self.assertEqual(1, len(c))
+
+    def test_max_size(self):
+        c = cache.LRUCache(10, max_size=5, sizeof=len)
+        c.set('a', 'xxx')
+        c.set('b', 'yy')
+        c.set('c', 'z')
+        self.assertNotIn('a', c)
+        self.assertEqual('yy', c.get('b'))
+        self.assertEqual('z', c.get('c'))
+        self.assertEqual(3, c.stats()['size'])
+
+    def test_too_big(self):
+        c = cache.LRUCache(10, max_size=2, sizeof=len)
+        c.set('a', 'x')
+        c.set('b', 'xxx')
+        self.assertIn('a', c)
+        self.assertNotIn('b', c)
+
+    def test_ttl(self):
+        c = cache.LRUCache(10, ttl=60)
+        now = [1000.0]
+        self.patch(cache, 'wallclock', lambda: now[0])
+        c.set('a', 1)
+        self.assertEqual(1, c.get('a'))
+        now[0] += 61
+        self.assertIsNone(c.get('a'))
+        self.assertEqual(0, len(c))
+
+    def test_entry_ttl(self):
+        c = cache.LRUCache(10, ttl=60)
+        now = [1000.0]
+        self.patch(cache, 'wallclock', lambda: now[0])
+        c.set('a', 1, ttl=10)
+        c.set('b', 2)
+        now[0] += 11
+        self.assertNotIn('a', c)
+        self.assertIn('b', c)
+
+    def test_delete_clear(self):
+        c = cache.LRUCache(10)
+        c.set('a', 1)
+        c.set('b', 2)
+        c.delete('a')
+        c.delete('missing')
+        self.assertNotIn('a', c)
+        c.clear()
+        self.assertEqual(0, len(c))
+        c.set('c', 3)
+        self.assertEqual(3, c.get('c'))
+
+    def test_stats(self):
+        c = cache.LRUCache(10)
+        c.set('a', 1)
+        c.get('a')
+        c.get('b')
+        self.assertEqual({'entries': 1, 'size': 0, 'hits': 1, 'misses': 1},
+                         c.stats())
@@ -12,8 +12,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
+from heat.common import cache
 from heat.engine import clients
+from heat.openstack.common import timeutils
 from heat.tests.common import HeatTestCase
+from heat.tests import utils
 
 
 class ClientsTest(HeatTestCase):
@@ -21,3 +26,73 @@ class ClientsTest(HeatTestCase):
     def test_clients_chosen_at_module_initilization(self):
         self.assertFalse(hasattr(clients.Clients, 'nova'))
         self.assertTrue(hasattr(clients.Clients('fakecontext'), 'nova'))
+
+
+class FakeKeystone(object):
+
+    def __init__(self, expires):
+        self.auth_token_expires = expires
+
+
+class ClientPoolTest(HeatTestCase):
+
+    def setUp(self):
+        super(ClientPoolTest, self).setUp()
+        self.m.StubOutWithMock(clients.OpenStackClients, '_nova_client')
+
+    def test_pooled_by_token(self):
+        nova_client = object()
+        other_client = object()
+        clients.OpenStackClients._nova_client('compute').AndReturn(
+            nova_client)
+        clients.OpenStackClients._nova_client('compute').AndReturn(
+            other_client)
+        self.m.ReplayAll()
+
+        ctx = utils.dummy_context()
+        self.assertIs(nova_client, clients.OpenStackClients(ctx).nova())
+        self.assertIs(nova_client, clients.OpenStackClients(ctx).nova())
+
+        ctx.auth_token = 'efgh5678'
+        self.assertIs(other_client, clients.OpenStackClients(ctx).nova())
+        self.m.VerifyAll()
+
+    def test_evicted_on_token_expiry(self):
+        now = [1000.0]
+        self.patch(cache, 'wallclock', lambda: now[0])
+        clients.OpenStackClients._nova_client('compute').AndReturn(object())
+        clients.OpenStackClients._nova_client('compute').AndReturn(object())
+        self.m.ReplayAll()
+
+        ctx = utils.dummy_context()
+        expires = timeutils.utcnow() + datetime.timedelta(seconds=30)
+        first = clients.OpenStackClients(ctx)
+        first._keystone = FakeKeystone(expires)
+        nova_client = first.nova()
+        self.assertIs(nova_client, clients.OpenStackClients(ctx).nova())
+
+        now[0] += 31
+        self.assertIsNot(nova_client, clients.OpenStackClients(ctx).nova())
+        self.m.VerifyAll()
+
+    def test_not_pooled_without_client(self):
+        clients.OpenStackClients._nova_client('compute').AndReturn(None)
+        clients.OpenStackClients._nova_client('compute').AndReturn(None)
+        self.m.ReplayAll()
+
+        ctx = utils.dummy_context()
+        self.assertIsNone(clients.OpenStackClients(ctx).nova())
+        self.assertIsNone(clients.OpenStackClients(ctx).nova())
+        self.m.VerifyAll()
+
+    def test_nova_extensions_discovered_once(self):
+        self.patch(clients, '_nova_extensions', None)
+        self.m.StubOutWithMock(clients.novashell.OpenStackComputeShell,
+                               '_discover_extensions')
+        clients.novashell.OpenStackComputeShell._discover_extensions(
+            '1.1').AndReturn(['ext'])
+        self.m.ReplayAll()
+
+        self.assertEqual(['ext'], clients.nova_extensions())
+        self.assertEqual(['ext'], clients.nova_extensions())
+        self.m.VerifyAll()
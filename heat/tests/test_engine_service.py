@@ -41,9 +41,11 @@ from heat.engine.properties import Properties
 from heat.engine import resource as res
 from heat.engine.resources import instance as instances
 from heat.engine.resources import nova_utils
+from heat.engine.resources import wait_condition
 from heat.engine import resource as rsrs
 from heat.engine import watchrule
 from heat.openstack.common import threadgroup
+from heat.rpc import client as rpc_client
 from heat.tests.common import HeatTestCase
 from heat.tests import generic_resource as generic_rsrc
 from heat.tests import utils
@@ -1121,14 +1123,80 @@ class StackServiceTest(HeatTestCase):
 
         self.m.VerifyAll()
 
+    @stack_context('service_event_show_test_stack')
+    def test_stack_event_show(self):
+        events = self.eng.list_events(self.ctx, self.stack.identifier())
+        event_id = events[0]['event_identity']['path'].rsplit('/', 1)[1]
+
+        self.m.StubOutWithMock(parser.Stack, 'load')
+        self.m.ReplayAll()
+        ev = self.eng.show_event(self.ctx, self.stack.identifier(),
+                                 'WebServer', event_id)
+
+        self.assertEqual(events[0], ev)
+        self.assertRaises(exception.EventNotFound,
+                          self.eng.show_event, self.ctx,
+                          self.stack.identifier(), 'NooServer', event_id)
+        self.assertRaises(exception.EventNotFound,
+                          self.eng.show_event, self.ctx,
+                          self.stack.identifier(), 'WebServer', 'wibble')
+        self.m.VerifyAll()
+
+    @stack_context('service_event_list_filter_test_stack')
+    def test_stack_event_list_filtered(self):
+        self.m.StubOutWithMock(parser.Stack, 'load')
+        self.m.ReplayAll()
+        events = self.eng.list_events(self.ctx, None,
+                                      filters={'resource_status': 'COMPLETE'},
+                                      limit=5)
+
+        self.assertEqual(1, len(events))
+        self.assertEqual('COMPLETE', events[0]['resource_status'])
+
+        long_ago = '2000-01-01T00:00:00Z'
+        events = self.eng.list_events(self.ctx, None,
+                                      filters={'since': long_ago})
+        self.assertEqual(2, len(events))
+        events = self.eng.list_events(self.ctx, None,
+                                      filters={'until': long_ago})
+        self.assertEqual([], events)
+        self.m.VerifyAll()
+
+    def test_stack_event_list_bad_time(self):
+        self.assertRaises(exception.Invalid,
+                          self.eng.list_events, self.ctx, None,
+                          filters={'since': 'yesterday'})
+
     @stack_context('service_list_all_test_stack')
     def test_stack_list_all(self):
+        self.m.StubOutWithMock(parser.Stack, 'load')
+        self.m.ReplayAll()
+        sl = self.eng.list_stacks(self.ctx)
+
+        self.assertEqual(1, len(sl))
+        for s in sl:
+            self.assertEqual(dict(self.stack.identifier()),
+                             s['stack_identity'])
+            self.assertEqual(self.stack.name, s['stack_name'])
+            self.assertEqual('CREATE', s['stack_action'])
+            self.assertEqual('COMPLETE', s['stack_status'])
+            self.assertTrue('creation_time' in s)
+            self.assertTrue('updated_time' in s)
+            self.assertTrue('stack_status_reason' in s)
+            self.assertNotEqual(s['description'].find('WordPress'), -1)
+            self.assertNotIn('parameters', s)
+            self.assertNotIn('outputs', s)
+
+        self.m.VerifyAll()
+
+    @stack_context('service_list_details_test_stack')
+    def test_stack_list_details(self):
         self.m.StubOutWithMock(parser.Stack, 'load')
         parser.Stack.load(self.ctx, stack=mox.IgnoreArg(), resolve_data=False)\
             .AndReturn(self.stack)
 
         self.m.ReplayAll()
-        sl = self.eng.list_stacks(self.ctx)
+        sl = self.eng.list_stacks(self.ctx, show_details=True)
 
         self.assertEqual(1, len(sl))
         for s in sl:
@@ -1323,6 +1391,34 @@ class StackServiceTest(HeatTestCase):
 
         self.m.VerifyAll()
 
+    @stack_context('service_stack_resource_describe_record_test_stack')
+    def test_stack_resource_describe_record(self):
+        self.m.StubOutWithMock(parser.Stack, 'load')
+        self.m.ReplayAll()
+
+        r = self.eng.describe_stack_resource(self.ctx, self.stack.identifier(),
+                                             'WebServer',
+                                             with_dependencies=False)
+
+        self.assertEqual(dict(self.stack['WebServer'].identifier()),
+                         r['resource_identity'])
+        self.assertEqual(dict(self.stack.identifier()), r['stack_identity'])
+        self.assertEqual(self.stack.name, r['stack_name'])
+        self.assertEqual('WebServer', r['resource_name'])
+        self.assertEqual('AWS::EC2::Instance', r['resource_type'])
+        self.assertEqual('CREATE', r['resource_action'])
+        self.assertEqual('COMPLETE', r['resource_status'])
+        self.assertEqual(self.stack['WebServer'].metadata, r['metadata'])
+        self.assertIn('description', r)
+        self.assertIn('updated_time', r)
+        self.assertNotIn('required_by', r)
+
+        self.assertRaises(exception.ResourceNotFound,
+                          self.eng.describe_stack_resource,
+                          self.ctx, self.stack.identifier(), 'foo',
+                          with_dependencies=False)
+        self.m.VerifyAll()
+
     def test_stack_resource_describe_nonexist_stack(self):
         non_exist_identifier = identifier.HeatIdentifier(
             self.ctx.tenant_id,
@@ -1396,6 +1492,27 @@ class StackServiceTest(HeatTestCase):
 
         self.m.VerifyAll()
 
+    @stack_context('service_authorize_stack_user_cached_test_stack')
+    def test_stack_authorize_stack_user_cached(self):
+        self.ctx.aws_creds = json.dumps({'ec2Credentials': {'access': 'key'}})
+        s = db_api.stack_get(self.ctx, self.stack.id)
+        self.m.StubOutWithMock(service.EngineService, '_access_allowed')
+        service.EngineService._access_allowed(self.ctx, s, 'key',
+                                              'WebServer').AndReturn(True)
+        self.m.ReplayAll()
+
+        self.assertTrue(self.eng._authorize_stack_user(self.ctx, s,
+                                                       'WebServer'))
+        self.assertTrue(self.eng._authorize_stack_user(self.ctx, s,
+                                                       'WebServer'))
+        self.m.VerifyAll()
+
+    @stack_context('service_access_allowed_nokey_test_stack')
+    def test_stack_access_allowed_nokey(self):
+        s = db_api.stack_get(self.ctx, self.stack.id)
+        self.assertFalse(self.eng._access_allowed(self.ctx, s, 'key',
+                                                  'WebServer'))
+
     @stack_context('service_resources_describe_test_stack')
     def test_stack_resources_describe(self):
         self.m.StubOutWithMock(parser.Stack, 'load')
@@ -1592,6 +1709,9 @@ class StackServiceTest(HeatTestCase):
                                          self.stack.identifier()).AndReturn(s)
         self.m.StubOutWithMock(instances.Instance, 'metadata_update')
         instances.Instance.metadata_update(new_metadata=test_metadata)
+        self.m.StubOutWithMock(rpc_client.EngineClient, 'metadata_updated')
+        rpc_client.EngineClient.metadata_updated(
+            self.ctx, self.stack['WebServer'].id)
         self.m.StubOutWithMock(service.EngineService, '_load_user_creds')
         service.EngineService._load_user_creds(
             mox.IgnoreArg()).AndReturn(self.ctx)
@@ -1606,6 +1726,12 @@ class StackServiceTest(HeatTestCase):
 
         self.m.VerifyAll()
 
+    def test_metadata_updated(self):
+        wait_condition.signal_watch.watch('1234')
+        self.addCleanup(wait_condition.signal_watch.unwatch, '1234')
+        self.eng.metadata_updated(self.ctx, '1234')
+        self.assertEqual(1, wait_condition.signal_watch.count('1234'))
+
     def test_metadata_err_stack(self):
         non_exist_identifier = identifier.HeatIdentifier(
             self.ctx.tenant_id, 'wibble',
@@ -1626,6 +1752,9 @@ class StackServiceTest(HeatTestCase):
 
     @stack_context('service_metadata_err_resource_test_stack', False)
     def test_metadata_err_resource(self):
+        self.m.StubOutWithMock(service.EngineService, '_load_user_creds')
+        service.EngineService._load_user_creds(
+            mox.IgnoreArg()).AndReturn(self.ctx)
         self.m.StubOutWithMock(parser.Stack, 'load')
         parser.Stack.load(self.ctx,
                           stack=mox.IgnoreArg()).AndReturn(self.stack)
@@ -1639,46 +1768,126 @@ class StackServiceTest(HeatTestCase):
 
         self.m.VerifyAll()
 
-    @stack_context('periodic_watch_task_not_created')
-    def test_periodic_watch_task_not_created(self):
-        self.eng.stg[self.stack.id] = DummyThreadGroup()
-        self.eng._start_watch_task(self.stack.id, self.ctx)
-        self.assertEqual([], self.eng.stg[self.stack.id].threads)
+    @stack_context('periodic_watch_task_no_rules')
+    def test_periodic_watcher_task_no_rules(self):
+        self.m.StubOutWithMock(watchrule.WatchRule, 'load')
+        self.m.ReplayAll()
+        self.eng._periodic_watcher_task()
+        self.m.VerifyAll()
 
-    def test_periodic_watch_task_created(self):
-        stack = get_stack('period_watch_task_created',
+    def test_periodic_watcher_task_evaluates(self):
+        stack = get_stack('periodic_watch_task_evaluates',
                           utils.dummy_context(),
                           alarm_template)
         self.stack = stack
         self.m.ReplayAll()
         stack.store()
         stack.create()
-        self.eng.stg[stack.id] = DummyThreadGroup()
-        self.eng._start_watch_task(stack.id, self.ctx)
-        self.assertEqual([self.eng._periodic_watcher_task],
-                         self.eng.stg[stack.id].threads)
+
+        self.m.StubOutWithMock(service.EngineService, '_load_user_creds')
+        service.EngineService._load_user_creds(
+            mox.IgnoreArg()).AndReturn(self.ctx)
+        self.m.StubOutWithMock(watchrule.WatchRule, 'evaluate')
+        watchrule.WatchRule.evaluate().AndReturn([])
+        self.m.ReplayAll()
+
+        self.eng._periodic_watcher_task()
+        self.m.VerifyAll()
         self.stack.delete()
 
-    def test_periodic_watch_task_created_nested(self):
+    def test_periodic_watcher_task_evaluates_nested(self):
         self.m.StubOutWithMock(urlfetch, 'get')
         urlfetch.get('https://server.test/alarm.template').MultipleTimes().\
             AndReturn(alarm_template)
         self.m.ReplayAll()
 
-        stack = get_stack('period_watch_task_created_nested',
+        stack = get_stack('periodic_watch_task_evaluates_nested',
                           utils.dummy_context(),
                           nested_alarm_template)
-        setup_keystone_mocks(self.m, stack)
         self.stack = stack
-        self.m.ReplayAll()
         stack.store()
         stack.create()
-        self.eng.stg[stack.id] = DummyThreadGroup()
-        self.eng._start_watch_task(stack.id, self.ctx)
-        self.assertEqual([self.eng._periodic_watcher_task],
-                         self.eng.stg[stack.id].threads)
+
+        self.m.StubOutWithMock(service.EngineService, '_load_user_creds')
+        service.EngineService._load_user_creds(
+            mox.IgnoreArg()).AndReturn(self.ctx)
+        self.m.StubOutWithMock(watchrule.WatchRule, 'evaluate')
+        watchrule.WatchRule.evaluate().AndReturn([])
+        self.m.ReplayAll()
+
+        self.eng._periodic_watcher_task()
+        self.m.VerifyAll()
         self.stack.delete()
 
+    @stack_context('periodic_watch_task_shard', False)
+    @utils.wr_delete_after
+    def test_periodic_watcher_task_shard(self):
+        rule = {u'Period': u'300',
+                u'ComparisonOperator': u'GreaterThanThreshold',
+                u'Statistic': u'SampleCount',
+                u'Threshold': u'2',
+                u'MetricName': u'ServiceFailure'}
+        self.wr = watchrule.WatchRule(context=self.ctx,
+                                      watch_name='shard_watch',
+                                      rule=rule,
+                                      stack_id=self.stack.id,
+                                      state='NORMAL')
+        self.wr.store()
+
+        cfg.CONF.set_override('watch_shard_count', 2)
+        cfg.CONF.set_override('watch_shard_index', (self.wr.id + 1) % 2)
+        self.m.StubOutWithMock(watchrule.WatchRule, 'load')
+        self.m.ReplayAll()
+        self.eng._periodic_watcher_task()
+        self.m.VerifyAll()
+
+    def _store_watch_rules(self, *names):
+        rule = {u'Period': u'300',
+                u'ComparisonOperator': u'GreaterThanThreshold',
+                u'Statistic': u'SampleCount',
+                u'Threshold': u'2',
+                u'MetricName': u'ServiceFailure'}
+        self.wr = []
+        for name in names:
+            wr = watchrule.WatchRule(context=self.ctx,
+                                     watch_name=name,
+                                     rule=rule,
+                                     stack_id=self.stack.id,
+                                     state='NORMAL')
+            wr.store()
+            self.wr.append(wr)
+
+    @stack_context('periodic_watch_task_rule_error', False)
+    @utils.wr_delete_after
+    def test_periodic_watcher_task_rule_error(self):
+        self._store_watch_rules('error_watch_1', 'error_watch_2')
+
+        self.m.StubOutWithMock(service.EngineService, '_load_user_creds')
+        service.EngineService._load_user_creds(
+            mox.IgnoreArg()).AndReturn(self.ctx)
+        self.m.StubOutWithMock(watchrule.WatchRule, 'evaluate')
+        watchrule.WatchRule.evaluate().AndRaise(ValueError('bad sample'))
+        watchrule.WatchRule.evaluate().AndReturn([])
+        self.m.ReplayAll()
+
+        self.eng._periodic_watcher_task()
+        self.m.VerifyAll()
+
+    @stack_context('periodic_watch_task_stack_error', False)
+    @utils.wr_delete_after
+    def test_periodic_watcher_task_stack_error(self):
+        self._store_watch_rules('stack_error_watch_1', 'stack_error_watch_2')
+
+        # The stack is only tried once, and its rules are skipped
+        self.m.StubOutWithMock(service.EngineService, '_load_user_creds')
+        service.EngineService._load_user_creds(
+            mox.IgnoreArg()).AndRaise(exception.NotFound())
+        self.m.StubOutWithMock(watchrule.WatchRule, 'load')
+        self.m.ReplayAll()
+
+        self.eng._periodic_watcher_task()
+        self.m.VerifyAll()
+
     @stack_context('service_show_watch_test_stack', False)
     @utils.wr_delete_after
     def test_show_watch(self):
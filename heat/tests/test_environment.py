@@ -21,9 +21,12 @@ from oslo.config import cfg
 cfg.CONF.import_opt('environment_dir', 'heat.common.config')
 
 from heat.common import environment_format
+from heat.common import exception
 
 from heat.engine import environment
 from heat.engine import resources
+from heat.engine.resources import instance
+from heat.engine.resources import server
 
 from heat.tests import generic_resource
 from heat.tests import common
@@ -107,6 +110,55 @@ class EnvironmentTest(common.HeatTestCase):
                                                'my_fip').value)
 
 
+class LazyClassResourceInfoTest(common.HeatTestCase):
+
+    def test_manifest_up_to_date(self):
+        from heat.engine.resources import manifest
+        for res_name, module_name in \
+                resources.scan_resource_modules().iteritems():
+            self.assertEqual(module_name,
+                             '%s.%s' % (resources.__name__,
+                                        manifest.RESOURCE_MODULES.get(
+                                            res_name)))
+
+    def test_get_class(self):
+        env = environment.Environment({}, user_env=False)
+        env.register_lazy_class('AWS::EC2::Instance',
+                                'heat.engine.resources.instance')
+        info = env.get_resource_info('AWS::EC2::Instance')
+        self.assertIsInstance(info, environment.ClassResourceInfo)
+        self.assertEqual('heat.engine.resources.instance', info.value)
+        self.assertEqual(instance.Instance, info.get_class())
+        self.assertEqual(instance.Instance, info.value)
+        self.assertEqual(['AWS::EC2::Instance'], env.get_types())
+
+    def test_get_class_not_in_module(self):
+        env = environment.Environment({}, user_env=False)
+        env.register_lazy_class('OS::Nova::Wibble',
+                                'heat.engine.resources.instance')
+        self.assertRaises(exception.StackValidationFailed,
+                          env.get_class, 'OS::Nova::Wibble')
+
+    def test_get_class_no_module(self):
+        env = environment.Environment({}, user_env=False)
+        env.register_lazy_class('OS::Nova::Wibble',
+                                'heat.engine.resources.wibble')
+        self.assertRaises(exception.StackValidationFailed,
+                          env.get_class, 'OS::Nova::Wibble')
+
+    def test_get_types_unavailable(self):
+        env = environment.Environment({}, user_env=False)
+        env.register_lazy_class('AWS::EC2::Instance',
+                                'heat.engine.resources.instance')
+        env.register_lazy_class('OS::Nova::Wibble',
+                                'heat.engine.resources.instance')
+        env.register_lazy_class('OS::Nova::Wobble',
+                                'heat.engine.resources.wibble')
+        self.assertEqual(['AWS::EC2::Instance'], env.get_types())
+        self.assertRaises(exception.StackValidationFailed,
+                          env.get_class, 'OS::Nova::Wibble')
+
+
 class GlobalEnvLoadingTest(common.HeatTestCase):
 
     def test_happy_path(self):
@@ -226,8 +278,8 @@ class GlobalEnvLoadingTest(common.HeatTestCase):
                          g_env.get_resource_info('OS::Nova::Server'))
 
         # 4. make sure we haven't removed something we shouldn't have
-        self.assertEqual(resources.instance.Instance,
-                         g_env.get_resource_info('AWS::EC2::Instance').value)
+        self.assertEqual(instance.Instance,
+                         g_env.get_class('AWS::EC2::Instance'))
 
     def test_env_multi_resources_disable(self):
         # prove we can disable resources in the global environment
@@ -252,8 +304,8 @@ class GlobalEnvLoadingTest(common.HeatTestCase):
                          g_env.get_resource_info('AWS::EC2::Instance'))
 
         # 4. make sure we haven't removed something we shouldn't have
-        self.assertEqual(resources.server.Server,
-                         g_env.get_resource_info('OS::Nova::Server').value)
+        self.assertEqual(server.Server,
+                         g_env.get_class('OS::Nova::Server'))
 
     def test_env_user_cant_disable_sys_resource(self):
         # prove a user can't disable global resources from the user environment
@@ -268,5 +320,5 @@ class GlobalEnvLoadingTest(common.HeatTestCase):
 
         # 2. assert global resources are NOT gone.
         self.assertEqual(
-            resources.instance.Instance,
-            u_env.get_resource_info('AWS::EC2::Instance').value)
+            instance.Instance,
+            u_env.get_class('AWS::EC2::Instance'))
@@ -12,10 +12,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mox
+
 from oslo.config import cfg
 
 cfg.CONF.import_opt('event_purge_batch_size', 'heat.common.config')
 cfg.CONF.import_opt('max_events_per_stack', 'heat.common.config')
+cfg.CONF.import_opt('event_batch_interval', 'heat.common.config')
 
 import heat.db.api as db_api
 from heat.engine import parser
@@ -145,3 +148,80 @@ class EventTest(HeatTestCase):
         e = event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS', 'Testing',
                         'wibble', res.properties, res.name, res.type())
         self.assertTrue('Error' in e.resource_properties)
+
+
+class EventWriterTest(HeatTestCase):
+
+    def setUp(self):
+        super(EventWriterTest, self).setUp()
+        utils.setup_dummy_db()
+        self.ctx = utils.dummy_context()
+
+        resource._register_class('ResourceWithRequiredProps',
+                                 generic_rsrc.ResourceWithRequiredProps)
+
+        self.stack = parser.Stack(self.ctx, 'event_writer_test_stack',
+                                  template.Template(tmpl))
+        self.stack.store()
+        self.addCleanup(db_api.stack_delete, self.ctx, self.stack.id)
+        self.resource = self.stack['EventTestResource']
+
+    def _event(self, physical_resource_id):
+        return event.Event(self.ctx, self.stack, 'TEST', 'IN_PROGRESS',
+                           'Testing', physical_resource_id,
+                           self.resource.properties,
+                           self.resource.name, self.resource.type())
+
+    def _stored_ids(self):
+        return [e.physical_resource_id
+                for e in db_api.event_get_all_by_stack(self.ctx,
+                                                       self.stack.id)]
+
+    def test_write_unbuffered(self):
+        writer = event.EventWriter(self.ctx)
+        e = self._event('wibble')
+        writer.write(e)
+        self.assertIsNotNone(e.id)
+        self.assertEqual(['wibble'], self._stored_ids())
+
+    def test_write_buffered(self):
+        self.m.StubOutWithMock(event.eventlet, 'spawn_after')
+        timer = self.m.CreateMockAnything()
+        event.eventlet.spawn_after(5, mox.IgnoreArg()).AndReturn(timer)
+        timer.cancel()
+        self.m.ReplayAll()
+
+        writer = event.EventWriter(self.ctx, 5)
+        events = [self._event('alabama'), self._event('arizona')]
+        for e in events:
+            writer.write(e)
+        self.assertEqual([], self._stored_ids())
+
+        writer.flush()
+        self.assertEqual(set(['alabama', 'arizona']),
+                         set(self._stored_ids()))
+        for e in events:
+            self.assertIsNotNone(e.id)
+        self.m.VerifyAll()
+
+    def test_flush_empty(self):
+        writer = event.EventWriter(self.ctx, 5)
+        writer.flush()
+        self.assertEqual([], self._stored_ids())
+
+    def test_flush_on_stack_state_change(self):
+        cfg.CONF.set_override('event_batch_interval', 5)
+        self.m.StubOutWithMock(event.eventlet, 'spawn_after')
+        timer = self.m.CreateMockAnything()
+        event.eventlet.spawn_after(5, mox.IgnoreArg()).AndReturn(timer)
+        timer.cancel()
+        self.m.ReplayAll()
+
+        stack = parser.Stack(self.ctx, 'event_writer_test_stack',
+                             template.Template(tmpl), stack_id=self.stack.id)
+        stack.event_writer.write(self._event('wibble'))
+        self.assertEqual([], self._stored_ids())
+
+        stack.state_set(stack.CREATE, stack.IN_PROGRESS, 'test')
+        self.assertEqual(['wibble'], self._stored_ids())
+        self.m.VerifyAll()
@@ -19,11 +19,13 @@ import re
 from oslo.config import cfg
 from heat.common import exception
 from heat.common import template_format
+from heat.db import api as db_api
 from heat.engine import clients
 from heat.engine import scheduler
 from heat.engine.resources import instance
 from heat.engine.resources import user
 from heat.engine.resources import loadbalancer as lb
+from heat.engine.resources import nova_utils
 from heat.engine.resources import wait_condition as wc
 from heat.engine.resource import Metadata
 from heat.tests.common import HeatTestCase
@@ -219,6 +221,38 @@ class LoadBalancerTest(HeatTestCase):
         rsrc = self.create_loadbalancer(t, s, 'LoadBalancer')
         self.m.VerifyAll()
 
+    def test_update_members(self):
+        self._create_stubs()
+        Metadata.__set__(mox.IgnoreArg(), mox.IgnoreArg()).AndReturn(None)
+        self.m.ReplayAll()
+
+        t = template_format.parse(lb_template)
+        s = utils.parse_stack(t)
+        s.store()
+        rsrc = self.create_loadbalancer(t, s, 'LoadBalancer')
+        instances = rsrc.properties['Instances']
+
+        # Only the instance new to the load balancer is looked up
+        self.m.StubOutWithMock(nova_utils, 'server_to_ipaddress')
+        nova_utils.server_to_ipaddress(self.fc, 'WikiServerTwo').AndReturn(
+            '5.6.7.8')
+        self.m.ReplayAll()
+
+        rsrc.add_members(['WikiServerTwo'])
+        self.assertEqual(instances + ['WikiServerTwo'],
+                         rsrc.properties['Instances'])
+        self.assertEqual('5.6.7.8', db_api.resource_data_get(rsrc,
+                                                             'WikiServerTwo'))
+
+        rsrc.remove_members(instances)
+        self.assertEqual(['WikiServerTwo'], rsrc.properties['Instances'])
+        self.assertEqual(['WikiServerTwo'],
+                         db_api.resource_data_get_all(rsrc).keys())
+
+        # Nothing is reconfigured when the instances are unchanged
+        rsrc.update_members(['WikiServerTwo'])
+        self.m.VerifyAll()
+
     def assertRegexpMatches(self, text, expected_regexp, msg=None):
         """Fail the test unless the text matches the regular expression."""
         if isinstance(expected_regexp, basestring):
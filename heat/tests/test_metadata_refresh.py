@@ -28,6 +28,7 @@ from heat.engine import scheduler
 from heat.engine import service
 from heat.engine.resources import instance
 from heat.engine.resources import wait_condition as wc
+from heat.rpc import client as rpc_client
 
 
 test_template_metadata = '''
@@ -257,6 +258,9 @@ class WaitCondMetadataUpdateTest(HeatTestCase):
         def post_success(sleep_time):
             update_metadata('123', 'foo', 'bar')
 
+        self.m.StubOutWithMock(rpc_client.EngineClient, 'metadata_updated')
+        rpc_client.EngineClient.metadata_updated(
+            mox.IgnoreArg(), mox.IgnoreArg()).MultipleTimes()
         scheduler.TaskRunner._sleep(mox.IsA(int)).WithSideEffects(check_empty)
         scheduler.TaskRunner._sleep(mox.IsA(int)).WithSideEffects(post_success)
         scheduler.TaskRunner._sleep(mox.IsA(int)).MultipleTimes().AndReturn(
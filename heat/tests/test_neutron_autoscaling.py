@@ -296,9 +296,6 @@ class AutoScalingTest(HeatTestCase):
         clients.OpenStackClients.keystone().AndReturn(
             fakes.FakeKeystoneClient())
 
-        clients.OpenStackClients.keystone().AndReturn(
-            fakes.FakeKeystoneClient())
-
         parser.Stack.validate()
         instid = str(uuid.uuid4())
         instance.Instance.handle_create().AndReturn(instid)
@@ -316,9 +313,7 @@ class AutoScalingTest(HeatTestCase):
 
         instances[instid] = membera_ret_block['member']['id']
 
-        # Start of update
-        clients.OpenStackClients.keystone().AndReturn(
-            fakes.FakeKeystoneClient())
+        # Start of update, which reuses the pooled Neutron client
 
         parser.Stack.validate()
         instid = str(uuid.uuid4())
@@ -729,6 +729,26 @@ class LoadBalancerTest(HeatTestCase):
         self.assertEqual((rsrc.UPDATE, rsrc.COMPLETE), rsrc.state)
         self.m.VerifyAll()
 
+    def test_add_remove_members(self):
+        rsrc = self.create_load_balancer()
+        neutronclient.Client.create_member({
+            'member': {
+                'pool_id': 'pool123', 'protocol_port': 8080,
+                'address': '4.5.6.7'}}
+        ).AndReturn({'member': {'id': 'memberxyz'}})
+        neutronclient.Client.delete_member(u'member5678')
+
+        self.m.ReplayAll()
+        scheduler.TaskRunner(rsrc.create)()
+
+        rsrc.add_members(['5678'])
+        self.assertEqual(['1234', '5678'], rsrc.properties['members'])
+        rsrc.remove_members(['1234'])
+        self.assertEqual(['5678'], rsrc.properties['members'])
+        self.assertEqual(['5678'], rsrc.t['Properties']['members'])
+        self.assertEqual((rsrc.CREATE, rsrc.COMPLETE), rsrc.state)
+        self.m.VerifyAll()
+
     def test_delete(self):
         rsrc = self.create_load_balancer()
         neutronclient.Client.delete_member(u'member5678')
@@ -17,6 +17,7 @@
 import testscenarios
 import uuid
 
+from heat.common import cache
 from heat.common import exception
 from heat.engine.resources import nova_utils
 from heat.tests.common import HeatTestCase
@@ -87,6 +88,139 @@ class NovaUtilsTests(HeatTestCase):
                           self.nova_client, 'notakey')
         self.m.VerifyAll()
 
+    def test_get_flavor_id_cached(self):
+        """Tests that flavor lookups are cached per tenant."""
+        my_flavor = self.m.CreateMockAnything()
+        my_flavor.name = 'X-Large'
+        my_flavor.id = str(uuid.uuid4())
+        self.nova_client.flavors = self.m.CreateMockAnything()
+        self.nova_client.flavors.list().AndReturn([my_flavor])
+        self.nova_client.flavors.list().AndReturn([my_flavor])
+        self.m.ReplayAll()
+        for i in range(2):
+            self.assertEqual(my_flavor.id,
+                             nova_utils.get_flavor_id(self.nova_client,
+                                                      'X-Large',
+                                                      tenant_id='t1'))
+        # A different tenant does not share the cached result
+        self.assertEqual(my_flavor.id,
+                         nova_utils.get_flavor_id(self.nova_client,
+                                                  'X-Large',
+                                                  tenant_id='t2'))
+        self.m.VerifyAll()
+
+    def test_get_image_id_not_found_cached(self):
+        """Tests that failed image lookups are cached."""
+        self.nova_client.images = self.m.CreateMockAnything()
+        self.nova_client.images.list().AndReturn([])
+        self.m.ReplayAll()
+        for i in range(2):
+            self.assertRaises(exception.ImageNotFound,
+                              nova_utils.get_image_id,
+                              self.nova_client, 'noimage', tenant_id='t1')
+        self.m.VerifyAll()
+
+    def test_get_keypair_not_cached(self):
+        """Tests that keypair lookups, which are per user, are repeated."""
+        my_key = self.m.CreateMockAnything()
+        my_key.name = 'mykey'
+        self.nova_client.keypairs = self.m.CreateMockAnything()
+        self.nova_client.keypairs.list().AndReturn([])
+        self.nova_client.keypairs.list().AndReturn([my_key])
+        self.m.ReplayAll()
+        self.assertRaises(exception.UserKeyPairMissing,
+                          nova_utils.get_keypair,
+                          self.nova_client, 'mykey')
+        self.assertEqual(my_key, nova_utils.get_keypair(self.nova_client,
+                                                        'mykey'))
+        self.m.VerifyAll()
+
+
+class ServerStatusPollerTests(HeatTestCase):
+
+    def setUp(self):
+        super(ServerStatusPollerTests, self).setUp()
+        self.manager = self.m.CreateMockAnything()
+        self.servers = [self._server(i) for i in ('1', '2')]
+
+    def _server(self, server_id):
+        server = self.m.CreateMockAnything()
+        server.id = server_id
+        server.manager = self.manager
+        server._info = {'id': server_id, 'status': 'BUILD'}
+        return server
+
+    def test_single_server(self):
+        """Tests that a lone server is refreshed directly."""
+        self.servers[0].get()
+        self.servers[0].get()
+        self.m.ReplayAll()
+        for i in range(2):
+            nova_utils.refresh_server(self.servers[0], 'tenant')
+        self.m.VerifyAll()
+
+    def test_no_tenant(self):
+        """Tests that servers are refreshed directly without a tenant."""
+        for server in self.servers:
+            server.get()
+        self.m.ReplayAll()
+        for server in self.servers:
+            nova_utils.refresh_server(server)
+        self.m.VerifyAll()
+
+    def test_batched(self):
+        """Tests that watched servers are refreshed from one listing."""
+        self.servers[0].get()
+        self.manager.list(detailed=True).AndReturn(self.servers)
+        self.servers[1]._add_details(self.servers[1]._info)
+        self.servers[0]._add_details(self.servers[0]._info)
+        self.m.ReplayAll()
+        nova_utils.refresh_server(self.servers[0], 'tenant')
+        nova_utils.refresh_server(self.servers[1], 'tenant')
+        nova_utils.refresh_server(self.servers[0], 'tenant')
+        self.m.VerifyAll()
+
+    def test_backoff(self):
+        """Tests that listings are skipped while nothing changes."""
+        poller = nova_utils.ServerStatusPoller()
+        self.servers[0].get()
+        # Listed in the first two steps, then again after skipping one
+        for i in range(3):
+            self.manager.list(detailed=True).AndReturn(self.servers)
+        for server in self.servers:
+            for i in range(5):
+                server._add_details(server._info)
+        self.m.ReplayAll()
+        poller.refresh(self.servers[0])
+        for step in range(5):
+            poller.refresh(self.servers[1])
+            poller.refresh(self.servers[0])
+        self.m.VerifyAll()
+
+    def test_pollers_bounded(self):
+        """Tests that pollers of idle tenants are discarded."""
+        self.patch(nova_utils, '_status_pollers', cache.LRUCache(2))
+        self.servers[0].get()
+        self.servers[1].get()
+        self.servers[1].get()
+        self.m.ReplayAll()
+        nova_utils.refresh_server(self.servers[0], 'tenant1')
+        nova_utils.refresh_server(self.servers[1], 'tenant2')
+        nova_utils.refresh_server(self.servers[1], 'tenant3')
+        self.assertEqual(2, len(nova_utils._status_pollers))
+        self.assertNotIn('tenant1', nova_utils._status_pollers)
+        self.m.VerifyAll()
+
+    def test_not_listed(self):
+        """Tests that servers missing from the listing are got directly."""
+        self.servers[0].get()
+        self.manager.list(detailed=True).AndReturn([self.servers[0]])
+        self.servers[1].get()
+        self.m.ReplayAll()
+        nova_utils.refresh_server(self.servers[0], 'tenant')
+        nova_utils.refresh_server(self.servers[1], 'tenant')
+        self.m.VerifyAll()
+
 
 class NovaUtilsUserdataTests(HeatTestCase):
 
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
 import json
 import time
 
@@ -39,6 +40,7 @@ from heat.tests.v1_1 import fakes
 from heat.tests import generic_resource as generic_rsrc
 
 import heat.db.api as db_api
+from heat.db.sqlalchemy import models
 
 load_tests = testscenarios.load_tests_apply_scenarios
 
@@ -142,6 +144,42 @@ class TemplateTest(HeatTestCase):
         self.assertEqual(empty[template.RESOURCES], {})
         self.assertEqual(empty[template.OUTPUTS], {})
 
+    def test_load_cached(self):
+        utils.setup_dummy_db()
+        tmpl = {'Resources': {'R': {'Type': 'GenericResourceType'}}}
+        template_id = parser.Template(tmpl).store(self.ctx)
+
+        first = parser.Template.load(self.ctx, template_id)
+        self.assertEqual(tmpl, first.t)
+
+        self.m.StubOutWithMock(db_api, 'raw_template_get')
+        self.m.ReplayAll()
+
+        hits = template.template_cache().stats()['hits']
+        second = parser.Template.load(self.ctx, template_id)
+        self.assertEqual(tmpl, second.t)
+        self.assertEqual(template_id, second.id)
+        self.assertIsNot(first.t, second.t)
+        self.assertEqual(hits + 1, template.template_cache().stats()['hits'])
+        self.m.VerifyAll()
+
+    def test_load_cached_id_reused(self):
+        utils.setup_dummy_db()
+        tmpl = {'Resources': {'R': {'Type': 'GenericResourceType'}}}
+        template_id = parser.Template(tmpl).store(self.ctx)
+        self.assertEqual(tmpl, parser.Template.load(self.ctx, template_id).t)
+
+        # The template is purged, and its ID reused for another one
+        other = {'Resources': {'S': {'Type': 'GenericResourceType'}}}
+        raw_template = models.RawTemplate.__table__
+        utils.get_engine().execute(
+            raw_template.update().
+            where(raw_template.c.id == template_id).
+            values(template=other,
+                   created_at=datetime.datetime(2038, 1, 1)))
+
+        self.assertEqual(other, parser.Template.load(self.ctx, template_id).t)
+
     def test_invalid_template(self):
         scanner_error = '''
 1
@@ -711,6 +749,33 @@ class ResolveDataTest(HeatTestCase):
             {"Fn::Join": [" ", [{'Ref': 'baz'}]]},
             self.stack.resolve_static_data(join))
 
+    def test_runtime_data_cached(self):
+        resource._register_class('GenericResourceType',
+                                 generic_rsrc.GenericResource)
+        tmpl = {'Resources': {'AResource': {'Type': 'GenericResourceType'}}}
+        stack = parser.Stack(self.ctx, 'resolve_test_stack',
+                             template.Template(tmpl))
+
+        self.m.StubOutWithMock(generic_rsrc.GenericResource, 'FnGetRefId')
+        generic_rsrc.GenericResource.FnGetRefId().AndReturn('one')
+        generic_rsrc.GenericResource.FnGetRefId().AndReturn('two')
+        self.m.ReplayAll()
+
+        snippet = {'Fn::Join': [' ', [{'Ref': 'AResource'}, 'foo']]}
+        self.assertEqual('one foo', stack.resolve_runtime_data(snippet))
+        self.assertEqual('one foo', stack.resolve_runtime_data(snippet))
+
+        stack.reset_resolved_data()
+        self.assertEqual('two foo', stack.resolve_runtime_data(snippet))
+        self.m.VerifyAll()
+
+    def test_runtime_data_cache_copies(self):
+        snippet = {'Fn::Split': [',', 'one,two']}
+        result = self.stack.resolve_runtime_data(snippet)
+        result.append('three')
+        self.assertEqual(['one', 'two'],
+                         self.stack.resolve_runtime_data(snippet))
+
 
 class StackTest(HeatTestCase):
     def setUp(self):
@@ -794,6 +859,30 @@ class StackTest(HeatTestCase):
                              status_reason='blarg')
         self.assertEqual(1, stack.total_resources())
 
+    def test_metadata_referrers(self):
+        tpl = {'Resources': {
+            'Handle': {'Type': 'GenericResourceType'},
+            'Wait': {'Type': 'ResourceWithPropsType',
+                     'Properties': {'Foo': {'Ref': 'Handle'}}},
+            'Direct': {'Type': 'GenericResourceType',
+                       'Metadata': {'h': {'Ref': 'Handle'}}},
+            'Indirect': {'Type': 'GenericResourceType',
+                         'Metadata': {'d': {'Fn::GetAtt': ['Wait', 'Data']}}},
+            'Props': {'Type': 'ResourceWithPropsType',
+                      'Properties': {'Foo': {'Ref': 'Handle'}}},
+            'Other': {'Type': 'GenericResourceType',
+                      'Metadata': {'o': {'Ref': 'Props'}}},
+            'Unrelated': {'Type': 'GenericResourceType',
+                          'Metadata': {'x': 'y'}}}}
+        stack = parser.Stack(self.ctx, 'test_stack', parser.Template(tpl))
+
+        self.assertEqual(['Direct', 'Indirect', 'Other'],
+                         sorted(r.name for r in
+                                stack.metadata_referrers('Handle')))
+        self.assertEqual(['Indirect'],
+                         [r.name for r in stack.metadata_referrers('Wait')])
+        self.assertEqual([], stack.metadata_referrers('Unrelated'))
+
     def _setup_nested(self, name):
         nested_tpl = ('{"Resources":{'
                       '"A": {"Type": "GenericResourceType"},'
@@ -822,6 +911,29 @@ class StackTest(HeatTestCase):
             4,
             self.stack['A'].nested().root_stack.total_resources())
 
+    @utils.stack_delete_after
+    def test_total_resources_counted(self):
+        self._setup_nested('counted')
+        self.assertEqual(4, db_api.stack_total_resources_get(self.ctx,
+                                                             self.stack.id))
+
+        # The nested stack is not loaded to get the total
+        stack = parser.Stack.load(self.ctx, stack_id=self.stack.id)
+        self.assertEqual(4, stack.total_resources())
+        self.assertIsNone(stack['A']._nested)
+
+        scheduler.TaskRunner(self.stack['A'].delete)()
+        self.assertEqual(2, self.stack.total_resources())
+
+    @utils.stack_delete_after
+    def test_total_resources_uncounted(self):
+        self._setup_nested('uncounted')
+        db_api.stack_total_resources_set(self.ctx, self.stack.id, None)
+
+        self.assertEqual(4, self.stack.total_resources())
+        self.assertEqual(4, db_api.stack_total_resources_get(self.ctx,
+                                                             self.stack.id))
+
     @utils.stack_delete_after
     def test_root_stack(self):
         self._setup_nested('toor')
@@ -830,6 +942,26 @@ class StackTest(HeatTestCase):
         self.assertEqual(
             self.stack, self.stack['A'].nested().root_stack)
 
+    @utils.stack_delete_after
+    def test_load_resources_single_query(self):
+        tpl = {'Resources': dict(('R%d' % i, {'Type': 'GenericResourceType'})
+                                 for i in range(10))}
+        self.stack = parser.Stack(self.ctx, 'load_resources',
+                                  parser.Template(tpl))
+        self.stack.store()
+        self.stack.create()
+
+        # No per-resource queries should be made when loading the stack
+        self.m.StubOutWithMock(db_api, 'resource_get_by_name_and_stack')
+        self.m.ReplayAll()
+
+        stack = parser.Stack.load(self.ctx, stack_id=self.stack.id)
+        self.assertEqual(10, len(stack))
+        for rsrc in stack.itervalues():
+            self.assertEqual(self.stack[rsrc.name].id, rsrc.id)
+            self.assertEqual((rsrc.CREATE, rsrc.COMPLETE), rsrc.state)
+        self.m.VerifyAll()
+
     @utils.stack_delete_after
     def test_load_parent_resource(self):
         self.stack = parser.Stack(self.ctx, 'load_parent_resource',
@@ -13,8 +13,10 @@
 #    under the License.
 
 import itertools
+import mox
 import uuid
 
+from oslo.config import cfg
 import testscenarios
 
 from heat.common import exception
@@ -82,6 +84,31 @@ class ResourceTest(HeatTestCase):
         self.assertEqual(res.state, (res.CREATE, res.COMPLETE))
         self.assertEqual(res.status_reason, 'wibble')
 
+    def test_coalesced_state_writes(self):
+        cfg.CONF.set_override('coalesce_resource_state_writes', True)
+        self.addCleanup(cfg.CONF.clear_override,
+                        'coalesce_resource_state_writes')
+        tmpl = {'Type': 'Foo'}
+        res = generic_rsrc.GenericResource('test_resource', tmpl, self.stack)
+        scheduler.TaskRunner(res.create)()
+        self.assertEqual((res.CREATE, res.COMPLETE), res.state)
+
+        # Retaining the resource leaves nothing to wait for, so only the
+        # final state is stored
+        self.m.StubOutWithMock(db_api, 'resource_update')
+        db_api.resource_update(res.context, res.id,
+                               mox.And(mox.ContainsKeyValue('action',
+                                                            res.DELETE),
+                                       mox.ContainsKeyValue('status',
+                                                            res.COMPLETE))
+                               ).AndReturn(True)
+        self.m.ReplayAll()
+
+        res.set_deletion_policy(resource.RETAIN)
+        scheduler.TaskRunner(res.delete)()
+        self.assertEqual((res.DELETE, res.COMPLETE), res.state)
+        self.m.VerifyAll()
+
     def test_set_deletion_policy(self):
         tmpl = {'Type': 'Foo'}
         res = generic_rsrc.GenericResource('test_resource', tmpl, self.stack)
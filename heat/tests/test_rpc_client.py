@@ -88,7 +88,8 @@ class EngineRpcAPITestCase(testtools.TestCase):
             'sort_keys': mock.ANY,
             'marker': mock.ANY,
             'sort_dir': mock.ANY,
-            'filters': mock.ANY
+            'filters': mock.ANY,
+            'show_details': mock.ANY
         }
         self._test_engine_api('list_stacks', 'call', **default_args)
 
@@ -140,13 +141,31 @@ class EngineRpcAPITestCase(testtools.TestCase):
         self._test_engine_api('generate_template', 'call', type_name="TYPE")
 
     def test_list_events(self):
-        self._test_engine_api('list_events', 'call',
-                              stack_identity=self.identity)
+        default_args = {
+            'stack_identity': self.identity,
+            'filters': mock.ANY,
+            'limit': mock.ANY,
+            'marker': mock.ANY,
+            'sort_keys': mock.ANY,
+            'sort_dir': mock.ANY,
+        }
+        self._test_engine_api('list_events', 'call', **default_args)
+
+    def test_show_event(self):
+        self._test_engine_api('show_event', 'call',
+                              stack_identity=self.identity,
+                              resource_name='LogicalResourceId',
+                              event_id='1234')
+
+    def test_metadata_updated(self):
+        self._test_engine_api('metadata_updated', 'fanout_cast',
+                              resource_id='1234')
 
     def test_describe_stack_resource(self):
         self._test_engine_api('describe_stack_resource', 'call',
                               stack_identity=self.identity,
-                              resource_name='LogicalResourceId')
+                              resource_name='LogicalResourceId',
+                              with_dependencies=False)
 
     def test_find_physical_resource(self):
         self._test_engine_api('find_physical_resource', 'call',
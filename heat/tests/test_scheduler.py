@@ -182,6 +182,18 @@ class DependencyTaskGroupTest(mox.MoxTestBase):
         self.steps = 0
         self.mox.StubOutWithMock(scheduler.TaskRunner, '_sleep')
         with self._dep_test(('second', 'first')) as dummy:
+            pass
+
+    def test_dependent_started_in_same_step(self):
+        self.steps = 2
+        self.mox.StubOutWithMock(scheduler.TaskRunner, '_sleep')
+        with self._dep_test(('second', 'first')) as dummy:
+            dummy.do_step(1, 'first').AndReturn(None)
+            dummy.do_step(2, 'first').AndReturn(None)
+            scheduler.TaskRunner._sleep(None).AndReturn(None)
+            dummy.do_step(1, 'second').AndReturn(None)
+            scheduler.TaskRunner._sleep(None).AndReturn(None)
+            dummy.do_step(2, 'second').AndReturn(None)
             scheduler.TaskRunner._sleep(None).AndReturn(None)
 
     def test_single_node(self):
@@ -19,8 +19,10 @@ from json import loads
 from json import dumps
 import mock
 import mox
+from oslo.config import cfg
 
 from heat.db.sqlalchemy import api as db_api
+from heat.db.sqlalchemy import models
 from heat.engine import environment
 from heat.tests.v1_1 import fakes
 from heat.engine.resource import Resource
@@ -30,6 +32,7 @@ from heat.common import template_format
 from heat.engine.resources import instance as instances
 from heat.engine import parser
 from heat.engine import scheduler
+from heat.openstack.common.db import exception as db_exception
 from heat.openstack.common import timeutils
 from heat.tests.common import HeatTestCase
 from heat.tests import utils
@@ -691,6 +694,24 @@ class DBAPIStackTest(HeatTestCase):
         self.assertRaises(exception.NotFound, db_api.stack_update, self.ctx,
                           UUID2, values)
 
+    def test_stack_update_state(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        values = {'action': 'update', 'status': 'complete',
+                  'status_reason': 'update_complete'}
+        self.assertTrue(db_api.stack_update_state(self.ctx, stack.id,
+                                                  values))
+        stack = db_api.stack_get(self.ctx, stack.id)
+        self.assertEqual('update', stack.action)
+        self.assertEqual('complete', stack.status)
+        self.assertEqual('update_complete', stack.status_reason)
+
+        self.assertFalse(db_api.stack_update_state(
+            self.ctx, stack.id, {'status': 'failed'},
+            expected_state=('update', 'in_progress')))
+        self.assertEqual('complete', db_api.stack_get(self.ctx,
+                                                      stack.id).status)
+        self.assertFalse(db_api.stack_update_state(self.ctx, UUID2, values))
+
     def test_stack_get_returns_a_stack(self):
         stack = create_stack(self.ctx, self.template, self.user_creds)
         ret_stack = db_api.stack_get(self.ctx, stack.id, show_deleted=False)
@@ -794,6 +815,50 @@ class DBAPIStackTest(HeatTestCase):
 
         self.assertEqual(2, db_api.stack_count_all_by_tenant(self.ctx))
 
+    def test_stack_count_all_by_tenant_maintained(self):
+        stacks = [create_stack(self.ctx, self.template, self.user_creds)
+                  for i in range(3)]
+        create_stack(self.ctx, self.template, self.user_creds,
+                     owner_id=stacks[0].id)
+        create_stack(self.ctx, self.template, self.user_creds,
+                     deleted_at=datetime.now())
+        self.assertEqual(3, db_api.stack_count_all_by_tenant(self.ctx))
+
+        db_api.stack_delete(self.ctx, stacks[0].id)
+        self.assertEqual(2, db_api.stack_count_all_by_tenant(self.ctx))
+        count = db_api.model_query(self.ctx, models.TenantStackCount).\
+            get(self.ctx.tenant_id)
+        self.assertEqual(2, count.count)
+
+    def test_stack_count_created_concurrently(self):
+        def save(count_ref, session):
+            # Another engine creates the tenant's count just after it is
+            # found to be missing, so this insert finds a duplicate
+            session.execute(models.TenantStackCount.__table__.insert(),
+                            {'tenant': count_ref.tenant, 'count': 1})
+            raise db_exception.DBDuplicateEntry(['tenant'])
+
+        self.patch(models.TenantStackCount, 'save', save)
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+
+        self.assertIsNotNone(db_api.stack_get(self.ctx, stack.id))
+        self.assertEqual(2, db_api.stack_count_all_by_tenant(self.ctx))
+
+    def test_stack_total_resources(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        self.assertIsNone(db_api.stack_total_resources_get(self.ctx,
+                                                           stack.id))
+
+        db_api.stack_total_resources_add(self.ctx, stack.id, 2)
+        self.assertIsNone(db_api.stack_total_resources_get(self.ctx,
+                                                           stack.id))
+
+        db_api.stack_total_resources_set(self.ctx, stack.id, 3)
+        db_api.stack_total_resources_add(self.ctx, stack.id, 2)
+        db_api.stack_total_resources_add(self.ctx, stack.id, -1)
+        self.assertEqual(4, db_api.stack_total_resources_get(self.ctx,
+                                                             stack.id))
+
     def test_purge_deleted(self):
         now = datetime.now()
         delta = timedelta(seconds=3600 * 7)
@@ -825,6 +890,31 @@ class DBAPIStackTest(HeatTestCase):
         self._deleted_stack_existance(utils.dummy_context(), stacks,
                                       (), (0, 1, 2, 3, 4))
 
+    def test_purge_deleted_batches(self):
+        now = datetime.now()
+        deleted_at = now - timedelta(days=2)
+        stacks = [create_stack(self.ctx, create_raw_template(self.ctx),
+                               create_user_creds(self.ctx),
+                               deleted_at=deleted_at) for i in range(5)]
+        stacks.append(create_stack(self.ctx, create_raw_template(self.ctx),
+                                   create_user_creds(self.ctx)))
+
+        progress = []
+        purged = db_api.purge_deleted(age=1, batch_size=2,
+                                      progress=progress.append)
+        self.assertEqual(5, purged)
+        self.assertEqual([2, 4, 5], progress)
+        self._deleted_stack_existance(utils.dummy_context(), stacks,
+                                      (5,), (0, 1, 2, 3, 4))
+        self.assertRaises(exception.NotFound, db_api.raw_template_get,
+                          self.ctx, stacks[0].raw_template_id)
+
+    def test_purge_deleted_bad_batch_size(self):
+        self.assertRaises(exception.Error, db_api.purge_deleted, 1,
+                          batch_size='x')
+        self.assertRaises(exception.Error, db_api.purge_deleted, 1,
+                          batch_size=0)
+
     def _deleted_stack_existance(self, ctx, stacks, existing, deleted):
         for s in existing:
             self.assertIsNotNone(db_api.stack_get(ctx, stacks[s].id,
@@ -856,6 +946,41 @@ class DBAPIResourceTest(HeatTestCase):
         self.assertEqual('{"foo": "123"}', dumps(ret_res.rsrc_metadata))
         self.assertEqual(self.stack.id, ret_res.stack_id)
 
+    def test_resource_update(self):
+        res = create_resource(self.ctx, self.stack)
+        values = {'action': 'delete', 'status': 'in_progress',
+                  'status_reason': 'state changed'}
+        self.assertTrue(db_api.resource_update(self.ctx, res.id, values))
+        ret_res = db_api.resource_get(self.ctx, res.id)
+        self.assertEqual('delete', ret_res.action)
+        self.assertEqual('in_progress', ret_res.status)
+        self.assertEqual(UUID1, ret_res.nova_instance)
+
+        self.assertTrue(db_api.resource_update(
+            self.ctx, res.id, {'status': 'complete'},
+            expected_state=('delete', 'in_progress')))
+        self.assertFalse(db_api.resource_update(
+            self.ctx, res.id, {'status': 'failed'},
+            expected_state=('delete', 'in_progress')))
+        self.assertEqual('complete',
+                         db_api.resource_get(self.ctx, res.id).status)
+        self.assertFalse(db_api.resource_update(self.ctx, UUID2, values))
+
+    def test_resource_metadata_set_batch(self):
+        res1 = create_resource(self.ctx, self.stack, name='res1')
+        res2 = create_resource(self.ctx, self.stack, name='res2')
+        res3 = create_resource(self.ctx, self.stack, name='res3')
+
+        db_api.resource_metadata_set_batch(self.ctx,
+                                           {res1.id: {'foo': 'bar'},
+                                            res2.id: {'baz': 'quux'}})
+        self.assertEqual({'foo': 'bar'},
+                         db_api.resource_get(self.ctx, res1.id).rsrc_metadata)
+        self.assertEqual({'baz': 'quux'},
+                         db_api.resource_get(self.ctx, res2.id).rsrc_metadata)
+        self.assertEqual({'foo': '123'},
+                         db_api.resource_get(self.ctx, res3.id).rsrc_metadata)
+
     def test_resource_get(self):
         res = create_resource(self.ctx, self.stack)
         ret_res = db_api.resource_get(self.ctx, res.id)
@@ -1049,6 +1174,45 @@ class DBAPIEventTest(HeatTestCase):
         self.assertEqual('create_complete', ret_event.resource_status_reason)
         self.assertEqual({'name': 'foo'}, ret_event.resource_properties)
 
+    def test_event_get_by_resource(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        event = create_event(self.ctx, stack_id=stack.id)
+
+        ret_event = db_api.event_get_by_resource(self.ctx, stack.id, 'res',
+                                                 event.id)
+        self.assertIsNotNone(ret_event)
+        self.assertEqual(event.id, ret_event.id)
+
+        self.assertIsNone(db_api.event_get_by_resource(self.ctx, stack.id,
+                                                       'other', event.id))
+        self.assertIsNone(db_api.event_get_by_resource(self.ctx, UUID2,
+                                                       'res', event.id))
+        self.assertIsNone(db_api.event_get_by_resource(self.ctx, stack.id,
+                                                       'res', UUID2))
+
+    def test_event_create_batch(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        values = [{'stack_id': stack.id, 'resource_name': 'res%d' % i}
+                  for i in range(3)]
+        events = db_api.event_create_batch(self.ctx, values)
+        self.assertEqual(3, len(events))
+        self.assertEqual(['res0', 'res1', 'res2'],
+                         [e.resource_name for e in events])
+        self.assertEqual(3, db_api.event_count_all_by_stack(self.ctx,
+                                                            stack.id))
+
+    def test_event_create_batch_prunes(self):
+        cfg.CONF.set_override('max_events_per_stack', 4)
+        cfg.CONF.set_override('event_purge_batch_size', 2)
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        for i in range(4):
+            create_event(self.ctx, stack_id=stack.id)
+
+        values = [{'stack_id': stack.id} for i in range(3)]
+        db_api.event_create_batch(self.ctx, values)
+        self.assertEqual(3, db_api.event_count_all_by_stack(self.ctx,
+                                                            stack.id))
+
     def test_event_get_all(self):
         self.stack1 = create_stack(self.ctx, self.template, self.user_creds,
                                    tenant='tenant1')
@@ -1123,6 +1287,53 @@ class DBAPIEventTest(HeatTestCase):
         self.assertEqual(1, db_api.event_count_all_by_stack(self.ctx,
                                                             self.stack2.id))
 
+    def test_event_get_all_by_tenant_deleted_stack(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        create_event(self.ctx, stack_id=stack.id)
+        db_api.stack_delete(self.ctx, stack.id)
+
+        self.assertEqual([], db_api.event_get_all_by_tenant(self.ctx))
+
+    def _create_timed_events(self, stack):
+        start = datetime(2014, 1, 1)
+        for i, action in enumerate(('CREATE', 'UPDATE', 'CREATE')):
+            create_event(self.ctx, stack_id=stack.id,
+                         resource_name='res%d' % i,
+                         resource_action=action,
+                         created_at=start + timedelta(minutes=i))
+        return start
+
+    def test_event_get_all_by_stack_paginated(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        self._create_timed_events(stack)
+
+        events = db_api.event_get_all_by_stack(self.ctx, stack.id, limit=2)
+        self.assertEqual(['res0', 'res1'], [e.resource_name for e in events])
+
+        events = db_api.event_get_all_by_stack(self.ctx, stack.id,
+                                               marker=events[-1].id)
+        self.assertEqual(['res2'], [e.resource_name for e in events])
+
+        events = db_api.event_get_all_by_stack(self.ctx, stack.id,
+                                               sort_keys=['resource_name'],
+                                               sort_dir='desc')
+        self.assertEqual(['res2', 'res1', 'res0'],
+                         [e.resource_name for e in events])
+
+    def test_event_get_all_by_stack_filtered(self):
+        stack = create_stack(self.ctx, self.template, self.user_creds)
+        start = self._create_timed_events(stack)
+
+        events = db_api.event_get_all_by_stack(
+            self.ctx, stack.id, filters={'resource_action': 'CREATE'})
+        self.assertEqual(['res0', 'res2'], [e.resource_name for e in events])
+
+        filters = {'since': start + timedelta(minutes=1),
+                   'until': start + timedelta(minutes=2)}
+        events = db_api.event_get_all_by_stack(self.ctx, stack.id,
+                                               filters=filters)
+        self.assertEqual(['res1'], [e.resource_name for e in events])
+
 
 class DBAPIWatchRuleTest(HeatTestCase):
     def setUp(self):
@@ -1178,6 +1389,29 @@ class DBAPIWatchRuleTest(HeatTestCase):
         wrs = db_api.watch_rule_get_all_by_stack(self.ctx, self.stack1.id)
         self.assertEqual(2, len(wrs))
 
+    def test_watch_rule_get_all_for_evaluation(self):
+        now = timeutils.utcnow()
+        values = [
+            {'name': 'rule1', 'last_evaluated': now},
+            {'name': 'rule2', 'last_evaluated': now - timedelta(seconds=60)},
+            {'name': 'rule3', 'state': 'suspended'},
+        ]
+        wrs = [create_watch_rule(self.ctx, self.stack, **val)
+               for val in values]
+
+        ret_wrs = db_api.watch_rule_get_all_for_evaluation(
+            self.ctx, exclude_states=('suspended',))
+        self.assertEqual(['rule2', 'rule1'], [wr.name for wr in ret_wrs])
+
+        shards = [db_api.watch_rule_get_all_for_evaluation(
+                  self.ctx, shard_count=2, shard_index=i) for i in (0, 1)]
+        self.assertEqual(3, len(shards[0]) + len(shards[1]))
+        for i, shard in enumerate(shards):
+            for wr in shard:
+                self.assertEqual(i, wr.id % 2)
+        self.assertEqual(set(wr.id for wr in wrs),
+                         set(wr.id for wr in shards[0] + shards[1]))
+
     def test_watch_rule_update(self):
         watch_rule = create_watch_rule(self.ctx, self.stack)
         values = {
@@ -1237,3 +1471,61 @@ class DBAPIWatchDataTest(HeatTestCase):
 
         data = [wd.data for wd in watch_data]
         [self.assertIn(val['data'], data) for val in values]
+
+    def test_watch_data_get_all_by_watch_rule_id(self):
+        other_rule = create_watch_rule(self.ctx, self.stack, name='other')
+        now = timeutils.utcnow()
+        create_watch_data(self.ctx, self.watch_rule,
+                          created_at=now - timedelta(seconds=100))
+        create_watch_data(self.ctx, self.watch_rule,
+                          created_at=now - timedelta(seconds=400))
+        create_watch_data(self.ctx, other_rule, created_at=now)
+
+        watch_data = db_api.watch_data_get_all_by_watch_rule_id(
+            self.ctx, self.watch_rule.id)
+        self.assertEqual(2, len(watch_data))
+
+        watch_data = db_api.watch_data_get_all_by_watch_rule_id(
+            self.ctx, self.watch_rule.id, now - timedelta(seconds=300))
+        self.assertEqual(1, len(watch_data))
+        self.assertEqual(self.watch_rule.id, watch_data[0].watch_rule_id)
+
+    def test_watch_data_rollup_add(self):
+        bucket = datetime(2013, 1, 1, 12, 0)
+        for value in (3, 1, 5):
+            db_api.watch_data_rollup_add(self.ctx, self.watch_rule.id, 60,
+                                         bucket, value)
+        db_api.watch_data_rollup_add(self.ctx, self.watch_rule.id, 3600,
+                                     bucket, 7)
+
+        rollups = db_api.watch_data_rollup_get_all(
+            self.ctx, self.watch_rule.id, 60,
+            bucket, bucket + timedelta(minutes=1))
+        self.assertEqual(1, len(rollups))
+        self.assertEqual(3, rollups[0].sample_count)
+        self.assertEqual(9.0, rollups[0].sample_sum)
+        self.assertEqual(1.0, rollups[0].sample_min)
+        self.assertEqual(5.0, rollups[0].sample_max)
+
+        rollups = db_api.watch_data_rollup_get_all(
+            self.ctx, self.watch_rule.id, 60,
+            bucket + timedelta(minutes=1), bucket + timedelta(minutes=2))
+        self.assertEqual([], rollups)
+
+    def test_watch_data_purge(self):
+        now = timeutils.utcnow()
+        for age in (10, 100, 200, 300):
+            create_watch_data(self.ctx, self.watch_rule,
+                              created_at=now - timedelta(seconds=age))
+        db_api.watch_data_rollup_add(self.ctx, self.watch_rule.id, 60,
+                                     now - timedelta(seconds=300), 1)
+
+        deleted = db_api.watch_data_purge(self.ctx,
+                                          now - timedelta(seconds=50),
+                                          batch_size=2)
+        self.assertEqual(4, deleted)
+        watch_data = db_api.watch_data_get_all(self.ctx)
+        self.assertEqual(1, len(watch_data))
+        self.assertEqual([], db_api.watch_data_rollup_get_all(
+            self.ctx, self.watch_rule.id, 60,
+            now - timedelta(seconds=400), now))
@@ -15,6 +15,8 @@
 import uuid
 import mox
 
+from oslo.config import cfg
+
 from heat.common import template_format
 from heat.common import exception
 from heat.engine import environment
@@ -113,6 +115,24 @@ class StackResourceTest(HeatTestCase):
         self.assertEqual(self.templ, self.stack.t.t)
         self.assertEqual(self.stack.id, self.parent_resource.resource_id)
 
+    @utils.stack_delete_after
+    def test_remove_nested_resources_error(self):
+        self.parent_resource.create_with_template(self.simple_template, {})
+        self.stack = self.parent_resource.nested()
+
+        self.m.StubOutWithMock(generic_rsrc.GenericResource, 'destroy')
+        generic_rsrc.GenericResource.destroy().AndRaise(ValueError('boom'))
+        self.m.ReplayAll()
+
+        self.assertRaises(ValueError,
+                          self.parent_resource.remove_nested_resources,
+                          ['WebServer'])
+        self.assertEqual((self.stack.UPDATE, self.stack.FAILED),
+                         self.stack.state)
+        self.assertEqual('boom', self.stack.status_reason)
+        self.assertIn('WebServer', self.stack.t[template.RESOURCES])
+        self.m.VerifyAll()
+
     @utils.stack_delete_after
     def test_set_deletion_policy(self):
         self.parent_resource.create_with_template(self.templ,
@@ -267,10 +287,42 @@ class StackResourceTest(HeatTestCase):
         nested = self.m.CreateMockAnything()
         self.m.StubOutWithMock(stack_resource.StackResource, 'nested')
         stack_resource.StackResource.nested().AndReturn(nested)
-        nested.delete()
+        nested.delete_task()
+        self.m.ReplayAll()
+
+        delete_task = self.parent_resource.delete_nested()
+        self.assertFalse(delete_task.started())
+        delete_task.start()
+        self.m.VerifyAll()
+
+    def test_delete_nested_limited(self):
+        cfg.CONF.set_override('max_concurrent_nested_deletes', 1)
+        nested = self.m.CreateMockAnything()
+        nested.DELETE = parser.Stack.DELETE
+        nested.COMPLETE = parser.Stack.COMPLETE
+        nested.state = (nested.DELETE, nested.COMPLETE)
+        self.m.StubOutWithMock(stack_resource.StackResource, 'nested')
+        stack_resource.StackResource.nested().MultipleTimes().AndReturn(
+            nested)
+
+        def delete_task():
+            yield
+            yield
+
+        nested.delete_task = delete_task
         self.m.ReplayAll()
 
-        self.parent_resource.delete_nested()
+        first = self.parent_resource.delete_nested()
+        second = self.parent_resource.delete_nested()
+        self.assertFalse(self.parent_resource.check_delete_complete(first))
+        self.assertEqual(1, self.parent_stack.nested_deletes)
+        self.assertFalse(self.parent_resource.check_delete_complete(second))
+        self.assertFalse(second.started())
+        self.assertTrue(self.parent_resource.check_delete_complete(first))
+        self.assertEqual(0, self.parent_stack.nested_deletes)
+        self.assertFalse(self.parent_resource.check_delete_complete(second))
+        self.assertTrue(self.parent_resource.check_delete_complete(second))
+        self.assertEqual(0, self.parent_stack.nested_deletes)
         self.m.VerifyAll()
 
     def test_get_output_ok(self):
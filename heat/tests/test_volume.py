@@ -653,7 +653,8 @@ class VolumeTest(HeatTestCase):
             self.cinder_fc)
         clients.OpenStackClients.nova('compute').AndReturn(self.fc)
         nova_utils.get_image_id(
-            self.fc, '46988116-6703-4623-9dbc-2bc6d284021b').AndReturn(
+            self.fc, '46988116-6703-4623-9dbc-2bc6d284021b',
+            tenant_id=mox.IgnoreArg()).AndReturn(
                 '46988116-6703-4623-9dbc-2bc6d284021b')
         self.cinder_fc.volumes.create(
             size=1, availability_zone='nova',
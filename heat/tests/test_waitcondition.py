@@ -81,6 +81,8 @@ class WaitConditionTest(HeatTestCase):
         utils.setup_dummy_db()
         self.m.StubOutWithMock(wc.WaitConditionHandle,
                                'get_status')
+        # Check the handle on every step
+        cfg.CONF.set_override('wait_condition_poll_interval', 0)
 
         cfg.CONF.set_default('heat_waitcondition_server_url',
                              'http://server.test:8000/v1/waitcondition')
@@ -241,6 +243,34 @@ class WaitConditionTest(HeatTestCase):
                           rsrc.handle_update, {}, {}, {})
         self.m.VerifyAll()
 
+    @utils.stack_delete_after
+    def test_wait_signalled(self):
+        cfg.CONF.set_override('wait_condition_poll_interval', 60)
+        now = [1000.0]
+        self.patch(wc, 'wallclock', lambda: now[0])
+        self.stack = self.create_stack(stub=False)
+        rsrc = self.stack['WaitForTheHandle']
+        handle = self.stack['WaitHandle']
+        handle.id = 'handle-id'
+        wc.WaitConditionHandle.get_status().AndReturn([])
+        wc.WaitConditionHandle.get_status().AndReturn([])
+        wc.WaitConditionHandle.get_status().AndReturn(['SUCCESS'])
+        self.m.ReplayAll()
+
+        runner = scheduler.TaskRunner(rsrc._wait, handle)
+        runner.start()
+        # The handle is checked at first, then not again until signalled
+        self.assertFalse(runner.step())
+        self.assertFalse(runner.step())
+        # ... or until the poll interval has passed
+        now[0] += 61
+        self.assertFalse(runner.step())
+        self.assertFalse(runner.step())
+        wc.signal_watch.signalled('handle-id')
+        self.assertTrue(runner.step())
+        self.assertEqual(0, wc.signal_watch.count('handle-id'))
+        self.m.VerifyAll()
+
     @utils.stack_delete_after
     def test_FnGetAtt(self):
         self.stack = self.create_stack()
@@ -456,11 +486,14 @@ class WaitConditionHandleTest(HeatTestCase):
 
         test_metadata = {'Data': 'foo', 'Reason': 'bar',
                          'Status': 'SUCCESS', 'UniqueId': '123'}
+        wc.signal_watch.watch(rsrc.id)
+        self.addCleanup(wc.signal_watch.unwatch, rsrc.id)
         rsrc.metadata_update(new_metadata=test_metadata)
         handle_metadata = {u'123': {u'Data': u'foo',
                                     u'Reason': u'bar',
                                     u'Status': u'SUCCESS'}}
         self.assertEqual(handle_metadata, rsrc.metadata)
+        self.assertEqual(1, wc.signal_watch.count(rsrc.id))
         self.m.VerifyAll()
 
     @utils.stack_delete_after
@@ -611,6 +611,11 @@ class WatchRuleTest(HeatTestCase):
 
         dbwr = db_api.watch_rule_get_by_name(self.ctx, 'create_data_test')
         self.assertEqual(dbwr.watch_data[0].data, data)
+        self.assertEqual(len(watchrule.ROLLUP_PERIODS),
+                         len(dbwr.watch_data_rollup))
+        for rollup in dbwr.watch_data_rollup:
+            self.assertEqual(1, rollup.sample_count)
+            self.assertEqual(1.0, rollup.sample_sum)
 
         # Note, would be good to write another datapoint and check it
         # but sqlite seems to not interpret the backreference correctly
@@ -619,6 +624,57 @@ class WatchRuleTest(HeatTestCase):
         # correctly get a list of all datapoints where watch_rule_id ==
         # watch_rule.id, so leave it as a single-datapoint test for now.
 
+    @utils.wr_delete_after
+    def test_load_period_data(self):
+        rule = {u'EvaluationPeriods': u'1',
+                u'Period': u'300',
+                u'ComparisonOperator': u'GreaterThanThreshold',
+                u'Statistic': u'Sum',
+                u'Threshold': u'30',
+                u'MetricName': u'test_metric'}
+        self.wr = watchrule.WatchRule(context=self.ctx,
+                                      watch_name='period_data_test',
+                                      stack_id=self.stack_id, rule=rule)
+        self.wr.store()
+
+        now = datetime.datetime(2013, 1, 1, 12, 0, 30)
+        for value, age in ((10, 40), (15, 290), (50, 390), (5, -10)):
+            created_at = now - datetime.timedelta(seconds=age)
+            db_api.watch_data_create(self.ctx, {
+                'data': {u'test_metric': {u'Value': value,
+                                          u'Unit': u'Count'}},
+                'watch_rule_id': self.wr.id,
+                'created_at': created_at})
+            for period in watchrule.ROLLUP_PERIODS:
+                db_api.watch_data_rollup_add(
+                    self.ctx, self.wr.id, period,
+                    watchrule._bucket_start(created_at, period), value)
+
+        # Only the samples in the last period are counted
+        wr = watchrule.WatchRule.load(self.ctx, 'period_data_test')
+        wr.now = now
+        self.assertEqual((3, 30.0, 5.0, 15.0), wr._period_stats())
+        self.assertEqual('NORMAL', wr.get_alarm_state())
+
+        # Whole minutes within the period are read from the rollups
+        db_api.watch_data_rollup_add(self.ctx, self.wr.id, 60,
+                                     datetime.datetime(2013, 1, 1, 11, 58),
+                                     1)
+        self.assertEqual((4, 31.0, 1.0, 15.0), wr._period_stats())
+        self.assertEqual('ALARM', wr.get_alarm_state())
+
+    def test_bucket_start(self):
+        when = datetime.datetime(2013, 1, 1, 11, 58, 30)
+        self.assertEqual(datetime.datetime(2013, 1, 1, 11, 58),
+                         watchrule._bucket_start(when, 60))
+        self.assertEqual(datetime.datetime(2013, 1, 1, 11, 59),
+                         watchrule._bucket_start(when, 60, round_up=True))
+        self.assertEqual(datetime.datetime(2013, 1, 1, 11),
+                         watchrule._bucket_start(when, 3600))
+        when = datetime.datetime(2013, 1, 1, 11, 58)
+        self.assertEqual(when, watchrule._bucket_start(when, 60,
+                                                       round_up=True))
+
     @utils.wr_delete_after
     def test_create_watch_data_suspended(self):
         rule = {u'EvaluationPeriods': u'1',
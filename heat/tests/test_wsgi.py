@@ -225,6 +225,22 @@ class ResourceTest(HeatTestCase):
         self.assertEqual(message_es, str(e.exc))
         self.m.VerifyAll()
 
+    def test_resource_call_etag(self):
+        class Controller(object):
+            def index(self, req):
+                req.environ['api.etag'] = 'abc123'
+                return {'foo': 'bar'}
+
+        actions = {'action': 'index'}
+        env = {'wsgiorg.routing_args': [None, actions]}
+        request = wsgi.Request.blank('/tests', environ=env)
+        resource = wsgi.Resource(Controller(),
+                                 wsgi.JSONRequestDeserializer(),
+                                 wsgi.JSONResponseSerializer())
+        response = request.get_response(resource)
+        self.assertEqual(200, response.status_int)
+        self.assertEqual('abc123', response.etag)
+
 
 class JSONResponseSerializerTest(HeatTestCase):
 